@@ -0,0 +1,29 @@
+#!/usr/bin/env bash
+#
+#   import-time profile of every module - cumulative import time in usec
+#   the collection must be located in <path>/ansible_collections/platform42/neo4j
+#   optional profiler, tests/unit/plugins/module_utils/test_import_time.py asserts the heavy dependencies stay unloaded
+#
+SCRIPT=$(realpath "$0")
+SCRIPTPATH=$(dirname "$SCRIPT")
+VENV_DIR=${SCRIPTPATH}/venv
+COLLECTIONS_PATH=$(cd "$(dirname "$0")/../../.." && pwd)
+
+source ${VENV_DIR}/bin/activate
+export PYTHONPATH=${COLLECTIONS_PATH}
+
+echo "--- modules ---"
+for MODULE in graph_reset query vertex edge label constraint edge_bulk vertex_bulk graph_load
+do
+    OBJECT="ansible_collections.platform42.neo4j.plugins.modules.${MODULE}"
+    USEC=$(python -X importtime -c "import ${OBJECT}" 2>&1 | grep -E "\| ${OBJECT}$" | awk -F'|' '{print $2}' | tr -d ' ')
+    echo "${MODULE}: ${USEC} usec"
+done
+
+echo "--- heavy dependencies ---"
+for MODULE in graph_reset query vertex edge label constraint edge_bulk vertex_bulk graph_load
+do
+    OBJECT="ansible_collections.platform42.neo4j.plugins.modules.${MODULE}"
+    LOADED=$(python -c "import sys, ${OBJECT}; print(' '.join(m for m in ('yaml', 'regex', 'numpy', 'pyarrow', 'socketserver', 'cProfile', 'tracemalloc') if m in sys.modules))")
+    echo "${MODULE}: ${LOADED:-none}"
+done
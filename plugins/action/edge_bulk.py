@@ -0,0 +1,38 @@
+"""
+    Filename: ./action/edge_bulk.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        Action plugin for edge_bulk - optionally runs the bulk pipeline on the controller
+"""
+from typing import Dict, Any, Tuple
+
+# pylint: disable=import-error
+import ansible_collections.platform42.neo4j.plugins.module_utils.argument_spec as u_args
+import ansible_collections.platform42.neo4j.plugins.module_utils.skeleton as u_skel
+import ansible_collections.platform42.neo4j.plugins.module_utils.bulk as u_bulk
+
+from ansible_collections.platform42.neo4j.plugins.plugin_utils.bulk_action import BulkActionBase
+
+
+class ActionModule(BulkActionBase):
+
+    payload_key = u_skel.file_splitext(__file__)
+    entity_file_keys = (u_skel.JsonTKN.EDGE_FILE.value,)
+
+    def argument_spec(self) -> Dict[str, Any]:
+        return u_args.argument_spec_edge_bulk()
+
+    def bulk(
+        self,
+        module_params: Dict[str, Any],
+        check_mode: bool
+    ) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+        return u_bulk.edge_bulk(module_params, check_mode)
+
+    def changed(
+        self,
+        payload: Dict[str, Any]
+    ) -> bool:
+        return u_bulk.edge_changed(payload)
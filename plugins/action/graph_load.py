@@ -0,0 +1,38 @@
+"""
+    Filename: ./action/graph_load.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        Action plugin for graph_load - optionally runs the combined pipeline on the controller
+"""
+from typing import Dict, Any, Tuple
+
+# pylint: disable=import-error
+import ansible_collections.platform42.neo4j.plugins.module_utils.argument_spec as u_args
+import ansible_collections.platform42.neo4j.plugins.module_utils.skeleton as u_skel
+import ansible_collections.platform42.neo4j.plugins.module_utils.loader as u_loader
+
+from ansible_collections.platform42.neo4j.plugins.plugin_utils.bulk_action import BulkActionBase
+
+
+class ActionModule(BulkActionBase):
+
+    payload_key = u_skel.file_splitext(__file__)
+    entity_file_keys = (u_skel.JsonTKN.VERTEX_FILE.value, u_skel.JsonTKN.EDGE_FILE.value)
+
+    def argument_spec(self) -> Dict[str, Any]:
+        return u_args.argument_spec_graph_load()
+
+    def bulk(
+        self,
+        module_params: Dict[str, Any],
+        check_mode: bool
+    ) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+        return u_loader.graph_load(module_params, check_mode)
+
+    def changed(
+        self,
+        payload: Dict[str, Any]
+    ) -> bool:
+        return u_loader.graph_changed(payload)
@@ -0,0 +1,329 @@
+"""
+    Filename: ./callback/neo4j_stats.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        Callback plugin - aggregates the stats of platform42.neo4j tasks across a playbook
+"""
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+from time import perf_counter
+import json
+import os
+
+# pylint: disable=import-error
+from ansible.plugins.callback import CallbackBase
+
+import ansible_collections.platform42.neo4j.plugins.module_utils.skeleton as u_skel
+
+DOCUMENTATION = r'''
+---
+name: neo4j_stats
+type: aggregate
+short_description: Aggregates counters, timings and row throughput of platform42.neo4j tasks
+version_added: "4.3.0"
+author:
+  - Diederick de Buck (diederick.de.buck@platform-42.com)
+description:
+  - Collects the stats of every platform42.neo4j task (module result and wall-clock time per host).
+  - Aggregates them per play, host, module and label/type (entity file for the bulk modules).
+  - Prints a summary table at the end of the playbook, slowest first, and optionally writes a JSON report.
+requirements:
+  - enable in ansible.cfg (callbacks_enabled = platform42.neo4j.neo4j_stats)
+options:
+  report_file:
+    description: JSON report written at the end of the playbook, no report when not set.
+    type: path
+    env:
+      - name: NEO4J_STATS_REPORT_FILE
+    ini:
+      - section: callback_neo4j_stats
+        key: report_file
+  top:
+    description: Number of rows in the summary table, the JSON report holds all rows.
+    type: int
+    default: 25
+    env:
+      - name: NEO4J_STATS_TOP
+    ini:
+      - section: callback_neo4j_stats
+        key: top
+'''
+
+#
+#   Notes:
+#   - a task is recognised by its resolved action (platform42.neo4j.<module>), the module payload is the result
+#     key named after the module
+#       bulk modules report an EntitySummary (processed, counters, execute_msec, server_msec)
+#       single-entity modules and query report stats (counters, result_available_after/consumed_after)
+#       query fan-out reports stats per named query, all of them are added
+#   - duration is the wall-clock time of the task on a host as seen by the controller (module transfer included)
+#   - rows_per_sec is processed rows over duration, only bulk modules process rows
+#   - loop results are added per item, the wall-clock time of a looped task is split evenly over its items
+#   - label/type and entity files are read from the rendered module arguments (invocation.module_args) per item,
+#     a looped task with label: "{{ item.label }}" is grouped per label
+#       task.args holds the unrendered arguments, it is only used when a result has no invocation (run_on_controller)
+#   - skipped loop items are not recorded
+#
+COLLECTION: str = "platform42.neo4j."
+COUNTERS: List[str] = [
+    u_skel.JsonTKN.NODES_CREATED.value,
+    u_skel.JsonTKN.NODES_DELETED.value,
+    u_skel.JsonTKN.RELATIONSHIPS_CREATED.value,
+    u_skel.JsonTKN.RELATIONSHIPS_DELETED.value,
+    u_skel.JsonTKN.PROPERTIES_SET.value,
+    u_skel.JsonTKN.LABELS_ADDED.value,
+    u_skel.JsonTKN.LABELS_REMOVED.value
+]
+ENTITY_KEYS: List[str] = [
+    u_skel.JsonTKN.LABEL.value,
+    u_skel.JsonTKN.TYPE.value
+]
+ENTITY_FILE_KEYS: List[str] = [
+    u_skel.JsonTKN.VERTEX_FILE.value,
+    u_skel.JsonTKN.EDGE_FILE.value
+]
+
+
+@dataclass
+class TaskStats: # pylint: disable=too-many-instance-attributes
+    play: str
+    host: str
+    module: str
+    entity: str
+    tasks: int = 0
+    failed: int = 0
+    duration_msec: float = 0
+    execute_msec: float = 0
+    server_msec: float = 0
+    processed: int = 0
+    rows_per_sec: float = 0
+    counters: Dict[str, int] = field(default_factory=lambda: {counter: 0 for counter in COUNTERS})
+
+    def add(
+        self,
+        payload: Dict[str, Any]
+    ) -> None:
+        stats: Optional[Dict[str, Any]] = payload.get(u_skel.JsonTKN.STATS.value)
+        if stats is None and u_skel.JsonTKN.PROCESSED.value in payload:
+            stats = payload
+            self.processed += payload.get(u_skel.JsonTKN.PROCESSED.value) or 0
+            self.execute_msec += payload.get(u_skel.JsonTKN.EXECUTE_MSEC.value) or 0
+            self.server_msec += payload.get(u_skel.JsonTKN.SERVER_MSEC.value) or 0
+        elif stats is not None:
+            self.execute_msec += stats.get(u_skel.JsonTKN.ROUND_TRIP_MSEC.value) or 0
+            self.server_msec += (
+                (stats.get(u_skel.JsonTKN.RESULT_AVAILABLE_AFTER.value) or 0) +
+                (stats.get(u_skel.JsonTKN.RESULT_CONSUMED_AFTER.value) or 0)
+                )
+        else:
+            # query fan-out - payload per query name
+            for entry in payload.values():
+                if isinstance(entry, dict) and isinstance(entry.get(u_skel.JsonTKN.STATS.value), dict):
+                    self.add(entry)
+            return
+        for counter in COUNTERS:
+            self.counters[counter] += stats.get(counter) or 0
+
+    def as_payload(
+        self
+    ) -> Dict[str, Any]:
+        self.rows_per_sec = self.processed * 1000 / self.duration_msec if self.duration_msec > 0 else 0
+        return asdict(self)
+
+    def as_line(
+        self
+    ) -> Tuple[str, ...]:
+        return (
+            self.play,
+            self.host,
+            self.module,
+            self.entity,
+            str(self.tasks),
+            str(self.failed),
+            f"{self.duration_msec / 1000:.1f}",
+            str(self.processed),
+            f"{self.rows_per_sec:.0f}",
+            f"{self.counters[u_skel.JsonTKN.NODES_CREATED.value]}/{self.counters[u_skel.JsonTKN.NODES_DELETED.value]}",
+            f"{self.counters[u_skel.JsonTKN.RELATIONSHIPS_CREATED.value]}/"
+            f"{self.counters[u_skel.JsonTKN.RELATIONSHIPS_DELETED.value]}",
+            str(self.counters[u_skel.JsonTKN.PROPERTIES_SET.value]),
+            f"{self.server_msec:.0f}"
+            )
+
+#
+#   rendered_args:
+#       module arguments of a (loop item) result as rendered by the worker, args when the result has no invocation
+#
+def rendered_args(
+    item_result: Dict[str, Any],
+    args: Dict[str, Any]
+) -> Dict[str, Any]:
+    invocation: Any = item_result.get("invocation")
+    if isinstance(invocation, dict) and isinstance(invocation.get("module_args"), dict):
+        return dict(invocation["module_args"])
+    return args
+
+#
+#   task_entity:
+#       label or type of a task, entity file names of the bulk modules, '-' otherwise
+#
+def task_entity(
+    args: Dict[str, Any]
+) -> str:
+    for key in ENTITY_KEYS:
+        if isinstance(args.get(key), str):
+            return str(args[key])
+    entity_files: List[str] = [os.path.basename(str(args[key])) for key in ENTITY_FILE_KEYS if args.get(key)]
+    return ",".join(entity_files) if entity_files else "-"
+
+
+class CallbackModule(CallbackBase):
+
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = "aggregate"
+    CALLBACK_NAME = "platform42.neo4j.neo4j_stats"
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(
+        self,
+        display: Any = None
+    ) -> None:
+        super().__init__(display=display)
+        self.playbook: str = ""
+        self.play: str = ""
+        self.started: Dict[Tuple[str, str], float] = {}
+        self.rows: Dict[Tuple[str, str, str, str], TaskStats] = {}
+
+    def v2_playbook_on_start(
+        self,
+        playbook: Any
+    ) -> None:
+        self.playbook = os.path.basename(playbook._file_name) # pylint: disable=protected-access
+
+    def v2_playbook_on_play_start(
+        self,
+        play: Any
+    ) -> None:
+        self.play = play.get_name().strip()
+
+    def v2_runner_on_start(
+        self,
+        host: Any,
+        task: Any
+    ) -> None:
+        self.started[(host.get_name(), task._uuid)] = perf_counter() # pylint: disable=protected-access
+
+    def v2_runner_on_ok(
+        self,
+        result: Any
+    ) -> None:
+        self.record(result, False)
+
+    def v2_runner_on_failed(
+        self,
+        result: Any,
+        ignore_errors: bool = False
+    ) -> None:
+        del ignore_errors
+        self.record(result, True)
+
+    #
+    #   record:
+    #       adds the result of a platform42.neo4j task on one host to its rows (play, host, module, entity)
+    #       every loop item is added to the row of its own entity, a row counts the task once
+    #
+    def record(
+        self,
+        result: Any,
+        failed: bool
+    ) -> None:
+        task: Any = result._task # pylint: disable=protected-access
+        action: str = getattr(task, "resolved_action", None) or task.action
+        if not action.startswith(COLLECTION):
+            return
+        module: str = action[len(COLLECTION):]
+        host: str = result._host.get_name() # pylint: disable=protected-access
+        started: Optional[float] = self.started.pop((host, task._uuid), None) # pylint: disable=protected-access
+        task_result: Dict[str, Any] = result._result # pylint: disable=protected-access
+        item_results: List[Dict[str, Any]] = [
+            item_result for item_result in task_result.get("results") or [task_result]
+            if isinstance(item_result, dict) and not item_result.get("skipped")
+            ]
+        if not item_results:
+            return
+        duration_msec: float = (perf_counter() - started) * 1000 / len(item_results) if started is not None else 0
+        task_rows: Dict[Tuple[str, str, str, str], bool] = {}
+        for item_result in item_results:
+            key: Tuple[str, str, str, str] = (self.play, host, module, task_entity(rendered_args(item_result, task.args)))
+            row: TaskStats = self.rows.setdefault(key, TaskStats(*key))
+            item_failed: bool = bool(item_result.get("failed")) if item_result is not task_result else failed
+            task_rows[key] = task_rows.get(key, False) or item_failed
+            row.duration_msec += duration_msec
+            payload: Any = item_result.get(module)
+            if isinstance(payload, dict):
+                row.add(payload)
+        for key, row_failed in task_rows.items():
+            self.rows[key].tasks += 1
+            self.rows[key].failed += int(row_failed)
+
+    def v2_playbook_on_stats(
+        self,
+        stats: Any
+    ) -> None:
+        del stats
+        if not self.rows:
+            return
+        rows: List[TaskStats] = sorted(self.rows.values(), key=lambda row: row.duration_msec, reverse=True)
+        report: Dict[str, Any] = {
+            "playbook": self.playbook,
+            "generated": datetime.now(timezone.utc).isoformat(),
+            "rows": [row.as_payload() for row in rows],
+            "totals": totals(rows)
+            }
+        self.display_table(rows)
+        report_file: Optional[str] = self.get_option("report_file")
+        if not report_file:
+            return
+        try:
+            with open(report_file, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+        except OSError as e:
+            self._display.warning(f"neo4j_stats: report_file {report_file} is not writable: {e}")
+            return
+        self._display.display(f"neo4j_stats: report written to {report_file}")
+
+    def display_table(
+        self,
+        rows: List[TaskStats]
+    ) -> None:
+        header: Tuple[str, ...] = (
+            "play", "host", "module", "label/type", "tasks", "failed", "duration s", "rows", "rows/s",
+            "nodes +/-", "rels +/-", "props set", "server ms"
+            )
+        lines: List[Tuple[str, ...]] = [header] + [row.as_line() for row in rows[:self.get_option("top")]]
+        widths: List[int] = [max(len(line[column]) for line in lines) for column in range(len(header))]
+        self._display.banner("NEO4J STATS")
+        for line in lines:
+            self._display.display("  ".join(value.ljust(width) for value, width in zip(line, widths)).rstrip())
+        if len(rows) > len(lines) - 1:
+            self._display.display(f"... {len(rows) - len(lines) + 1} more rows")
+
+#
+#   totals:
+#       sum of all rows of the report
+#
+def totals(
+    rows: List[TaskStats]
+) -> Dict[str, Any]:
+    return {
+        "tasks": sum(row.tasks for row in rows),
+        "failed": sum(row.failed for row in rows),
+        "duration_msec": sum(row.duration_msec for row in rows),
+        "execute_msec": sum(row.execute_msec for row in rows),
+        "server_msec": sum(row.server_msec for row in rows),
+        "processed": sum(row.processed for row in rows),
+        "counters": {counter: sum(row.counters[counter] for row in rows) for counter in COUNTERS}
+        }
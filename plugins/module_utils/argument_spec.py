@@ -7,7 +7,7 @@
     Description: 
         Ansible module argument spec
 """
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 from . import skeleton as u_skel
 
@@ -30,12 +30,85 @@ def argument_spec_neo4j() -> Dict[str, Any]:
             u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_STR.value,
             u_skel.YamlATTR.REQUIRED.value: True,
             u_skel.YamlATTR.NO_LOG.value: True
+        },
+        u_skel.JsonTKN.BROKER.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_BOOL.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: False
+        },
+        u_skel.JsonTKN.BROKER_SOCKET.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_STR.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: None
+        },
+        u_skel.JsonTKN.BROKER_IDLE_TIMEOUT.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_INT.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: 300
+        },
+        u_skel.JsonTKN.MAX_CONNECTION_POOL_SIZE.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_INT.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: None
+        },
+        u_skel.JsonTKN.CONNECTION_ACQUISITION_TIMEOUT.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_FLOAT.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: None
+        },
+        u_skel.JsonTKN.CONNECTION_TIMEOUT.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_FLOAT.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: None
+        },
+        u_skel.JsonTKN.MAX_TRANSACTION_RETRY_TIME.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_FLOAT.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: None
+        },
+        u_skel.JsonTKN.LIVENESS_CHECK_TIMEOUT.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_FLOAT.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: None
+        },
+        u_skel.JsonTKN.KEEP_ALIVE.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_BOOL.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: None
+        },
+        u_skel.JsonTKN.FETCH_SIZE.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_INT.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: None
+        },
+        u_skel.JsonTKN.NOTIFICATIONS_MIN_SEVERITY.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_STR.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.CHOICES.value: [severity.value for severity in u_skel.YamlNotificationSeverity],
+            u_skel.YamlATTR.DEFAULT.value: None
+        },
+        u_skel.JsonTKN.NOTIFICATIONS_DISABLED_CATEGORIES.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_LIST.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.ELEMENTS.value: u_skel.YamlATTR.TYPE_STR.value,
+            u_skel.YamlATTR.CHOICES.value: [category.value for category in u_skel.YamlNotificationCategory],
+            u_skel.YamlATTR.DEFAULT.value: None
+        },
+        u_skel.JsonTKN.TRACE_FILE.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_STR.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: None
+        },
+        u_skel.JsonTKN.PROFILE_DIR.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_STR.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: None
         }
     }
 
 
 def argument_spec_graph_reset() -> Dict[str, Any]:
-    return {}
+    return argument_spec_metrics()
 
 
 def argument_spec_constraint() -> Dict[str, Any]:
@@ -59,7 +132,7 @@ def argument_spec_query() -> Dict[str, Any]:
     return {
         u_skel.JsonTKN.QUERY.value: {
             u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_STR.value,
-            u_skel.YamlATTR.REQUIRED.value: True
+            u_skel.YamlATTR.REQUIRED.value: False
         },
         u_skel.JsonTKN.PARAMETERS.value: {
             u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_DICT.value,
@@ -70,6 +143,51 @@ def argument_spec_query() -> Dict[str, Any]:
             u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_BOOL.value,
             u_skel.YamlATTR.REQUIRED.value: False,
             u_skel.YamlATTR.DEFAULT.value: False
+        },
+        u_skel.JsonTKN.QUERIES.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_LIST.value,
+            u_skel.YamlATTR.ELEMENTS.value: u_skel.YamlATTR.TYPE_DICT.value,
+            u_skel.YamlATTR.REQUIRED.value: False
+        },
+        u_skel.JsonTKN.MAX_CONCURRENCY.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_INT.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: 4
+        },
+        u_skel.JsonTKN.RESULT_FORMAT.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_STR.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.CHOICES.value: [result_format.value for result_format in u_skel.YamlResultFormat],
+            u_skel.YamlATTR.DEFAULT.value: u_skel.YamlResultFormat.ROWS.value
+        },
+        u_skel.JsonTKN.RESULT_FILE.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_STR.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: None
+        },
+        u_skel.JsonTKN.GRAPH_PROPERTIES.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_LIST.value,
+            u_skel.YamlATTR.ELEMENTS.value: u_skel.YamlATTR.TYPE_STR.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: None
+        }
+    }
+
+
+def argument_spec_query_entry() -> Dict[str, Any]:
+    return {
+        u_skel.JsonTKN.NAME.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_STR.value,
+            u_skel.YamlATTR.REQUIRED.value: True
+        },
+        u_skel.JsonTKN.QUERY.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_STR.value,
+            u_skel.YamlATTR.REQUIRED.value: True
+        },
+        u_skel.JsonTKN.PARAMETERS.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_DICT.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: {}
         }
     }
 
@@ -101,6 +219,137 @@ def argument_spec_vertex() -> Dict[str, Any]:
         }
     }
 
+def argument_spec_items() -> Dict[str, Any]:
+    return {
+        u_skel.JsonTKN.ITEMS.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_LIST.value,
+            u_skel.YamlATTR.ELEMENTS.value: u_skel.YamlATTR.TYPE_DICT.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: None
+        }
+    }
+
+#
+#   argument_spec_items_entity:
+#       entity spec for modules that support items - required entity fields are
+#       either set at top-level or in every item, validation is postponed to merge of item over top-level
+#
+def argument_spec_items_entity(
+    entity_spec: Dict[str, Any]
+) -> Dict[str, Any]:
+    return {
+        key: rules | {u_skel.YamlATTR.REQUIRED.value: False} for key, rules in entity_spec.items()
+    }
+
+#
+#   required_unless_items:
+#       required entity fields become required_one_of together with items
+#
+def required_unless_items(
+    entity_spec: Dict[str, Any]
+) -> List[List[str]]:
+    return [
+        [u_skel.JsonTKN.ITEMS.value, key]
+        for key, rules in entity_spec.items() if rules.get(u_skel.YamlATTR.REQUIRED.value, False)
+    ]
+
+
+def argument_spec_shard() -> Dict[str, Any]:
+    return {
+        u_skel.JsonTKN.SHARD_INDEX.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_INT.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: None
+        },
+        u_skel.JsonTKN.SHARD_COUNT.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_INT.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: None
+        },
+        u_skel.JsonTKN.AUTO_SHARD.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_BOOL.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: False
+        }
+    }
+
+
+def argument_spec_throttle() -> Dict[str, Any]:
+    return {
+        u_skel.JsonTKN.MAX_ROWS_PER_SEC.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_FLOAT.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: None
+        },
+        u_skel.JsonTKN.MAX_TX_PER_SEC.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_FLOAT.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: None
+        },
+        u_skel.JsonTKN.ADAPTIVE_THROTTLE.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_BOOL.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: False
+        },
+        u_skel.JsonTKN.THROTTLE_LATENCY_MSEC.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_FLOAT.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: 1000.0
+        }
+    }
+
+
+def argument_spec_slow_log() -> Dict[str, Any]:
+    return {
+        u_skel.JsonTKN.SLOW_THRESHOLD_MS.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_FLOAT.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: None
+        },
+        u_skel.JsonTKN.SLOW_LOG_FILE.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_STR.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: None
+        },
+        u_skel.JsonTKN.SLOW_LOG_SAMPLE.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_INT.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: 5
+        },
+        u_skel.JsonTKN.SLOW_LOG_REDACT.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_LIST.value,
+            u_skel.YamlATTR.ELEMENTS.value: u_skel.YamlATTR.TYPE_STR.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: []
+        }
+    }
+
+
+def argument_spec_memory() -> Dict[str, Any]:
+    return {
+        u_skel.JsonTKN.MEMORY_BUDGET_MB.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_FLOAT.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: None
+        },
+        u_skel.JsonTKN.TRACE_MEMORY.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_BOOL.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: False
+        }
+    }
+
+
+def argument_spec_metrics() -> Dict[str, Any]:
+    return {
+        u_skel.JsonTKN.METRICS_FILE.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_STR.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: None
+        }
+    }
+
+
 def argument_spec_vertex_bulk() -> Dict[str, Any]:
     return {
         u_skel.JsonTKN.VERTEX_FILE.value: {
@@ -110,8 +359,29 @@ def argument_spec_vertex_bulk() -> Dict[str, Any]:
         u_skel.JsonTKN.VERTEX_ANCHOR.value: {
             u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_STR.value,
             u_skel.YamlATTR.REQUIRED.value: True
+        },
+        u_skel.JsonTKN.RUN_ON_CONTROLLER.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_BOOL.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: False
+        },
+        u_skel.JsonTKN.FINGERPRINT.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_BOOL.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: False
+        },
+        u_skel.JsonTKN.INITIAL_LOAD.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_BOOL.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: False
+        },
+        u_skel.JsonTKN.POST_LOAD_INDEXES.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_LIST.value,
+            u_skel.YamlATTR.ELEMENTS.value: u_skel.YamlATTR.TYPE_DICT.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: None
         }
-    }
+    } | argument_spec_shard() | argument_spec_throttle() | argument_spec_slow_log() | argument_spec_memory() | argument_spec_metrics()
 
 def argument_spec_edge() -> Dict[str, Any]:
     return {
@@ -157,6 +427,12 @@ def argument_spec_edge() -> Dict[str, Any]:
             u_skel.YamlATTR.REQUIRED.value: False,
             u_skel.YamlATTR.DEFAULT.value: False
         },
+        u_skel.JsonTKN.BI_DIRECTIONAL_STORAGE.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_STR.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.CHOICES.value: [storage.value for storage in u_skel.YamlBiDirectionalStorage],
+            u_skel.YamlATTR.DEFAULT.value: u_skel.YamlBiDirectionalStorage.DOUBLE.value
+        },
         u_skel.JsonTKN.STATE.value: {
             u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_STR.value,
             u_skel.YamlATTR.REQUIRED.value: False,
@@ -179,8 +455,59 @@ def argument_spec_edge_bulk() -> Dict[str, Any]:
         u_skel.JsonTKN.EDGE_ANCHOR.value: {
             u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_STR.value,
             u_skel.YamlATTR.REQUIRED.value: True
+        },
+        u_skel.JsonTKN.RUN_ON_CONTROLLER.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_BOOL.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: False
+        },
+        u_skel.JsonTKN.FINGERPRINT.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_BOOL.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: False
+        },
+        u_skel.JsonTKN.ENSURE_ENDPOINTS.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_BOOL.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: False
+        },
+        u_skel.JsonTKN.LEDGER.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_BOOL.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: False
         }
-    }
+    } | argument_spec_shard() | argument_spec_throttle() | argument_spec_slow_log() | argument_spec_memory() | argument_spec_metrics()
+
+
+def argument_spec_graph_load() -> Dict[str, Any]:
+    return {
+        u_skel.JsonTKN.VERTEX_FILE.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_STR.value,
+            u_skel.YamlATTR.REQUIRED.value: True
+        },
+        u_skel.JsonTKN.VERTEX_ANCHOR.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_STR.value,
+            u_skel.YamlATTR.REQUIRED.value: True
+        },
+        u_skel.JsonTKN.EDGE_FILE.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_STR.value,
+            u_skel.YamlATTR.REQUIRED.value: True
+        },
+        u_skel.JsonTKN.EDGE_ANCHOR.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_STR.value,
+            u_skel.YamlATTR.REQUIRED.value: True
+        },
+        u_skel.JsonTKN.RUN_ON_CONTROLLER.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_BOOL.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: False
+        },
+        u_skel.JsonTKN.FINGERPRINT.value: {
+            u_skel.YamlATTR.TYPE.value: u_skel.YamlATTR.TYPE_BOOL.value,
+            u_skel.YamlATTR.REQUIRED.value: False,
+            u_skel.YamlATTR.DEFAULT.value: False
+        }
+    } | argument_spec_throttle() | argument_spec_slow_log() | argument_spec_memory() | argument_spec_metrics()
 
 
 def argument_spec_label() -> Dict[str, Any]:
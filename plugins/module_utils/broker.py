@@ -0,0 +1,697 @@
+"""
+    Filename: ./module_utils/broker.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        Persistent driver broker - keeps warm NEO4J drivers across Ansible tasks
+"""
+from typing import Dict, Any, List, Tuple, Optional, Callable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, date, time as dt_time
+
+import os
+import sys
+import json
+import time
+import stat
+import socket
+import struct
+import hashlib
+import tempfile
+import threading
+import subprocess
+import socketserver
+
+from strenum import StrEnum
+from neo4j import GraphDatabase, Driver, basic_auth
+from neo4j.exceptions import Neo4jError, TransientError
+from neo4j.time import DateTime, Date, Time
+
+from . import skeleton as u_skel
+from . import stats as u_stats
+from . import throttle as u_throttle
+
+#
+#   Notes:
+#   - every task pays routing-table discovery, TCP, TLS and authentication when it creates its own driver
+#   - the broker is a local process that keeps warm pooled drivers, modules talk to it over a Unix socket
+#   - a module never sees a NEO4J driver in broker mode: BrokerDriver mimics the subset of the driver API
+#     that modules use (session, run, execute_read, execute_write, data, consume, close)
+#       BrokerSummary carries counters, query_type, server timing, server address, database and the notifications
+#       as raw server notifications (stats.raw_notifications, from gql_status_objects on neo4j >= 6)
+#   - the broker is started on first use and stops itself after idle_timeout seconds without requests
+#   - drivers are keyed by a hash of uri, username, password, database and driver config
+#       credential isolation -> a request can only reach a driver created with identical credentials
+#       a wrong password results in a new driver, which fails authentication at NEO4J
+#   - the socket lives in a directory only accessible by the current user (0700)
+#     on Linux the broker also verifies the uid of the connecting process (SO_PEERCRED)
+#   - protocol: one JSON request line, one JSON response line per connection
+#   - temporal values are tagged in JSON to survive the round trip (__type__, iso)
+#   - a managed transaction (execute_read/execute_write) is executed remotely per tx.run
+#     transaction functions that run multiple queries are not atomic in broker mode
+#   - records are transported as record.data(), nodes and relationships arrive as property maps
+#   - a NEO4J error is raised client side as RemoteNeo4jError with the code and message of the server
+#     codes starting with Neo.TransientError raise RemoteTransientError (a TransientError) -> adaptive retry applies
+#
+
+
+class BrokerOp(StrEnum):
+    EXECUTE_READ = "execute_read"
+    EXECUTE_WRITE = "execute_write"
+    PING = "ping"
+    RUN = "run"
+
+
+class BrokerTKN(StrEnum):
+    CODE = "code"
+    CONFIG = "config"
+    COUNTERS = "counters"
+    ERROR = "error"
+    HOST = "host"
+    ISO = "iso"
+    KEYS = "keys"
+    NOTIFICATIONS = "notifications"
+    OK = "ok"
+    OP = "op"
+    PORT = "port"
+    RECORDS = "records"
+    SERVER = "server"
+    SUMMARY = "summary"
+    TYPE = "__type__"
+
+
+BROKER_IDLE_TIMEOUT: int = 300
+BROKER_CONNECT_TIMEOUT: float = 10.0
+BROKER_REAPER_INTERVAL: float = 5.0
+
+
+class BrokerError(Exception):
+    pass
+
+
+class RemoteNeo4jError(Neo4jError):
+
+    def __init__(
+        self,
+        code: str,
+        message: str
+    ) -> None:
+        super().__init__(f"{code}: {message}")
+        self._remote_code: str = code
+        self._remote_message: str = message
+
+    @property
+    def code(self) -> str:
+        return self._remote_code
+
+    @code.setter
+    def code(self, value: str) -> None:
+        self._remote_code = value
+
+    @property
+    def message(self) -> str:
+        return self._remote_message
+
+    @message.setter
+    def message(self, value: str) -> None:
+        self._remote_message = value
+
+
+class RemoteTransientError(RemoteNeo4jError, TransientError):
+    pass
+
+#
+#   remote_error:
+#       rebuilds the NEO4J error of a broker response, transient codes raise a TransientError
+#
+def remote_error(
+    code: str,
+    message: str
+) -> RemoteNeo4jError:
+    if code.startswith(u_throttle.TRANSIENT_ERROR_PREFIX):
+        return RemoteTransientError(code, message)
+    return RemoteNeo4jError(code, message)
+
+#
+#   JSON codec for values that are not native JSON
+#
+TEMPORAL_ENCODERS: List[Tuple[Any, str]] = [
+    (DateTime, "neo4j.DateTime"),
+    (Date, "neo4j.Date"),
+    (Time, "neo4j.Time"),
+    (datetime, "datetime"),
+    (date, "date"),
+    (dt_time, "time"),
+]
+
+TEMPORAL_DECODERS: Dict[str, Callable[[str], Any]] = {
+    "neo4j.DateTime": DateTime.from_iso_format,
+    "neo4j.Date": Date.from_iso_format,
+    "neo4j.Time": Time.from_iso_format,
+    "datetime": datetime.fromisoformat,
+    "date": date.fromisoformat,
+    "time": dt_time.fromisoformat,
+}
+
+
+def encode_value(
+    value: Any
+) -> Any:
+    for temporal_type, tag in TEMPORAL_ENCODERS:
+        if isinstance(value, temporal_type):
+            return {BrokerTKN.TYPE.value: tag, BrokerTKN.ISO.value: value.isoformat()}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(v) for v in value]
+    if isinstance(value, dict):
+        return {k: encode_value(v) for k, v in value.items()}
+    return value
+
+
+def decode_value(
+    value: Any
+) -> Any:
+    if isinstance(value, list):
+        return [decode_value(v) for v in value]
+    if isinstance(value, dict):
+        decoder = TEMPORAL_DECODERS.get(value.get(BrokerTKN.TYPE.value, ""))
+        if decoder is not None:
+            return decoder(value[BrokerTKN.ISO.value])
+        return {k: decode_value(v) for k, v in value.items()}
+    return value
+
+
+def default_socket_path() -> str:
+    runtime_dir: str = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"platform42-neo4j-{os.getuid()}", "broker.sock")
+
+
+def secure_socket_dir(
+    socket_path: str
+) -> None:
+    socket_dir: str = os.path.dirname(socket_path)
+    os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+    dir_stat = os.stat(socket_dir)
+    if dir_stat.st_uid != os.getuid() or stat.S_IMODE(dir_stat.st_mode) & 0o077:
+        raise BrokerError(f"broker directory '{socket_dir}' must be owned by uid {os.getuid()} with mode 0700")
+
+
+def send_message(
+    sock: socket.socket,
+    message: Dict[str, Any]
+) -> None:
+    sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+def receive_message(
+    sock_file: Any
+) -> Optional[Dict[str, Any]]:
+    line: bytes = sock_file.readline()
+    if not line:
+        return None
+    message: Dict[str, Any] = json.loads(line)
+    return message
+
+#
+#   broker client - duck-typed subset of the NEO4J driver API
+#
+@dataclass
+class BrokerCounters: # pylint: disable=too-many-instance-attributes
+    nodes_created: int = 0
+    nodes_deleted: int = 0
+    relationships_created: int = 0
+    relationships_deleted: int = 0
+    properties_set: int = 0
+    labels_added: int = 0
+    labels_removed: int = 0
+    indexes_added: int = 0
+    indexes_removed: int = 0
+    constraints_added: int = 0
+    constraints_removed: int = 0
+    system_updates: int = 0
+    contains_updates: bool = False
+    contains_system_updates: bool = False
+
+
+@dataclass
+class BrokerAddress:
+    host: str
+    port: int
+
+
+@dataclass
+class BrokerServerInfo:
+    address: Optional[BrokerAddress] = None
+
+
+@dataclass
+class BrokerSummary:
+    counters: BrokerCounters = field(default_factory=BrokerCounters)
+    query_type: Optional[str] = None
+    result_available_after: Optional[int] = None
+    result_consumed_after: Optional[int] = None
+    server: BrokerServerInfo = field(default_factory=BrokerServerInfo)
+    database: Optional[str] = None
+    notifications: Optional[List[Dict[str, Any]]] = None
+
+
+class BrokerRecord:
+
+    def __init__(
+        self,
+        keys: List[str],
+        data: Dict[str, Any]
+    ) -> None:
+        self._keys: List[str] = keys
+        self._data: Dict[str, Any] = data
+
+    def keys(self) -> List[str]:
+        return list(self._keys)
+
+    def values(self) -> List[Any]:
+        return [self._data.get(key) for key in self._keys]
+
+    def data(self) -> Dict[str, Any]:
+        return dict(self._data)
+
+    def __getitem__(
+        self,
+        key: str
+    ) -> Any:
+        return self._data[key]
+
+
+class BrokerResult:
+
+    def __init__(
+        self,
+        response: Dict[str, Any]
+    ) -> None:
+        self._keys: List[str] = response[BrokerTKN.KEYS.value]
+        self._records: List[BrokerRecord] = [
+            BrokerRecord(self._keys, decode_value(record)) for record in response[BrokerTKN.RECORDS.value]
+            ]
+        summary: Dict[str, Any] = dict(response[BrokerTKN.SUMMARY.value])
+        counters: BrokerCounters = BrokerCounters(**summary.pop(BrokerTKN.COUNTERS.value))
+        address: Optional[Dict[str, Any]] = summary.pop(BrokerTKN.SERVER.value, None)
+        server: BrokerServerInfo = BrokerServerInfo(BrokerAddress(**address) if address else None)
+        self._summary: BrokerSummary = BrokerSummary(counters=counters, server=server, **summary)
+
+    def keys(self) -> List[str]:
+        return list(self._keys)
+
+    def __iter__(self) -> Iterator[BrokerRecord]:
+        return iter(self._records)
+
+    def data(self) -> List[Dict[str, Any]]:
+        return [record.data() for record in self._records]
+
+    def values(self) -> List[List[Any]]:
+        return [record.values() for record in self._records]
+
+    def consume(self) -> BrokerSummary:
+        return self._summary
+
+
+class BrokerTransaction: # pylint: disable=too-few-public-methods
+
+    def __init__(
+        self,
+        session: "BrokerSession",
+        op: str
+    ) -> None:
+        self._session: BrokerSession = session
+        self._op: str = op
+
+    def run(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None
+    ) -> BrokerResult:
+        return self._session.request(self._op, query, parameters)
+
+
+class BrokerSession:
+
+    def __init__(
+        self,
+        driver: "BrokerDriver",
+        database: Optional[str]
+    ) -> None:
+        self._driver: BrokerDriver = driver
+        self._database: Optional[str] = database
+
+    def __enter__(self) -> "BrokerSession":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        pass
+
+    def request(
+        self,
+        op: str,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None
+    ) -> BrokerResult:
+        response: Dict[str, Any] = self._driver.request({
+            BrokerTKN.OP.value: op,
+            u_skel.JsonTKN.DATABASE.value: self._database,
+            u_skel.JsonTKN.QUERY.value: query,
+            u_skel.JsonTKN.PARAMETERS.value: encode_value(parameters or {})
+            })
+        return BrokerResult(response)
+
+    def run(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None
+    ) -> BrokerResult:
+        return self.request(BrokerOp.RUN.value, query, parameters)
+
+    def execute_read(
+        self,
+        transaction_function: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any
+    ) -> Any:
+        return transaction_function(BrokerTransaction(self, BrokerOp.EXECUTE_READ.value), *args, **kwargs)
+
+    def execute_write(
+        self,
+        transaction_function: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any
+    ) -> Any:
+        return transaction_function(BrokerTransaction(self, BrokerOp.EXECUTE_WRITE.value), *args, **kwargs)
+
+
+class BrokerDriver:
+
+    def __init__(
+        self,
+        db_uri: str,
+        db_username: str,
+        db_password: str,
+        socket_path: Optional[str] = None,
+        idle_timeout: int = BROKER_IDLE_TIMEOUT,
+        config: Optional[Dict[str, Any]] = None
+    ) -> None:
+        self._socket_path: str = socket_path or default_socket_path()
+        self._idle_timeout: int = idle_timeout
+        self._credentials: Dict[str, Any] = {
+            u_skel.JsonTKN.NEO4J_URI.value: db_uri,
+            u_skel.JsonTKN.USERNAME.value: db_username,
+            u_skel.JsonTKN.PASSWORD.value: db_password,
+            BrokerTKN.CONFIG.value: config or {}
+            }
+
+    def session(
+        self,
+        database: Optional[str] = None,
+        **_: Any
+    ) -> BrokerSession:
+        return BrokerSession(self, database)
+
+    def close(self) -> None:
+        # drivers stay warm in the broker until idle_timeout
+        pass
+
+    def verify_connectivity(self) -> None:
+        self.request({BrokerTKN.OP.value: BrokerOp.PING.value})
+
+    def _connect(self) -> socket.socket:
+        secure_socket_dir(self._socket_path)
+        deadline: float = time.monotonic() + BROKER_CONNECT_TIMEOUT
+        spawned: bool = False
+        while True:
+            sock: socket.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self._socket_path)
+                return sock
+            except (FileNotFoundError, ConnectionRefusedError):
+                sock.close()
+                if not spawned:
+                    spawn_broker(self._socket_path, self._idle_timeout)
+                    spawned = True
+                if time.monotonic() > deadline:
+                    raise BrokerError(f"broker did not start on '{self._socket_path}'") from None
+                time.sleep(0.05)
+
+    def request(
+        self,
+        message: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        with self._connect() as sock:
+            send_message(sock, {**self._credentials, **message})
+            with sock.makefile("rb") as sock_file:
+                response: Optional[Dict[str, Any]] = receive_message(sock_file)
+        if response is None:
+            raise BrokerError("broker closed connection without response")
+        if not response[BrokerTKN.OK.value]:
+            error: Dict[str, Any] = response[BrokerTKN.ERROR.value]
+            if error.get(BrokerTKN.CODE.value):
+                raise remote_error(error[BrokerTKN.CODE.value], error[u_skel.JsonTKN.ERROR_MSG.value])
+            raise BrokerError(f"{error[u_skel.JsonTKN.TYPE.value]}: {error[u_skel.JsonTKN.ERROR_MSG.value]}")
+        return response
+
+
+BROKER_BOOTSTRAP: str = (
+    "import sys; "
+    "from ansible_collections.platform42.neo4j.plugins.module_utils import broker; "
+    "broker.serve(sys.argv[1], int(sys.argv[2]))"
+)
+
+
+def spawn_broker(
+    socket_path: str,
+    idle_timeout: int
+) -> None:
+    env: Dict[str, str] = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(path for path in sys.path if path)
+    subprocess.Popen( # pylint: disable=consider-using-with
+        [sys.executable, "-c", BROKER_BOOTSTRAP, socket_path, str(idle_timeout)],
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=True,
+        start_new_session=True
+        )
+
+#
+#   broker server
+#
+class DriverPool:
+
+    def __init__(
+        self,
+        idle_timeout: int
+    ) -> None:
+        self.idle_timeout: int = idle_timeout
+        self.last_request: float = time.monotonic()
+        self._drivers: Dict[str, Tuple[Driver, float]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def driver_key(
+        request: Dict[str, Any]
+    ) -> str:
+        identity: List[Any] = [
+            request[u_skel.JsonTKN.NEO4J_URI.value],
+            request[u_skel.JsonTKN.USERNAME.value],
+            request[u_skel.JsonTKN.PASSWORD.value],
+            request.get(u_skel.JsonTKN.DATABASE.value),
+            request.get(BrokerTKN.CONFIG.value, {})
+        ]
+        return hashlib.sha256(json.dumps(identity, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(
+        self,
+        request: Dict[str, Any]
+    ) -> Driver:
+        key: str = self.driver_key(request)
+        now: float = time.monotonic()
+        with self._lock:
+            self.last_request = now
+            if key in self._drivers:
+                driver: Driver = self._drivers[key][0]
+            else:
+                driver = GraphDatabase.driver(
+                    request[u_skel.JsonTKN.NEO4J_URI.value],
+                    auth=basic_auth(request[u_skel.JsonTKN.USERNAME.value], request[u_skel.JsonTKN.PASSWORD.value]),
+                    **request.get(BrokerTKN.CONFIG.value, {})
+                    )
+            self._drivers[key] = (driver, now)
+        return driver
+
+    def reap(self) -> bool:
+        now: float = time.monotonic()
+        with self._lock:
+            for key, (driver, last_used) in list(self._drivers.items()):
+                if now - last_used > self.idle_timeout:
+                    del self._drivers[key]
+                    driver.close()
+            return not self._drivers and now - self.last_request > self.idle_timeout
+
+    def close(self) -> None:
+        with self._lock:
+            for driver, _ in self._drivers.values():
+                driver.close()
+            self._drivers.clear()
+
+
+def summary_payload(
+    result_summary: Any
+) -> Dict[str, Any]:
+    counters: Dict[str, Any] = {
+        key: getattr(result_summary.counters, key) for key in BrokerCounters.__dataclass_fields__ # pylint: disable=no-member
+        }
+    address: Any = result_summary.server.address if result_summary.server is not None else None
+    return {
+        BrokerTKN.COUNTERS.value: counters,
+        u_skel.JsonTKN.QUERY_TYPE.value: result_summary.query_type,
+        u_skel.JsonTKN.RESULT_AVAILABLE_AFTER.value: result_summary.result_available_after,
+        u_skel.JsonTKN.RESULT_CONSUMED_AFTER.value: result_summary.result_consumed_after,
+        BrokerTKN.SERVER.value: {
+            BrokerTKN.HOST.value: address.host,
+            BrokerTKN.PORT.value: address.port
+            } if address is not None else None,
+        u_skel.JsonTKN.DATABASE.value: result_summary.database,
+        BrokerTKN.NOTIFICATIONS.value: u_stats.raw_notifications(result_summary)
+        }
+
+
+def execute_request(
+    driver: Driver,
+    request: Dict[str, Any]
+) -> Dict[str, Any]:
+    op: str = request[BrokerTKN.OP.value]
+    query: str = request[u_skel.JsonTKN.QUERY.value]
+    parameters: Dict[str, Any] = decode_value(request.get(u_skel.JsonTKN.PARAMETERS.value) or {})
+
+    def run_tx(tx: Any) -> Tuple[List[str], List[Dict[str, Any]], Any]:
+        result = tx.run(query, parameters)
+        keys: List[str] = list(result.keys())
+        records: List[Dict[str, Any]] = [encode_value(record.data()) for record in result]
+        return (keys, records, result.consume())
+
+    with driver.session(database=request.get(u_skel.JsonTKN.DATABASE.value)) as session:
+        if op == BrokerOp.EXECUTE_READ.value:
+            keys, records, result_summary = session.execute_read(run_tx)
+        elif op == BrokerOp.EXECUTE_WRITE.value:
+            keys, records, result_summary = session.execute_write(run_tx)
+        else:
+            keys, records, result_summary = run_tx(session)
+    return {
+        BrokerTKN.OK.value: True,
+        BrokerTKN.KEYS.value: keys,
+        BrokerTKN.RECORDS.value: records,
+        BrokerTKN.SUMMARY.value: summary_payload(result_summary)
+        }
+
+
+def error_payload(
+    e: BaseException
+) -> Dict[str, Any]:
+    return {
+        BrokerTKN.OK.value: False,
+        BrokerTKN.ERROR.value: {
+            u_skel.JsonTKN.TYPE.value: type(e).__name__,
+            BrokerTKN.CODE.value: getattr(e, "code", None) if isinstance(e, Neo4jError) else None,
+            u_skel.JsonTKN.ERROR_MSG.value: getattr(e, "message", None) or str(e)
+            }
+        }
+
+
+def peer_uid(
+    sock: socket.socket
+) -> Optional[int]:
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    credentials: bytes = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _, uid, _ = struct.unpack("3i", credentials)
+    return int(uid)
+
+
+class BrokerHandler(socketserver.StreamRequestHandler):
+    server: "BrokerServer"
+
+    def handle(self) -> None:
+        uid: Optional[int] = peer_uid(self.request)
+        if uid is not None and uid != os.getuid():
+            return
+        try:
+            request: Optional[Dict[str, Any]] = receive_message(self.rfile)
+            if request is None:
+                return
+            response: Dict[str, Any]
+            if request[BrokerTKN.OP.value] == BrokerOp.PING.value:
+                response = {BrokerTKN.OK.value: True}
+            else:
+                response = execute_request(self.server.pool.get(request), request)
+        except Exception as e: # pylint: disable=broad-exception-caught
+            response = error_payload(e)
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class BrokerServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        socket_path: str,
+        pool: DriverPool
+    ) -> None:
+        self.pool: DriverPool = pool
+        super().__init__(socket_path, BrokerHandler)
+
+
+def serve(
+    socket_path: str,
+    idle_timeout: int = BROKER_IDLE_TIMEOUT
+) -> None:
+    secure_socket_dir(socket_path)
+
+    # another broker might have won the race
+    probe: socket.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+        probe.close()
+        return
+    except (FileNotFoundError, ConnectionRefusedError):
+        probe.close()
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    pool: DriverPool = DriverPool(idle_timeout)
+    old_umask: int = os.umask(0o177)
+    try:
+        server: BrokerServer = BrokerServer(socket_path, pool)
+    finally:
+        os.umask(old_umask)
+
+    def reaper() -> None:
+        while True:
+            time.sleep(BROKER_REAPER_INTERVAL)
+            if pool.reap():
+                server.shutdown()
+                return
+
+    threading.Thread(target=reaper, daemon=True).start()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        pool.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+if __name__ == "__main__":
+    serve(
+        sys.argv[1] if len(sys.argv) > 1 else default_socket_path(),
+        int(sys.argv[2]) if len(sys.argv) > 2 else BROKER_IDLE_TIMEOUT
+    )
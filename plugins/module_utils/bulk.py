@@ -0,0 +1,911 @@
+"""
+    Filename: ./module_utils/bulk.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        Bulk pipeline for vertices and edges - shared by modules and action plugins
+"""
+from typing import Dict, Any, List, Tuple, Callable, Optional
+from functools import partial
+from time import perf_counter
+from zlib import crc32
+
+from neo4j import Driver, Session
+from neo4j.exceptions import Neo4jError
+
+from . import argument_spec as u_args
+from . import skeleton as u_skel
+from . import cypher as u_cypher
+from . import cypher_query as u_cyph_q
+from . import shared as u_shared
+from . import driver as u_driver
+from . import input as u_input
+from . import stats as u_stats
+from . import throttle as u_throttle
+from . import ledger as u_ledger
+from . import initial_load as u_initial
+from . import trace as u_trace
+from . import slowlog as u_slowlog
+from . import memory as u_mem
+from . import metrics as u_metrics
+
+#
+#   Notes:
+#   - the bulk pipeline is independent of AnsibleModule
+#       modules/vertex_bulk, modules/edge_bulk -> pipeline runs on the target host (AnsiballZ)
+#       action/vertex_bulk, action/edge_bulk -> pipeline runs in the controller when run_on_controller is set
+#   - pipeline: load YAML-file -> validate and typecast entities -> UNWIND batches -> execute -> EntitySummary
+#   - every stage returns a 3-tuple (result, payload, diagnostics), the first failure stops the pipeline
+#   - counters lists the summary counters that are accumulated per entity type
+#   - items (vertex, edge modules) runs the entities of one task through the same pipeline
+#       every item is merged over the top-level entity params (shallow merge, item wins)
+#       ITEMS_TEMPLATE keeps the RETURN of the single-entity query, rows are mapped back to items by _idx
+#       a batch is one transaction, results are reported per item in input order
+#   - shard_index/shard_count (or auto_shard) load one hash partition of the entity file
+#       partition = crc32(shard key) % shard_count, stable across hosts, runs and python versions
+#       vertex shard key -> normalised label + entity_name, a node is written by exactly one shard
+#       edge shard key -> from-vertex, all relationships of a from-vertex are written by one shard
+#       (canonical from-vertex for single storage, both input directions of a pair land in one shard)
+#       completeness is validated for all entities, typecasting and cypher only for the own partition
+#       entities of other partitions are reported as skipped
+#   - max_rows_per_sec, max_tx_per_sec and adaptive_throttle pace bulk_execute (see throttle.py)
+#       the applied limits, adjustments, wait time and retries are reported in EntitySummary
+#   - fingerprint writes properties only when their hash differs from the stored _fingerprint
+#       skipped property writes are reported as properties_skipped next to properties_set
+#   - ensure_endpoints (edge_bulk) MERGEs missing endpoints by label and entity_name in the edge batch
+#       one edge file builds the graph in a single pass, created endpoints are reported as nodes_created
+#       not combined with sharding (shard_count > 1): edges are sharded by from-vertex, shards share to-vertices
+#       and concurrent MERGEs of one vertex create duplicates without a uniqueness constraint
+#   - ledger (edge_bulk) CREATEs append-only edges with a unique_key after an index based existence check
+#       duplicates within the edge file are dropped and reported as duplicates (part of skipped), see ledger.py
+#   - initial_load (vertex_bulk) CREATEs singleton vertices into empty labels, post_load_indexes are built after
+#     the last batch, see initial_load.py
+#   - every stage adds its time to the phase timers of EntitySummary, see stats.py
+#       bulk_execute records the latency of every batch (percentiles and slowest batches)
+#
+BATCH_SIZE: int = 100
+
+VERTEX_COUNTERS: List[str] = [
+    u_skel.JsonTKN.NODES_CREATED.value,
+    u_skel.JsonTKN.NODES_DELETED.value,
+    u_skel.JsonTKN.LABELS_ADDED.value,
+    u_skel.JsonTKN.LABELS_REMOVED.value,
+    u_skel.JsonTKN.PROPERTIES_SET.value
+]
+
+EDGE_COUNTERS: List[str] = [
+    u_skel.JsonTKN.RELATIONSHIPS_CREATED.value,
+    u_skel.JsonTKN.RELATIONSHIPS_DELETED.value,
+    u_skel.JsonTKN.PROPERTIES_SET.value
+]
+
+EDGE_ENDPOINT_COUNTERS: List[str] = EDGE_COUNTERS + [
+    u_skel.JsonTKN.NODES_CREATED.value
+]
+
+VERTEX_INPUTS: List[str] = [
+    u_skel.JsonTKN.LABEL.value,
+    u_skel.JsonTKN.ENTITY_NAME.value,
+    u_skel.JsonTKN.PROPERTIES.value
+]
+
+EDGE_INPUTS: List[str] = [
+    u_skel.JsonTKN.TYPE.value,
+    u_skel.JsonTKN.FROM.value,
+    u_skel.JsonTKN.TO.value,
+    u_skel.JsonTKN.PROPERTIES.value,
+    u_skel.JsonTKN.UNIQUE_KEY.value
+]
+
+
+def vertex_primitive(
+    check_mode: bool,
+    module_params: Dict[str, Any],
+    properties: Dict[str, Any],
+    is_bulk: bool = True,
+    fingerprint: bool = False,
+    create: bool = False
+) -> Tuple[str, Dict[str, Any], str]:
+    state: str = module_params[u_skel.JsonTKN.STATE.value]
+    vertex_result: Tuple[str, Dict[str, Any], str]
+
+    # initial_load - CREATE template, also for singletons
+    if create:
+        module_params = module_params | {u_skel.JsonTKN.SINGLETON.value: False}
+    if u_skel.state_present(state):
+        vertex_result = u_cypher.vertex_add(
+            check_mode=check_mode,
+            is_bulk=is_bulk,
+            module_params=module_params,
+            properties=properties,
+            fingerprint=fingerprint
+            )
+        return vertex_result
+    vertex_result = u_cypher.vertex_del(
+        check_mode=check_mode,
+        module_params=module_params
+        )
+    return vertex_result
+
+
+def edge_primitive(
+    check_mode: bool,
+    module_params: Dict[str, Any],
+    properties: Dict[str, Any],
+    is_bulk: bool = True,
+    fingerprint: bool = False,
+    ensure_endpoints: bool = False,
+    ledger: bool = False
+) -> Tuple[str, Dict[str, Any], str]:
+    state: str = module_params[u_skel.JsonTKN.STATE.value]
+    edge_result: Tuple[str, Dict[str, Any], str]
+    if u_skel.state_present(state):
+        edge_result = u_cypher.edge_add(
+            check_mode=check_mode,
+            is_bulk=is_bulk,
+            module_params=module_params,
+            properties=properties,
+            fingerprint=fingerprint,
+            ensure_endpoints=ensure_endpoints,
+            ledger=ledger
+        )
+        return edge_result
+    edge_result = u_cypher.edge_del(
+        check_mode=check_mode,
+        module_params=module_params
+    )
+    return edge_result
+
+
+#
+#   entity_kind:
+#       (label, normalised label) of a vertex or (type, normalised type) of an edge
+#
+def entity_kind(
+    entity: Dict[str, Any]
+) -> Tuple[str, str]:
+    if entity.get(u_skel.JsonTKN.LABEL.value) is not None:
+        return (u_skel.JsonTKN.LABEL.value, str(entity[u_skel.JsonTKN.LABEL.value]).capitalize())
+    return (u_skel.JsonTKN.TYPE.value, str(entity.get(u_skel.JsonTKN.TYPE.value, "")).upper())
+
+
+def vertex_shard_key(
+    entity: Dict[str, Any]
+) -> str:
+    return f"{entity[u_skel.JsonTKN.LABEL.value].capitalize()}:{entity[u_skel.JsonTKN.ENTITY_NAME.value]}"
+
+
+def edge_shard_key(
+    entity: Dict[str, Any]
+) -> str:
+    return vertex_shard_key(u_cypher.edge_endpoints(entity)[0])
+
+
+def in_shard(
+    shard_key: Callable[[Dict[str, Any]], str],
+    shard_index: int,
+    shard_count: int,
+    entity: Dict[str, Any]
+) -> bool:
+    return crc32(shard_key(entity).encode("utf-8")) % shard_count == shard_index
+
+#
+#   bulk_member:
+#       member filter of bulk_prepare - own shard first, then ledger deduplication
+#
+#   returns:
+#       filter or None when every entity is loaded
+#
+def bulk_member(
+    shard: Optional[Tuple[int, int]],
+    shard_key: Callable[[Dict[str, Any]], str],
+    ledger: Optional[u_ledger.Ledger]
+) -> Optional[Callable[[Dict[str, Any]], bool]]:
+    filters: List[Callable[[Dict[str, Any]], bool]] = []
+    if shard is not None:
+        filters.append(partial(in_shard, shard_key, shard[0], shard[1]))
+    if ledger is not None:
+        filters.append(ledger.admit)
+    if not filters:
+        return None
+    return lambda entity: all(member(entity) for member in filters)
+
+#
+#   validate_shard:
+#       shard_index and shard_count are required together, 0 <= shard_index < shard_count
+#
+#   returns:
+#       result -> True if shard options are valid
+#       payload -> (shard_index, shard_count) or None if entity file is not sharded
+#       diagnostics -> error on invalid shard options
+#
+def validate_shard(
+    module_params: Dict[str, Any]
+) -> Tuple[bool, Optional[Tuple[int, int]], Dict[str, Any]]:
+    shard_index: Optional[int] = module_params.get(u_skel.JsonTKN.SHARD_INDEX.value)
+    shard_count: Optional[int] = module_params.get(u_skel.JsonTKN.SHARD_COUNT.value)
+    if shard_index is None and shard_count is None:
+        if module_params.get(u_skel.JsonTKN.AUTO_SHARD.value):
+            return (False, None, {u_skel.JsonTKN.ERROR_MSG.value:
+                "'auto_shard' is resolved by the action plugin, use shard_index and shard_count instead"})
+        return (True, None, {})
+    if shard_index is None or shard_count is None:
+        return (False, None, {u_skel.JsonTKN.ERROR_MSG.value: "'shard_index' and 'shard_count' are required together"})
+    if shard_count < 1:
+        return (False, None, {u_skel.JsonTKN.ERROR_MSG.value: f"'shard_count' must be > 0, got {shard_count}"})
+    if not 0 <= shard_index < shard_count:
+        return (False, None, {u_skel.JsonTKN.ERROR_MSG.value:
+            f"'shard_index' must be >= 0 and < {shard_count}, got {shard_index}"})
+    return (True, (shard_index, shard_count), {})
+
+#
+#   validate_throttle:
+#       limits must be > 0 when set
+#
+#   returns:
+#       result -> True if throttle options are valid
+#       payload -> Throttle for bulk_execute
+#       diagnostics -> error on first invalid option
+#
+def validate_throttle(
+    module_params: Dict[str, Any]
+) -> Tuple[bool, Optional[u_throttle.Throttle], Dict[str, Any]]:
+    for key in (
+        u_skel.JsonTKN.MAX_ROWS_PER_SEC.value,
+        u_skel.JsonTKN.MAX_TX_PER_SEC.value,
+        u_skel.JsonTKN.THROTTLE_LATENCY_MSEC.value
+    ):
+        value: Optional[float] = module_params.get(key)
+        if value is not None and value <= 0:
+            return (False, None, {u_skel.JsonTKN.ERROR_MSG.value: f"'{key}' must be > 0, got {value}"})
+    return (True, u_throttle.Throttle(
+        max_rows_per_sec=module_params.get(u_skel.JsonTKN.MAX_ROWS_PER_SEC.value),
+        max_tx_per_sec=module_params.get(u_skel.JsonTKN.MAX_TX_PER_SEC.value),
+        adaptive=bool(module_params.get(u_skel.JsonTKN.ADAPTIVE_THROTTLE.value)),
+        latency_threshold_msec=(
+            module_params.get(u_skel.JsonTKN.THROTTLE_LATENCY_MSEC.value) or u_throttle.ADAPTIVE_LATENCY_MSEC
+            )
+        ), {})
+
+
+def throttle_stats(
+    summary: u_stats.EntitySummary,
+    throttle: u_throttle.Throttle
+) -> None:
+    summary.throttle_rows_per_sec = throttle.rows_per_sec
+    summary.throttle_min_rows_per_sec = throttle.min_rows_per_sec
+    summary.throttle_tx_per_sec = throttle.tx.rate if throttle.tx is not None else None
+    summary.throttle_adjustments = throttle.adjustments
+    summary.throttle_wait_msec = throttle.wait_time * 1000
+
+#
+#   validate_bulk_options:
+#       driver config, shard (not with ensure_endpoints), throttle, slow log, memory budget and metrics file options of the bulk modules
+#
+#   returns:
+#       result -> True if all options are valid
+#       payload -> (shard, throttle)
+#       diagnostics -> error of first invalid option
+#
+def validate_bulk_options(
+    module_params: Dict[str, Any]
+) -> Tuple[bool, Tuple[Optional[Tuple[int, int]], Optional[u_throttle.Throttle]], Dict[str, Any]]:
+    driver_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_driver.validate_driver_config(module_params)
+    result, _, diagnostics = driver_result
+    if not result:
+        return (False, (None, None), diagnostics)
+    shard_result: Tuple[bool, Optional[Tuple[int, int]], Dict[str, Any]] = validate_shard(module_params)
+    result, shard, diagnostics = shard_result
+    if not result:
+        return (False, (None, None), diagnostics)
+    if shard is not None and shard[1] > 1 and module_params.get(u_skel.JsonTKN.ENSURE_ENDPOINTS.value):
+        return (False, (None, None), {u_skel.JsonTKN.ERROR_MSG.value:
+            "'ensure_endpoints' and sharding are mutually exclusive, shards would MERGE the same endpoints concurrently"})
+    throttle_result: Tuple[bool, Optional[u_throttle.Throttle], Dict[str, Any]] = validate_throttle(module_params)
+    result, throttle, diagnostics = throttle_result
+    if not result:
+        return (False, (None, None), diagnostics)
+    slow_log_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_slowlog.validate_slow_log(module_params)
+    result, _, diagnostics = slow_log_result
+    if not result:
+        return (False, (None, None), diagnostics)
+    memory_budget_mb: Optional[float] = module_params.get(u_skel.JsonTKN.MEMORY_BUDGET_MB.value)
+    if memory_budget_mb is not None and memory_budget_mb <= 0:
+        return (False, (None, None), {u_skel.JsonTKN.ERROR_MSG.value:
+            f"'memory_budget_mb' must be > 0, got {memory_budget_mb}"})
+    metrics_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_metrics.validate_metrics_file(module_params)
+    result, _, diagnostics = metrics_result
+    if not result:
+        return (False, (None, None), diagnostics)
+    return (True, (shard, throttle), {})
+
+#
+#   bulk_prepare:
+#       validates entities from file against entity spec and NEO4J constraints,
+#       typecasts dynamic properties and generates the primitive cypher query per entity
+#       entities rejected by member (other shards) are validated for completeness only
+#       validate, cast and build time are accumulated in summary (when given), memory is marked after the last entity
+#
+#   returns:
+#       result -> True if all entities are valid
+#       payload -> list of (cypher_query, cypher_params, cypher_query_inline) per entity
+#       diagnostics -> error of first invalid entity, including its index
+#
+@u_trace.stage(u_trace.SPAN_PREPARE)
+def bulk_prepare(
+    entities: List[Dict[str, Any]],
+    entity_spec: Dict[str, Any],
+    input_list: List[str],
+    primitive: Callable[[bool, Dict[str, Any], Dict[str, Any]], Tuple[str, Dict[str, Any], str]],
+    check_mode: bool,
+    member: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    summary: Optional[u_stats.EntitySummary] = None
+) -> Tuple[bool, List[Tuple[str, Dict[str, Any], str]], Dict[str, Any]]:
+    entity_results: List[Tuple[str, Dict[str, Any], str]] = []
+
+    # phase timers in seconds - plain perf_counter deltas, this loop runs once per entity
+    validate_sec: float = 0
+    cast_sec: float = 0
+    build_sec: float = 0
+    for idx, entity in enumerate(entities):
+        start: float = perf_counter()
+
+        # check YAML-entity for completeness
+        entity_from_file_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_shared.validate_entity_from_file(
+            entity,
+            entity_spec
+            )
+        result, validated_entity, diagnostics = entity_from_file_result
+        if not result:
+            return (False, [], diagnostics | {u_skel.JsonTKN.OBJECT_INDEX.value: idx})
+        if member is not None and not member(validated_entity):
+            validate_sec += perf_counter() - start
+            continue
+
+        # validate YAML against NEO4J constraints
+        validate_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_input.validate_inputs(
+            cypher_input_list=input_list,
+            module_params=validated_entity,
+            supports_unique_key=False,
+            supports_casting=False
+            )
+        result, _, diagnostics = validate_result
+        if not result:
+            return (False, [], diagnostics | {u_skel.JsonTKN.OBJECT_INDEX.value: idx})
+        cast_start: float = perf_counter()
+        validate_sec += cast_start - start
+
+        # typecast dynamic properties
+        cast_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_input.type_casted_properties(
+            validated_entity.get(u_skel.JsonTKN.PROPERTIES.value) or {}
+            )
+        result, casted_properties, diagnostics = cast_result
+        if not result:
+            return (False, [], diagnostics | {u_skel.JsonTKN.OBJECT_INDEX.value: idx})
+        build_start: float = perf_counter()
+        cast_sec += build_start - cast_start
+
+        # generate cypher query for entity operation (create/delete)
+        entity_results.append(primitive(check_mode, validated_entity, casted_properties))
+        build_sec += perf_counter() - build_start
+        if summary is not None:
+            summary.record_entity(*entity_kind(validated_entity))
+    if summary is not None:
+        summary.validate_msec += validate_sec * 1000
+        summary.cast_msec += cast_sec * 1000
+        summary.build_msec += build_sec * 1000
+        memory_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = summary.memory_mark(u_mem.PHASE_PREPARE)
+        if not memory_result[0]:
+            return (False, [], memory_result[2])
+    return (True, entity_results, {})
+
+#
+#   batch_execute:
+#       executes one UNWIND batch paced by throttle, adaptive throttle retries a batch that failed with a TransientError
+#
+#   returns:
+#       result -> True if the batch succeeded
+#       payload -> (result_summary, properties skipped, latency in seconds)
+#       diagnostics -> payload_bulk_fail/payload_abend of the batch
+#
+def batch_execute(
+    session: Session,
+    bulk_query: str,
+    bulk_params: Dict[str, Any],
+    summary: u_stats.EntitySummary,
+    throttle: u_throttle.Throttle
+) -> Tuple[bool, Tuple[Any, int, float], Dict[str, Any]]:
+    rows: int = len(bulk_params[u_skel.JsonTKN.BATCH.value])
+    attempt: int = 0
+    while True:
+        throttle.before_batch(rows)
+        start: float = perf_counter()
+        try:
+            response = session.run(bulk_query, bulk_params)
+            skipped: int = sum(
+                record.data().get(u_skel.JsonTKN.PROPERTIES_SKIPPED.value, 0) for record in response
+                )
+            result_summary = response.consume()
+        except Neo4jError as e:
+            if throttle.adaptive and attempt < u_throttle.ADAPTIVE_RETRIES and u_throttle.transient_error(e):
+                attempt += 1
+                summary.retries += 1
+                throttle.after_batch(rows, perf_counter() - start, failed=True)
+                continue
+            return (False, (None, 0, 0), u_skel.payload_bulk_fail(
+                cypher_query=bulk_query,
+                cypher_params=bulk_params[u_skel.JsonTKN.BATCH.value],
+                e=e,
+                idx=summary.processed
+                ))
+        except Exception as e: # pylint: disable=broad-exception-caught
+            return (False, (None, 0, 0), u_skel.payload_abend(e))
+        latency: float = perf_counter() - start
+        throttle.after_batch(rows, latency)
+        return (True, (result_summary, skipped, latency), {})
+
+#
+#   bulk_execute:
+#       executes UNWIND batches in one session and accumulates counters in summary
+#       every batch is paced by throttle, adaptive throttle retries batches that failed with a TransientError
+#       before(idx) gates batch idx (False aborts), after(idx) is called once batch idx is committed
+#       batches slower than slow_threshold_ms are appended to the slow log (when given)
+#       a batch is not started when RSS exceeds memory_budget_mb, committed batches stay committed
+#
+#   returns:
+#       result -> True if all batches succeeded
+#       payload -> summary as payload
+#       diagnostics -> payload_bulk_fail/payload_abend of first failing batch
+#
+def bulk_execute(
+    driver: Driver,
+    database: str,
+    bulk_batches: List[Tuple[str, Dict[str, Any]]],
+    summary: u_stats.EntitySummary,
+    counters: List[str],
+    throttle: Optional[u_throttle.Throttle] = None,
+    before: Optional[Callable[[int], bool]] = None,
+    after: Optional[Callable[[int], None]] = None,
+    slow_log: Optional[u_slowlog.SlowLog] = None
+) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+    throttle = throttle or u_throttle.Throttle()
+    with u_trace.span(u_trace.SPAN_SESSION), driver.session(database=database) as session:
+
+        # iterate over bulk-queries
+        for idx, (bulk_query, bulk_params) in enumerate(bulk_batches):
+            if before is not None and not before(idx):
+                return (False, {}, {u_skel.JsonTKN.ERROR_MSG.value: "bulk execution aborted"})
+            rows: int = len(bulk_params[u_skel.JsonTKN.BATCH.value])
+            retries: int = summary.retries
+            memory_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = summary.memory_budget(u_mem.PHASE_EXECUTE)
+            if not memory_result[0]:
+                throttle_stats(summary, throttle)
+                return (False, {}, memory_result[2] | {u_skel.JsonTKN.BATCH.value: idx})
+            with u_trace.span(u_trace.SPAN_BATCH, u_trace.query_attributes(bulk_query), u_trace.SPAN_KIND_CLIENT) as span:
+                batch_result: Tuple[bool, Tuple[Any, int, float], Dict[str, Any]] = batch_execute(
+                    session,
+                    bulk_query,
+                    bulk_params,
+                    summary,
+                    throttle
+                    )
+                result, (result_summary, skipped, latency), diagnostics = batch_result
+                u_trace.batch_attributes(span, idx, rows, summary.retries - retries)
+                if not result:
+                    span.fail(str(diagnostics.get(u_skel.JsonTKN.DIAGNOSTICS.value, diagnostics)))
+                    throttle_stats(summary, throttle)
+                    return (False, {}, diagnostics)
+
+                # client side batch time (run -> consume) versus server time reported in the ResultSummary
+                summary.execute_msec += latency * 1000
+                summary.record_batch(idx, summary.processed, rows, latency * 1000)
+                server_msec: float = (
+                    (result_summary.result_available_after or 0) + (result_summary.result_consumed_after or 0)
+                    )
+                summary.server_msec += server_msec
+                if slow_log is not None and slow_log.slow(latency * 1000):
+                    slow_log.capture_batch(
+                        bulk_query,
+                        bulk_params[u_skel.JsonTKN.BATCH.value],
+                        idx,
+                        summary.processed,
+                        (latency * 1000, server_msec),
+                        {counter: getattr(result_summary.counters, counter) for counter in counters}
+                        )
+                summary.processed += rows
+                summary.properties_skipped += skipped
+                for counter in counters:
+                    setattr(summary, counter, getattr(summary, counter) + getattr(result_summary.counters, counter))
+                    span.set(f"neo4j.{counter}", getattr(result_summary.counters, counter))
+            if after is not None:
+                after(idx)
+    summary.memory_mark(u_mem.PHASE_EXECUTE)
+    throttle_stats(summary, throttle)
+    return (True, summary.as_payload(), {})
+
+#
+#   bulk_entities:
+#       loads the entities of the YAML-file and checks the initial_load preconditions of the file
+#       sets total, load time and load memory in summary
+#
+#   returns:
+#       result -> True if file is loaded and valid for initial_load
+#       payload -> (entities, initial) - initial is (labels, post_load_indexes) or None
+#       diagnostics -> error of load or initial_load check
+#
+@u_trace.stage(u_trace.SPAN_LOAD)
+def bulk_entities(
+    module_params: Dict[str, Any],
+    entity_file: str,
+    entity_anchor: str,
+    summary: u_stats.EntitySummary
+) -> Tuple[bool, Tuple[List[Dict[str, Any]], Optional[Tuple[List[str], List[Tuple[str, str]]]]], Dict[str, Any]]:
+    start: float = perf_counter()
+    load_result: Tuple[bool, Any, Dict[str, Any]] = u_shared.load_yaml_file(entity_file, entity_anchor)
+    summary.load_msec = (perf_counter() - start) * 1000
+    result, entities, diagnostics = load_result
+    if not result:
+        return (False, ([], None), diagnostics)
+    summary.total = len(entities)
+    initial_result: Tuple[bool, Optional[Tuple[List[str], List[Tuple[str, str]]]], Dict[str, Any]] = (
+        u_initial.initial_load_check(module_params, entities)
+        )
+    result, initial, diagnostics = initial_result
+    if not result:
+        return (False, ([], None), diagnostics)
+    memory_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = summary.memory_mark(u_mem.PHASE_LOAD)
+    if not memory_result[0]:
+        return (False, ([], None), memory_result[2])
+    return (True, (entities, initial), {})
+
+#
+#   bulk_batch:
+#       bundles entity results in UNWIND batches of BATCH_SIZE, batch build time is added to build_msec
+#       the memory budget of the build phase is checked before the first batch (bulk_execute)
+#
+@u_trace.stage(u_trace.SPAN_BUILD)
+def bulk_batch(
+    batcher: Callable[[List[Tuple[str, Dict[str, Any], str]], int], List[Tuple[str, Dict[str, Any]]]],
+    entity_results: List[Tuple[str, Dict[str, Any], str]],
+    summary: u_stats.EntitySummary
+) -> List[Tuple[str, Dict[str, Any]]]:
+    start: float = perf_counter()
+    bulk_batches: List[Tuple[str, Dict[str, Any]]] = batcher(entity_results, BATCH_SIZE)
+    summary.build_msec += (perf_counter() - start) * 1000
+    summary.memory_mark(u_mem.PHASE_BUILD)
+    return bulk_batches
+
+#
+#   bulk_load:
+#       database stage of the bulk pipeline on one driver
+#       ledger indexes and initial_load checks -> batches -> post_load_indexes
+#       schema statements and checks are skipped in check_mode
+#
+#   returns:
+#       result -> True if all stages succeeded
+#       payload -> EntitySummary as payload
+#       diagnostics -> error of first failing stage
+#
+@u_trace.stage(u_trace.SPAN_EXECUTE)
+def bulk_load(
+    driver: Driver,
+    module_params: Dict[str, Any],
+    check_mode: bool,
+    bulk_batches: List[Tuple[str, Dict[str, Any]]],
+    summary: u_stats.EntitySummary,
+    counters: List[str],
+    throttle: Optional[u_throttle.Throttle],
+    ledger: Optional[u_ledger.Ledger],
+    initial: Optional[Tuple[List[str], List[Tuple[str, str]]]]
+) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+    database: str = module_params[u_skel.JsonTKN.DATABASE.value]
+    load_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = (True, {}, {})
+    if ledger is not None and not check_mode:
+        load_result = u_ledger.ledger_indexes(driver, database, ledger.indexes)
+    if initial is not None and not check_mode and load_result[0]:
+        load_result = u_initial.labels_empty(driver, database, initial[0])
+    if load_result[0]:
+        load_result = bulk_execute(
+            driver,
+            database,
+            bulk_batches,
+            summary,
+            counters,
+            throttle,
+            slow_log=u_slowlog.slow_log(module_params)
+            )
+    if initial is not None and not check_mode and load_result[0]:
+        start: float = perf_counter()
+        index_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_initial.post_load_indexes(
+            driver,
+            database,
+            initial[1]
+            )
+        summary.index_build_msec = (perf_counter() - start) * 1000
+        load_result = (True, summary.as_payload(), {}) if index_result[0] else index_result
+    if not check_mode:
+        u_metrics.bulk_metrics(module_params, summary, load_result[0])
+    return load_result
+
+#
+#   bulk_run:
+#       complete bulk pipeline for one entity file
+#
+#   returns:
+#       result -> True if pipeline succeeded
+#       payload -> EntitySummary as payload
+#       diagnostics -> error of first failing stage
+#
+def bulk_run(
+    module_params: Dict[str, Any],
+    check_mode: bool,
+    entity_file: str,
+    entity_anchor: str,
+    entity_spec: Dict[str, Any],
+    input_list: List[str],
+    primitive: Callable[[bool, Dict[str, Any], Dict[str, Any]], Tuple[str, Dict[str, Any], str]],
+    batcher: Callable[[List[Tuple[str, Dict[str, Any], str]], int], List[Tuple[str, Dict[str, Any]]]],
+    counters: List[str],
+    shard_key: Callable[[Dict[str, Any]], str]
+) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+    options_result: Tuple[bool, Tuple[Optional[Tuple[int, int]], Optional[u_throttle.Throttle]], Dict[str, Any]] = (
+        validate_bulk_options(module_params)
+        )
+    result, (shard, throttle), diagnostics = options_result
+    if not result:
+        return (False, {}, diagnostics)
+
+    # load entities from YAML-file
+    summary: u_stats.EntitySummary = u_stats.EntitySummary(
+        memory_budget_mb=module_params.get(u_skel.JsonTKN.MEMORY_BUDGET_MB.value)
+        )
+    load_result: Tuple[bool, Tuple[List[Dict[str, Any]], Optional[Tuple[List[str], List[Tuple[str, str]]]]], Dict[str, Any]] = (
+        bulk_entities(module_params, entity_file, entity_anchor, summary)
+        )
+    result, (entities, initial), diagnostics = load_result
+    if not result:
+        return (False, {}, diagnostics)
+    if shard is not None:
+        summary.shard_index, summary.shard_count = shard
+    ledger: Optional[u_ledger.Ledger] = None
+    if module_params.get(u_skel.JsonTKN.LEDGER.value):
+        ledger = u_ledger.Ledger()
+
+    prepare_result: Tuple[bool, List[Tuple[str, Dict[str, Any], str]], Dict[str, Any]] = bulk_prepare(
+        entities,
+        entity_spec,
+        input_list,
+        primitive,
+        check_mode,
+        bulk_member(shard, shard_key, ledger),
+        summary
+        )
+    result, entity_results, diagnostics = prepare_result
+    if not result:
+        return (False, {}, diagnostics)
+    summary.skipped = summary.total - len(entity_results)
+    summary.duplicates = ledger.duplicates if ledger is not None else 0
+
+    # bundle entities in groups of BATCH_SIZE - convert query to bulk paradigm
+    driver: Driver = u_driver.get_driver(module_params)
+    try:
+        execute_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = bulk_load(
+            driver,
+            module_params,
+            check_mode,
+            bulk_batch(batcher, entity_results, summary),
+            summary,
+            counters,
+            throttle,
+            ledger,
+            initial
+            )
+    except Exception as e: # pylint: disable=broad-exception-caught
+        return (False, {}, u_skel.payload_abend(e))
+    finally:
+        driver.close()
+    return execute_result
+
+
+def vertex_bulk(
+    module_params: Dict[str, Any],
+    check_mode: bool
+) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+    fingerprint: bool = bool(module_params.get(u_skel.JsonTKN.FINGERPRINT.value))
+    initial_load: bool = bool(module_params.get(u_skel.JsonTKN.INITIAL_LOAD.value))
+    return bulk_run(
+        module_params=module_params,
+        check_mode=check_mode,
+        entity_file=module_params[u_skel.JsonTKN.VERTEX_FILE.value],
+        entity_anchor=module_params[u_skel.JsonTKN.VERTEX_ANCHOR.value],
+        entity_spec=u_args.argument_spec_vertex(),
+        input_list=VERTEX_INPUTS,
+        primitive=partial(vertex_primitive, fingerprint=fingerprint, create=initial_load),
+        batcher=partial(u_cypher.vertex_bulk_add, fingerprint=fingerprint),
+        counters=VERTEX_COUNTERS,
+        shard_key=vertex_shard_key
+        )
+
+
+def edge_bulk(
+    module_params: Dict[str, Any],
+    check_mode: bool
+) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+    fingerprint: bool = bool(module_params.get(u_skel.JsonTKN.FINGERPRINT.value))
+    ensure_endpoints: bool = bool(module_params.get(u_skel.JsonTKN.ENSURE_ENDPOINTS.value))
+    ledger: bool = bool(module_params.get(u_skel.JsonTKN.LEDGER.value))
+    return bulk_run(
+        module_params=module_params,
+        check_mode=check_mode,
+        entity_file=module_params[u_skel.JsonTKN.EDGE_FILE.value],
+        entity_anchor=module_params[u_skel.JsonTKN.EDGE_ANCHOR.value],
+        entity_spec=u_args.argument_spec_edge(),
+        input_list=EDGE_INPUTS,
+        primitive=partial(edge_primitive, fingerprint=fingerprint, ensure_endpoints=ensure_endpoints, ledger=ledger),
+        batcher=partial(u_cypher.edge_bulk_add, fingerprint=fingerprint),
+        counters=EDGE_ENDPOINT_COUNTERS if ensure_endpoints else EDGE_COUNTERS,
+        shard_key=edge_shard_key
+        )
+
+
+#
+#   items_execute:
+#       executes ITEMS_TEMPLATE batches in one session, maps cypher response rows back to items
+#
+#   returns:
+#       result -> True if all batches succeeded
+#       payload -> cypher response per item, in order of entity_results
+#       diagnostics -> payload_bulk_fail/payload_abend of first failing batch
+#
+def items_execute(
+    driver: Driver,
+    database: str,
+    item_batches: List[Tuple[str, Dict[str, Any]]],
+    summary: u_stats.EntitySummary,
+    counters: List[str]
+) -> Tuple[bool, List[List[Dict[str, Any]]], Dict[str, Any]]:
+    cypher_responses: List[List[Dict[str, Any]]] = []
+    with u_trace.span(u_trace.SPAN_SESSION), driver.session(database=database) as session:
+        for batch_idx, (items_query, items_params) in enumerate(item_batches):
+            batch_responses: List[List[Dict[str, Any]]] = [[] for _ in items_params[u_skel.JsonTKN.BATCH.value]]
+            with u_trace.span(u_trace.SPAN_BATCH, u_trace.query_attributes(items_query), u_trace.SPAN_KIND_CLIENT) as span:
+                u_trace.batch_attributes(span, batch_idx, len(batch_responses), 0)
+                try:
+                    response = session.run(items_query, items_params)
+                    for record in response:
+                        row: Dict[str, Any] = record.data()
+                        idx: int = row.pop(u_skel.JsonTKN.IDX.value)
+                        if row:
+                            batch_responses[idx].append(row)
+                    result_summary = response.consume()
+                except Neo4jError as e:
+                    span.fail(str(e))
+                    return (False, [], u_skel.payload_bulk_fail(
+                        cypher_query=items_query,
+                        cypher_params=items_params[u_skel.JsonTKN.BATCH.value],
+                        e=e,
+                        idx=summary.processed
+                        ))
+                except Exception as e: # pylint: disable=broad-exception-caught
+                    span.fail(str(e))
+                    return (False, [], u_skel.payload_abend(e))
+            summary.processed += len(batch_responses)
+            for counter in counters:
+                setattr(summary, counter, getattr(summary, counter) + getattr(result_summary.counters, counter))
+            cypher_responses.extend(batch_responses)
+    return (True, cypher_responses, {})
+
+#
+#   items_run:
+#       validates the driver config, runs items of a single-entity module as UNWIND batches
+#
+#   returns:
+#       result -> True if all items succeeded
+#       payload -> {items: [payload per item], stats: EntitySummary}
+#       diagnostics -> error of first failing stage
+#
+def items_run(
+    module_params: Dict[str, Any],
+    check_mode: bool,
+    entity_spec: Dict[str, Any],
+    input_list: List[str],
+    primitive: Callable[[bool, Dict[str, Any], Dict[str, Any]], Tuple[str, Dict[str, Any], str]],
+    counters: List[str]
+) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+    driver_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_driver.validate_driver_config(module_params)
+    result, _, diagnostics = driver_result
+    if not result:
+        return (False, {}, diagnostics)
+    defaults: Dict[str, Any] = {
+        key: module_params[key] for key in entity_spec if module_params.get(key) is not None
+        }
+    entities: List[Dict[str, Any]] = [defaults | item for item in module_params[u_skel.JsonTKN.ITEMS.value]]
+    summary = u_stats.EntitySummary(total=len(entities))
+
+    prepare_result: Tuple[bool, List[Tuple[str, Dict[str, Any], str]], Dict[str, Any]] = bulk_prepare(
+        entities,
+        entity_spec,
+        input_list,
+        primitive,
+        check_mode
+        )
+    result, entity_results, diagnostics = prepare_result
+    if not result:
+        return (False, {}, diagnostics)
+
+    item_batches: List[Tuple[str, Dict[str, Any]]] = u_cypher.bulk_batches(
+        entity_results,
+        BATCH_SIZE,
+        u_cyph_q.CypherQuery.ITEMS_TEMPLATE.value
+        )
+    driver: Driver = u_driver.get_driver(module_params)
+    try:
+        execute_result: Tuple[bool, List[List[Dict[str, Any]]], Dict[str, Any]] = items_execute(
+            driver,
+            module_params[u_skel.JsonTKN.DATABASE.value],
+            item_batches,
+            summary,
+            counters
+            )
+    except Exception as e: # pylint: disable=broad-exception-caught
+        return (False, {}, u_skel.payload_abend(e))
+    finally:
+        driver.close()
+    result, cypher_responses, diagnostics = execute_result
+    if not result:
+        return (False, {}, diagnostics)
+    items: List[Dict[str, Any]] = [
+        {
+            u_skel.JsonTKN.CYPHER_QUERY.value: u_skel.flatten_query(cypher_query),
+            u_skel.JsonTKN.CYPHER_PARAMS.value: cypher_params,
+            u_skel.JsonTKN.CYPHER_QUERY_INLINE.value: u_skel.flatten_query(cypher_query_inline),
+            u_skel.JsonTKN.CYPHER_RESPONSE.value: u_shared.serialize_neo4j(cypher_response)
+        }
+        for (cypher_query, cypher_params, cypher_query_inline), cypher_response in zip(entity_results, cypher_responses)
+    ]
+    return (True, {u_skel.JsonTKN.ITEMS.value: items, u_skel.JsonTKN.STATS.value: summary.as_payload()}, {})
+
+
+def vertex_items(
+    module_params: Dict[str, Any],
+    check_mode: bool
+) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+    return items_run(
+        module_params=module_params,
+        check_mode=check_mode,
+        entity_spec=u_args.argument_spec_vertex(),
+        input_list=VERTEX_INPUTS,
+        primitive=partial(vertex_primitive, is_bulk=False),
+        counters=VERTEX_COUNTERS
+        )
+
+
+def edge_items(
+    module_params: Dict[str, Any],
+    check_mode: bool
+) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+    return items_run(
+        module_params=module_params,
+        check_mode=check_mode,
+        entity_spec=u_args.argument_spec_edge(),
+        input_list=EDGE_INPUTS,
+        primitive=partial(edge_primitive, is_bulk=False),
+        counters=EDGE_COUNTERS
+        )
+
+
+def vertex_changed(
+    payload: Dict[str, Any]
+) -> bool:
+    return bool(payload[u_skel.JsonTKN.NODES_CREATED.value] > 0 or payload[u_skel.JsonTKN.NODES_DELETED.value] > 0)
+
+
+def edge_changed(
+    payload: Dict[str, Any]
+) -> bool:
+    return bool(
+        payload[u_skel.JsonTKN.RELATIONSHIPS_CREATED.value] > 0 or
+        payload[u_skel.JsonTKN.RELATIONSHIPS_DELETED.value] > 0 or
+        payload.get(u_skel.JsonTKN.NODES_CREATED.value, 0) > 0
+    )
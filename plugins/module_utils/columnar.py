@@ -0,0 +1,263 @@
+"""
+    Filename: ./module_utils/columnar.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        Columnar result shape for analytics consumers
+"""
+from typing import Dict, Any, List, Tuple, Set, Callable
+from datetime import datetime, timezone
+
+import os
+import json
+
+from strenum import StrEnum
+from neo4j import Record
+from neo4j.time import DateTime, Date, Time
+
+from . import skeleton as u_skel
+from . import shared as u_shared
+
+#
+#   Notes:
+#   - a columnar response consists of column names, column types and one array per column
+#   - column types follow the NEO4J types handled by serialize_neo4j
+#       int and float in one column are widened to float
+#       any other combination of types results in mixed
+#       null is ignored for typing, a column with only nulls is typed null
+#   - result_file writes the columnar response to disk instead of the module result
+#       .arrow|.feather|.ipc -> Arrow IPC file (requires pyarrow)
+#       .npz -> NumPy archive, without pickled objects (requires numpy)
+#   - list, map, time and mixed columns are written as (JSON) strings
+#   - pyarrow and numpy are optional and only imported when a result_file is written
+#
+
+
+class ColumnType(StrEnum):
+    BOOL = "bool"
+    DATE = "date"
+    DATETIME = "datetime"
+    FLOAT = "float"
+    INT = "int"
+    LIST = "list"
+    MAP = "map"
+    MIXED = "mixed"
+    NULL = "null"
+    STR = "str"
+    TIME = "time"
+
+
+class ColumnarFile(StrEnum):
+    ARROW = ".arrow"
+    FEATHER = ".feather"
+    IPC = ".ipc"
+    NPZ = ".npz"
+
+
+def value_type(
+    value: Any
+) -> str:
+    if isinstance(value, bool):
+        return str(ColumnType.BOOL.value)
+    if isinstance(value, int):
+        return str(ColumnType.INT.value)
+    if isinstance(value, float):
+        return str(ColumnType.FLOAT.value)
+    if isinstance(value, str):
+        return str(ColumnType.STR.value)
+    if isinstance(value, DateTime):
+        return str(ColumnType.DATETIME.value)
+    if isinstance(value, Date):
+        return str(ColumnType.DATE.value)
+    if isinstance(value, Time):
+        return str(ColumnType.TIME.value)
+    if isinstance(value, list):
+        return str(ColumnType.LIST.value)
+    if isinstance(value, dict):
+        return str(ColumnType.MAP.value)
+    return str(ColumnType.MIXED.value)
+
+
+def column_type(
+    values: List[Any]
+) -> str:
+    found: Set[str] = {value_type(value) for value in values if value is not None}
+    if not found:
+        return str(ColumnType.NULL.value)
+    if len(found) == 1:
+        return found.pop()
+    if found == {ColumnType.INT.value, ColumnType.FLOAT.value}:
+        return str(ColumnType.FLOAT.value)
+    return str(ColumnType.MIXED.value)
+
+#
+#   columnar_response:
+#       pivots records into column names, column types and one array per column
+#       values are not serialized, serialize_neo4j is applied when building the payload
+#
+def columnar_response(
+    columns: List[str],
+    records: List[Record]
+) -> Dict[str, Any]:
+    data: List[List[Any]] = [[] for _ in columns]
+    for record in records:
+        row: Dict[str, Any] = record.data()
+        for idx, column in enumerate(columns):
+            data[idx].append(row[column])
+    return {
+        u_skel.JsonTKN.COLUMNS.value: columns,
+        u_skel.JsonTKN.TYPES.value: [column_type(values) for values in data],
+        u_skel.JsonTKN.ROW_COUNT.value: len(records),
+        u_skel.JsonTKN.DATA.value: data
+        }
+
+
+def _text(
+    value: Any
+) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    return json.dumps(u_shared.serialize_neo4j(value), default=str)
+
+
+def _utc_naive(
+    value: DateTime
+) -> datetime:
+    native: datetime = value.to_native()
+    if native.tzinfo is None:
+        return native
+    return native.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _numpy_array(
+    np: Any,
+    data_type: str,
+    values: List[Any]
+) -> Any:
+    has_null: bool = any(value is None for value in values)
+    if data_type == ColumnType.INT.value and not has_null:
+        return np.array(values, dtype=np.int64)
+    if data_type in (ColumnType.INT.value, ColumnType.FLOAT.value):
+        return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+    if data_type == ColumnType.BOOL.value and not has_null:
+        return np.array(values, dtype=np.bool_)
+    if data_type == ColumnType.DATETIME.value:
+        return np.array(
+            [np.datetime64("NaT") if value is None else _utc_naive(value) for value in values],
+            dtype="datetime64[us]"
+            )
+    if data_type == ColumnType.DATE.value:
+        return np.array(
+            [np.datetime64("NaT") if value is None else value.to_native() for value in values],
+            dtype="datetime64[D]"
+            )
+    return np.array([_text(value) for value in values], dtype=np.str_)
+
+
+def _arrow_array(
+    pa: Any,
+    data_type: str,
+    values: List[Any]
+) -> Any:
+    if data_type == ColumnType.INT.value:
+        return pa.array(values, type=pa.int64())
+    if data_type == ColumnType.FLOAT.value:
+        return pa.array([None if value is None else float(value) for value in values], type=pa.float64())
+    if data_type == ColumnType.BOOL.value:
+        return pa.array(values, type=pa.bool_())
+    if data_type == ColumnType.STR.value:
+        return pa.array(values, type=pa.string())
+    if data_type == ColumnType.DATETIME.value:
+        return pa.array(
+            [None if value is None else _utc_naive(value) for value in values],
+            type=pa.timestamp("us", tz="UTC")
+            )
+    if data_type == ColumnType.DATE.value:
+        return pa.array([None if value is None else value.to_native() for value in values], type=pa.date32())
+    if data_type == ColumnType.NULL.value:
+        return pa.nulls(len(values))
+    return pa.array([None if value is None else _text(value) for value in values], type=pa.string())
+
+
+def _write_npz(
+    result_file: str,
+    columnar: Dict[str, Any]
+) -> None:
+    import numpy as np # type: ignore[import-not-found] # pylint: disable=import-outside-toplevel
+    arrays: Dict[str, Any] = {
+        column: _numpy_array(np, data_type, values)
+        for column, data_type, values in zip(
+            columnar[u_skel.JsonTKN.COLUMNS.value],
+            columnar[u_skel.JsonTKN.TYPES.value],
+            columnar[u_skel.JsonTKN.DATA.value]
+            )
+        }
+    with open(result_file, "wb") as f:
+        np.savez(f, **arrays)
+
+
+def _write_arrow(
+    result_file: str,
+    columnar: Dict[str, Any]
+) -> None:
+    import pyarrow as pa # type: ignore[import-not-found, import-untyped] # pylint: disable=import-outside-toplevel
+    table = pa.table({
+        column: _arrow_array(pa, data_type, values)
+        for column, data_type, values in zip(
+            columnar[u_skel.JsonTKN.COLUMNS.value],
+            columnar[u_skel.JsonTKN.TYPES.value],
+            columnar[u_skel.JsonTKN.DATA.value]
+            )
+        })
+    with pa.OSFile(result_file, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+COLUMNAR_WRITERS: Dict[str, Tuple[str, Callable[[str, Dict[str, Any]], None]]] = {
+    ColumnarFile.ARROW.value: ("pyarrow", _write_arrow),
+    ColumnarFile.FEATHER.value: ("pyarrow", _write_arrow),
+    ColumnarFile.IPC.value: ("pyarrow", _write_arrow),
+    ColumnarFile.NPZ.value: ("numpy", _write_npz),
+}
+
+#
+#   write_columnar_file:
+#       writes columnar response to result_file, format is determined by file extension
+#
+#   returns:
+#       result -> True if file is written
+#       payload -> columnar response without data, data is referenced by result_file
+#       diagnostics -> error when extension or library is not supported
+#
+def write_columnar_file(
+    result_file: str,
+    columnar: Dict[str, Any]
+) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+    extension: str = os.path.splitext(result_file)[1].lower()
+    writer = COLUMNAR_WRITERS.get(extension)
+    if writer is None:
+        return (False, {}, {
+            u_skel.JsonTKN.ERROR_MSG.value:
+                f"result_file '{result_file}' has unsupported extension '{extension}'. "
+                f"Supported: {list(COLUMNAR_WRITERS.keys())}"
+        })
+    library, write = writer
+    try:
+        write(result_file, columnar)
+    except ImportError:
+        return (False, {}, {
+            u_skel.JsonTKN.ERROR_MSG.value: f"result_file '{result_file}' requires python library '{library}'"
+        })
+    except Exception as e: # pylint: disable=broad-exception-caught
+        return (False, {}, {
+            u_skel.JsonTKN.ERROR_MSG.value: f"Failed to write result_file '{result_file}': {repr(e)}"
+        })
+    payload: Dict[str, Any] = {
+        key: value for key, value in columnar.items() if key != u_skel.JsonTKN.DATA.value
+        }
+    payload[u_skel.JsonTKN.RESULT_FILE.value] = result_file
+    return (True, payload, {})
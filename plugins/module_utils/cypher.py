@@ -7,10 +7,14 @@
         Ansible module argument parsing and validation
 """
 from typing import Dict, Any, Optional, Tuple, List
-from neo4j import Transaction, ResultSummary, Result
+from hashlib import blake2b
+import json
+from neo4j import ManagedTransaction, ResultSummary, Result, Record, Driver
+from neo4j.exceptions import Neo4jError
 
 from . import skeleton as u_skel
 from . import cypher_query as u_cyph_q
+from . import trace as u_trace
 
 #
 #   Notes:
@@ -24,8 +28,15 @@ from . import cypher_query as u_cyph_q
 #             cypher_params: Dict[str, Any] -> NEO4J values for bindings
 #       cypher_query_inline: str -> NEO4J query with substituted values for debugging in NEO4J console
 #   - properties and parameters must be type-casted before usage
+#   - schema_run executes index statements (IF NOT EXISTS) and waits until all indexes are online
+#   - bi_directional_storage: single stores one relationship per unordered pair of vertices
+#       direction is canonical: from the lower (label, entity_name) to the higher, independent of input order
+#       delete of a bi-directional edge matches undirected and removes single and double storage alike
 #
 
+AWAIT_INDEXES_SEC: int = 300
+
+
 def query_build(
     cypher_query: str,
     cypher_params: Dict[str, Any]
@@ -211,6 +222,29 @@ def vertex_del(
     )
     return query_build(cypher_query, cypher_params)
 
+#
+#   properties_fingerprint:
+#       stable hash of normalised, type-casted properties
+#       keys are sorted, values that are not native JSON (date, datetime) are hashed by their ISO string
+#
+#   returns:
+#       hex digest (128 bit)
+#
+def properties_fingerprint(
+    properties: Dict[str, Any]
+) -> str:
+    canonical: str = json.dumps(properties, sort_keys=True, separators=(",", ":"), default=str)
+    return blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def fingerprint_params(
+    fingerprint: bool,
+    properties: Dict[str, Any]
+) -> Dict[str, Any]:
+    if not fingerprint or not properties:
+        return {}
+    return {u_cyph_q.FINGERPRINT_PROPERTY: properties_fingerprint(properties)}
+
 #
 #   vertex_add:
 #       creates vertex via MERGE operation (idempotence)
@@ -224,7 +258,8 @@ def vertex_add(
     check_mode: bool,
     is_bulk: bool,
     module_params: Dict[str, Any],
-    properties: Optional[Dict[str, Any]] = None
+    properties: Optional[Dict[str, Any]] = None,
+    fingerprint: bool = False
 ) -> Tuple[str, Dict[str, Any], str]:
 
     # retrieve module params
@@ -243,17 +278,92 @@ def vertex_add(
     # cypher construction - values for bindings
     cypher_params: Dict[str, Any] = {
         u_skel.JsonTKN.ENTITY_NAME.value: entity_name,
-        **normalised_properties
+        **normalised_properties,
+        **fingerprint_params(fingerprint, normalised_properties)
     }
     cypher_query: str = u_cyph_q.cypher_vertex_add(
         check_mode=check_mode,
         is_bulk=is_bulk,
         singleton=singleton,
         label=normalised_label,
-        properties=normalised_properties
+        properties=normalised_properties,
+        fingerprint=fingerprint
     )
     return query_build(cypher_query, cypher_params)
 
+#
+#   bulk_rewrite:
+#       rewrites bindings of primitive query $param -> row.param and wraps it in a bulk template
+#
+#   returns:
+#       bulk_query -> UNWIND template with rewritten primitive query
+#
+def bulk_rewrite(
+    cypher_query: str,
+    cypher_params: Dict[str, Any],
+    template: str = u_cyph_q.CypherQuery.BULK_TEMPLATE.value
+) -> str:
+    primitive_query: str = cypher_query.strip().rstrip(";")
+    for param in cypher_params.keys():
+        primitive_query = primitive_query.replace(f"${param}", f"row.{param}")
+    return template.format(primitive_query=primitive_query)
+
+def bulk_template(
+    fingerprint: bool = False
+) -> str:
+    if fingerprint:
+        return str(u_cyph_q.CypherQuery.BULK_TEMPLATE_FINGERPRINT.value)
+    return str(u_cyph_q.CypherQuery.BULK_TEMPLATE.value)
+
+#
+#   row_template:
+#       BULK_TEMPLATE_FINGERPRINT only wraps primitives that RETURN their skipped writes as _ (add/update),
+#       deletes and check_mode simulations have no _ column and are wrapped in BULK_TEMPLATE
+#
+def row_template(
+    cypher_query: str,
+    template: str
+) -> str:
+    if template == u_cyph_q.CypherQuery.BULK_TEMPLATE_FINGERPRINT.value and not cypher_query.strip().endswith(" AS _"):
+        return str(u_cyph_q.CypherQuery.BULK_TEMPLATE.value)
+    return template
+
+#
+#   bulk_batches:
+#       bundles primitive queries in batches of at most batch_size rows
+#       a batch is closed when the primitive query or its bindings change,
+#       every row of a batch shares one rewritten template, chosen per primitive (row_template)
+#
+#   returns:
+#       List of tuples: (bulk_cypher_query, batch_bindings)
+#       batches keep the order of entity_results
+#
+def bulk_batches(
+    entity_results: List[Tuple[str, Dict[str, Any], str]],
+    batch_size: int,
+    template: str = u_cyph_q.CypherQuery.BULK_TEMPLATE.value
+) -> List[Tuple[str, Dict[str, Any]]]:
+    batch: List[Tuple[str, Dict[str, Any]]] = []
+    batch_bindings: List[Dict[str, Any]] = []
+    batch_key: Optional[Tuple[str, Tuple[str, ...]]] = None
+    batch_query: str = ""
+    for cypher_query, cypher_params, _ in entity_results:
+        row_key: Tuple[str, Tuple[str, ...]] = (cypher_query, tuple(cypher_params.keys()))
+        if row_key != batch_key or len(batch_bindings) >= batch_size:
+            if batch_bindings:
+                batch.append((batch_query, {u_skel.JsonTKN.BATCH.value: batch_bindings}))
+
+            # rewrite $param -> row.param, once per batch
+            batch_key = row_key
+            batch_query = bulk_rewrite(cypher_query, cypher_params, row_template(cypher_query, template))
+            batch_bindings = []
+
+        # store in batch_bindings (bindings per row)
+        batch_bindings.append(cypher_params)
+    if batch_bindings:
+        batch.append((batch_query, {u_skel.JsonTKN.BATCH.value: batch_bindings}))
+    return batch
+
 #
 #   vertex_bulk_add:
 #
@@ -262,32 +372,54 @@ def vertex_add(
 #       List of tuples: (bulk_cypher_query, batch_bindings)
 #       where bulk_cypher_query is the UNWIND template with rewritten queries
 #       and batch_bindings is a list of dicts holding the parameters per vertex.
+#       a batch never mixes vertices with different templates (label, singleton, state, property keys)
 #
 def vertex_bulk_add(
     vertex_results: List[Tuple[str, Dict[str, Any], str]],
-    batch_size: int
+    batch_size: int,
+    fingerprint: bool = False
 ) -> List[Tuple[str, Dict[str, Any]]]:
-    batch = []
-
-    # accumulate queries and bindings per batch
-    for batch_start in range(0, len(vertex_results), batch_size):
-        batch_slice = vertex_results[batch_start:batch_start + batch_size]
-        batch_bindings = []
-
-        # rewrite $param -> row.param
-        for cypher_query, cypher_params, _ in batch_slice:
-            rewritten_query = cypher_query
-            for param in cypher_params.keys():
-                rewritten_query = rewritten_query.replace(f"${param}", f"row.{param}")
-
-            # store in batch_bindings (bindings per row)
-            batch_bindings.append(cypher_params)
+    return bulk_batches(vertex_results, batch_size, bulk_template(fingerprint))
 
-        primitive_query = rewritten_query
-        bulk_query = u_cyph_q.CypherQuery.BULK_TEMPLATE.format(primitive_query=primitive_query)
-        batch.append((bulk_query, {u_skel.JsonTKN.BATCH.value: batch_bindings}))
+#
+#   single_storage:
+#       bi-directional edge stored as one canonical relationship
+#
+def single_storage(
+    module_params: Dict[str, Any]
+) -> bool:
+    storage: str = module_params.get(
+        u_skel.JsonTKN.BI_DIRECTIONAL_STORAGE.value,
+        u_skel.YamlBiDirectionalStorage.DOUBLE.value
+        )
+    return bool(module_params[u_skel.JsonTKN.BI_DIRECTIONAL.value]) and (
+        storage == u_skel.YamlBiDirectionalStorage.SINGLE.value
+        )
 
-    return batch
+#
+#   edge_endpoints:
+#       from and to vertex of an edge, swapped into canonical order for single storage
+#
+#   returns:
+#       (from, to) -> dicts with label and entity_name
+#
+def edge_endpoints(
+    module_params: Dict[str, Any]
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    vertex_from: Dict[str, Any] = module_params[u_skel.JsonTKN.FROM.value]
+    vertex_to: Dict[str, Any] = module_params[u_skel.JsonTKN.TO.value]
+    if single_storage(module_params):
+        key_from: Tuple[str, str] = (
+            vertex_from[u_skel.JsonTKN.LABEL.value].capitalize(),
+            vertex_from[u_skel.JsonTKN.ENTITY_NAME.value]
+            )
+        key_to: Tuple[str, str] = (
+            vertex_to[u_skel.JsonTKN.LABEL.value].capitalize(),
+            vertex_to[u_skel.JsonTKN.ENTITY_NAME.value]
+            )
+        if key_to < key_from:
+            return (vertex_to, vertex_from)
+    return (vertex_from, vertex_to)
 
 #
 #   edge_del:
@@ -347,6 +479,8 @@ def edge_del(
 #
 #   edge_add:
 #       creates (bi-directional) relationship via MERGE operation (idempotence)
+#       bi-directional edges with single storage are merged once, in canonical direction
+#       ledger (bulk) CREATEs edges with a unique_key when no relationship with that key exists
 #
 #   returns:
 #       cypher_query -> cypher query with bindings
@@ -357,16 +491,20 @@ def edge_add(
     check_mode: bool,
     is_bulk: bool,
     module_params: Dict[str, Any],
-    properties: Optional[Dict[str, Any]] = None
+    properties: Optional[Dict[str, Any]] = None,
+    fingerprint: bool = False,
+    ensure_endpoints: bool = False,
+    ledger: bool = False
 ) -> Tuple[str, Dict[str, Any], str]:
 
     # retrieve module params
+    vertex_from, vertex_to = edge_endpoints(module_params)
     relation_type: str = module_params[u_skel.JsonTKN.TYPE.value]
-    label_from: str = module_params[u_skel.JsonTKN.FROM.value][u_skel.JsonTKN.LABEL.value]
-    entity_name_from: str = module_params[u_skel.JsonTKN.FROM.value][u_skel.JsonTKN.ENTITY_NAME.value]
-    label_to: str = module_params[u_skel.JsonTKN.TO.value][u_skel.JsonTKN.LABEL.value]
-    entity_name_to: str = module_params[u_skel.JsonTKN.TO.value][u_skel.JsonTKN.ENTITY_NAME.value]
-    bi_directional: bool = module_params[u_skel.JsonTKN.BI_DIRECTIONAL.value]
+    label_from: str = vertex_from[u_skel.JsonTKN.LABEL.value]
+    entity_name_from: str = vertex_from[u_skel.JsonTKN.ENTITY_NAME.value]
+    label_to: str = vertex_to[u_skel.JsonTKN.LABEL.value]
+    entity_name_to: str = vertex_to[u_skel.JsonTKN.ENTITY_NAME.value]
+    bi_directional: bool = module_params[u_skel.JsonTKN.BI_DIRECTIONAL.value] and not single_storage(module_params)
     unique_key: str = module_params[u_skel.JsonTKN.UNIQUE_KEY.value]
 
     # optionals
@@ -386,7 +524,8 @@ def edge_add(
     cypher_params: Dict[str, Any] = {
         u_skel.JsonTKN.ENTITY_NAME_FROM.value: entity_name_from,
         u_skel.JsonTKN.ENTITY_NAME_TO.value: entity_name_to,
-        **normalised_properties
+        **normalised_properties,
+        **fingerprint_params(fingerprint, normalised_properties)
     }
 
     cypher_query: str
@@ -398,7 +537,9 @@ def edge_add(
             label_to=normalised_label_to,
             relation_type=normalised_relation_type,
             properties=normalised_properties,
-            unique_key=normalised_unique_key
+            unique_key=normalised_unique_key,
+            fingerprint=fingerprint,
+            ensure_endpoints=ensure_endpoints
         )
     else:
         cypher_query = u_cyph_q.cypher_edge_add(
@@ -408,7 +549,10 @@ def edge_add(
             label_to=normalised_label_to,
             relation_type=normalised_relation_type,
             properties=normalised_properties,
-            unique_key=normalised_unique_key
+            unique_key=normalised_unique_key,
+            fingerprint=fingerprint,
+            ensure_endpoints=ensure_endpoints,
+            ledger=ledger
         )
     return query_build(cypher_query, cypher_params)
 
@@ -419,32 +563,14 @@ def edge_add(
 #       List of tuples: (bulk_cypher_query, batch_bindings)
 #       where bulk_cypher_query is the UNWIND template with rewritten queries
 #       and batch_bindings is a list of dicts holding the parameters per edge.
+#       a batch never mixes edges with different templates (type, labels, direction, state, property keys)
 #
 def edge_bulk_add(
     edge_results: List[Tuple[str, Dict[str, Any], str]],
-    batch_size: int
+    batch_size: int,
+    fingerprint: bool = False
 ) -> List[Tuple[str, Dict[str, Any]]]:
-    batch = []
-
-    # accumulate queries and bindings per batch
-    for batch_start in range(0, len(edge_results), batch_size):
-        batch_slice = edge_results[batch_start:batch_start + batch_size]
-        batch_bindings = []
-
-        # rewrite $param -> row.param
-        for cypher_query, cypher_params, _ in batch_slice:
-            rewritten_query = cypher_query
-            for param in cypher_params.keys():
-                rewritten_query = rewritten_query.replace(f"${param}", f"row.{param}")
-
-            # store in batch_bindings (bindings per row)
-            batch_bindings.append(cypher_params)
-
-        primitive_query = rewritten_query
-        bulk_query = u_cyph_q.CypherQuery.BULK_TEMPLATE.format(primitive_query=primitive_query)
-        batch.append((bulk_query, {u_skel.JsonTKN.BATCH.value: batch_bindings}))
-
-    return batch
+    return bulk_batches(edge_results, batch_size, bulk_template(fingerprint))
 
 
 #
@@ -491,7 +617,7 @@ def query(
 #       summary -> cypher stats summary
 #
 def query_tx(
-    tx: Transaction,
+    tx: ManagedTransaction,
     cypher_query: str,
     cypher_params: Dict[str, Any]
 ) -> Tuple[List[Dict[str, Any]], ResultSummary]:
@@ -499,3 +625,77 @@ def query_tx(
     data: List[Dict[str, Any]] = response.data()
     result_summary: ResultSummary = response.consume()
     return (data, result_summary)
+
+#
+#   query_tx_records:
+#       transactional wrapper to support session.execute_read()
+#       keeps column order and raw records for result shapes other than rows
+#
+#   returns:
+#       columns -> column names in query order
+#       records -> cypher response as raw records
+#       summary -> cypher stats summary
+#
+def query_tx_records(
+    tx: ManagedTransaction,
+    cypher_query: str,
+    cypher_params: Dict[str, Any]
+) -> Tuple[List[str], List[Record], ResultSummary]:
+    response: Result = tx.run(cypher_query, cypher_params)
+    columns: List[str] = list(response.keys())
+    records: List[Record] = list(response)
+    result_summary: ResultSummary = response.consume()
+    return (columns, records, result_summary)
+
+#
+#   query_tx_format:
+#       transactional wrapper to support session.execute_read()
+#       shapes the cypher response according to result_format
+#       property_keys projects node and relationship properties for result_format graph
+#
+#   returns:
+#       data -> cypher response as rows, columnar response or graph response
+#       summary -> cypher stats summary
+#
+def query_tx_format(
+    tx: ManagedTransaction,
+    cypher_query: str,
+    cypher_params: Dict[str, Any],
+    result_format: str,
+    property_keys: Optional[List[str]] = None
+) -> Tuple[Any, ResultSummary]:
+    # result shapes are only imported by the query module when requested
+    if result_format == u_skel.YamlResultFormat.COLUMNAR.value:
+        from . import columnar as u_columnar # pylint: disable=import-outside-toplevel
+        columns, records, result_summary = query_tx_records(tx, cypher_query, cypher_params)
+        return (u_columnar.columnar_response(columns, records), result_summary)
+    if result_format == u_skel.YamlResultFormat.GRAPH.value:
+        from . import graph as u_graph # pylint: disable=import-outside-toplevel
+        columns, records, result_summary = query_tx_records(tx, cypher_query, cypher_params)
+        return (u_graph.graph_response(columns, records, property_keys), result_summary)
+    return query_tx(tx, cypher_query, cypher_params)
+
+#
+#   schema_run:
+#       runs schema statements in autocommit transactions, db.awaitIndexes blocks until all indexes are online
+#
+#   returns:
+#       result -> True if all statements succeeded
+#       payload -> empty
+#       diagnostics -> payload_fail of the failing statement
+#
+@u_trace.stage(u_trace.SPAN_SCHEMA)
+def schema_run(
+    driver: Driver,
+    database: str,
+    statements: List[str]
+) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+    if not statements:
+        return (True, {}, {})
+    with driver.session(database=database) as session:
+        for statement in statements + [u_cyph_q.cypher_await_indexes(AWAIT_INDEXES_SEC)]:
+            try:
+                session.run(statement).consume()
+            except Neo4jError as e:
+                return (False, {}, u_skel.payload_fail(statement, {}, statement, e))
+    return (True, {}, {})
@@ -6,7 +6,8 @@
     Description: 
         Cypher queries - returns string with bindings
 """
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, Tuple
+from functools import lru_cache
 from strenum import StrEnum
 
 #
@@ -37,9 +38,35 @@ from strenum import StrEnum
 #   - bulk templates cannot have ; as a terminator, since they don't terminate at individual level
 #   - when BULK_TEMPLATE is used, the primitive_query is modified in a manner that bindings $<binding>
 #     are replaced by binding row.<binding> -> because of the WITH row ... to fetch a primitive_query
+#   - ITEMS_TEMPLATE wraps a primitive_query that returns columns, every output row carries _idx
+#     (position of row in batch) to map the cypher response back to its item
+#   - fingerprint (bulk only) stores a hash of the casted properties in _fingerprint on the node/relationship
+#       set_clause_fingerprint applies SET only when the stored fingerprint differs (FOREACH as conditional)
+#       _skipped_<n|r|r1|r2> holds the number of property writes that were skipped for that entity
+#       bulk primitives RETURN the skipped writes as _, BULK_TEMPLATE_FINGERPRINT sums them per batch
+#       delete and check_mode primitives return no _, their batches keep BULK_TEMPLATE
+#       the fingerprint reflects the last write of this collection, changes made outside are not detected
+#   - ensure_endpoints (bulk only) replaces MATCH of the endpoints by MERGE on label and entity_name
+#       missing endpoints are created in the same UNWIND batch, before the relationship is merged
+#       without ensure_endpoints a row with a missing endpoint matches nothing and is silently ignored
+#   - EDGE_BULK_LEDGER (ledger, bulk only) is the append-only path for edges with a unique_key
+#       existence is checked by a seek on the relationship property index (type, unique_key), anchored on
+#       the relationship and not on its endpoints, so the cost does not grow with the degree of a or b
+#       new relationships are CREATEd, existing ones are left untouched (no SET)
+#       with fingerprint the created relationship stores _fingerprint (set_clause_created), nothing is skipped on
+#       CREATE, later fingerprint runs over the regular MERGE path compare against it
+#       rows of one batch see the writes of earlier rows, duplicates within a batch are created once
+#   - index names carry the kind of index: index_rel_<type>_<key> and index_node_<label>_<key>
+#       a ledger index on TRANSACTION/id and a post_load_index on Transaction/id get different names,
+#       CREATE INDEX ... IF NOT EXISTS would silently skip the second index under one shared name
 #
 
 
+FINGERPRINT_PROPERTY: str = "_fingerprint"
+INDEX_NODE: str = "node"
+INDEX_RELATIONSHIP: str = "rel"
+
+
 class RelationType(StrEnum):
     NODE = "n"
     RELATION = "r"
@@ -56,6 +83,25 @@ class CypherQuery(StrEnum):
         }}
         RETURN 1
         """
+    BULK_TEMPLATE_FINGERPRINT = """
+        CALL {{
+            WITH $batch AS batch
+            UNWIND batch AS row
+            WITH row
+                {primitive_query}
+        }}
+        RETURN
+            sum(_) AS properties_skipped
+        """
+    ITEMS_TEMPLATE = """
+        UNWIND range(0, size($batch) - 1) AS _idx
+        CALL {{
+            WITH _idx
+            WITH $batch[_idx] AS row
+                {primitive_query}
+        }}
+        RETURN *
+        """
     SIMULATION = """
         CALL dbms.components() YIELD versions 
         RETURN 
@@ -81,7 +127,7 @@ class CypherQuery(StrEnum):
         MERGE (n:`{label}` {{entity_name: $entity_name}})
         {set_clause}
         RETURN 
-            1 AS _
+            {skipped} AS _
         """
     VERTEX_ADD = """
         CREATE (n:`{label}` {{entity_name: $entity_name}})
@@ -95,7 +141,7 @@ class CypherQuery(StrEnum):
         CREATE (n:`{label}` {{entity_name: $entity_name}})
         {set_clause}
         RETURN 
-            1 AS _
+            {skipped} AS _
         """
     EDGE_DEL = """
         MATCH (a:`{label_from}` {{entity_name: $entity_name_from}})
@@ -120,12 +166,12 @@ class CypherQuery(StrEnum):
             b.entity_name AS entity_name_to
         """
     EDGE_BULK_ADD = """
-        MATCH (a:`{label_from}` {{entity_name: $entity_name_from}})
-        MATCH (b:`{label_to}` {{entity_name: $entity_name_to}})
+        {endpoint} (a:`{label_from}` {{entity_name: $entity_name_from}})
+        {endpoint} (b:`{label_to}` {{entity_name: $entity_name_to}})
         MERGE (a)-[r:`{relation_type}` {relation_predicate}]->(b)
         {set_clause}
         RETURN 
-            1 AS _
+            {skipped} AS _
         """
     EDGE_ADD_BI = """
         MATCH (a:`{label_from}` {{entity_name: $entity_name_from}})
@@ -141,14 +187,45 @@ class CypherQuery(StrEnum):
         ;
         """
     EDGE_BULK_ADD_BI = """
-        MATCH (a:`{label_from}` {{entity_name: $entity_name_from}})
-        MATCH (b:`{label_to}` {{entity_name: $entity_name_to}})
+        {endpoint} (a:`{label_from}` {{entity_name: $entity_name_from}})
+        {endpoint} (b:`{label_to}` {{entity_name: $entity_name_to}})
         MERGE (a)-[r1:`{relation_type}` {relation_predicate}]->(b)
         {set_clause_r1}
         MERGE (b)-[r2:`{relation_type}` {relation_predicate}]->(a)
         {set_clause_r2}
         RETURN 
-            1 AS _
+            {skipped} AS _
+        """
+    EDGE_BULK_LEDGER = """
+        {endpoint} (a:`{label_from}` {{entity_name: $entity_name_from}})
+        {endpoint} (b:`{label_to}` {{entity_name: $entity_name_to}})
+        WITH *
+        WHERE NOT EXISTS {{
+            MATCH ()-[e:`{relation_type}`]->()
+            WHERE e.`{unique_key}` = ${unique_key} AND startNode(e) = a AND endNode(e) = b
+        }}
+        CREATE (a)-[r:`{relation_type}` {relation_predicate}]->(b)
+        {set_clause}
+        RETURN 
+            {skipped} AS _
+        """
+    RELATIONSHIP_INDEX_ADD = """
+        CREATE INDEX {index_name} IF NOT EXISTS
+        FOR ()-[r:`{relation_type}`]-()
+        ON (r.`{property_key}`)
+        """
+    NODE_INDEX_ADD = """
+        CREATE INDEX {index_name} IF NOT EXISTS
+        FOR (n:`{label}`)
+        ON (n.`{property_key}`)
+        """
+    LABEL_COUNT = """
+        MATCH (n:`{label}`)
+        RETURN
+            count(n) AS count
+        """
+    AWAIT_INDEXES = """
+        CALL db.awaitIndexes({timeout})
         """
     CONSTRAINT_DEL = """
         DROP CONSTRAINT {constraint_name} IF EXISTS
@@ -174,16 +251,109 @@ class CypherQuery(StrEnum):
 #   2025-12-02 DDB:
 #       added backticks around dynamic key
 #
+#   set_clause depends on property keys only, bulk input repeats the same keys for every entity
+#
+@lru_cache(maxsize=1024)
+def _set_clause(
+    relation_type: str,
+    keys: Tuple[str, ...]
+) -> str:
+    clause: str = ""
+    if keys:
+        clause = f"SET {relation_type} += {{{', '.join(f'`{key}`: ${key}' for key in keys)}}}"
+    return clause
+
+
 def set_clause(
     relation_type: str,
     properties: Dict[str, Any]
+) -> str:
+    return _set_clause(relation_type, tuple(properties.keys()))
+
+
+#
+#   set_clause_fingerprint:
+#       conditional SET, properties and fingerprint are written only when the stored fingerprint differs
+#
+@lru_cache(maxsize=1024)
+def _set_clause_fingerprint(
+    relation_type: str,
+    keys: Tuple[str, ...]
 ) -> str:
     clause: str = ""
-    if properties:
-        clause = f"SET {relation_type} += {{{', '.join(f'`{key}`: ${key}' for key in properties.keys())}}}"
+    if keys:
+        fingerprint: str = FINGERPRINT_PROPERTY
+        clause = (
+            f"WITH *, CASE WHEN {relation_type}.`{fingerprint}` = ${fingerprint} THEN {len(keys)} ELSE 0 END "
+            f"AS _skipped_{relation_type} "
+            f"FOREACH (_fp IN CASE WHEN _skipped_{relation_type} = 0 THEN [1] ELSE [] END | "
+            f"SET {relation_type} += {{{', '.join(f'`{key}`: ${key}' for key in keys)}}}, "
+            f"{relation_type}.`{fingerprint}` = ${fingerprint})"
+        )
     return clause
 
 
+#
+#   set_clause_created:
+#       unconditional SET of a CREATEd relationship, with fingerprint the hash is stored along with the properties
+#
+@lru_cache(maxsize=1024)
+def _set_clause_created(
+    relation_type: str,
+    keys: Tuple[str, ...],
+    fingerprint: bool
+) -> str:
+    clause: str = _set_clause(relation_type, keys)
+    if fingerprint and keys:
+        clause += f", {relation_type}.`{FINGERPRINT_PROPERTY}` = ${FINGERPRINT_PROPERTY}"
+    return clause
+
+
+def set_clause_created(
+    relation_type: str,
+    properties: Dict[str, Any],
+    fingerprint: bool = False
+) -> str:
+    return _set_clause_created(relation_type, tuple(properties.keys()), fingerprint)
+
+
+def set_clause_bulk(
+    relation_type: str,
+    properties: Dict[str, Any],
+    fingerprint: bool = False
+) -> str:
+    if fingerprint:
+        return _set_clause_fingerprint(relation_type, tuple(properties.keys()))
+    return set_clause(relation_type, properties)
+
+#
+#   skipped_clause:
+#       RETURN expression of bulk primitives - 1 without fingerprint (unchanged), otherwise skipped property writes
+#
+def skipped_clause(
+    relation_types: Tuple[str, ...],
+    properties: Dict[str, Any],
+    fingerprint: bool = False
+) -> str:
+    if not fingerprint:
+        return "1"
+    if not properties:
+        return "0"
+    return " + ".join(f"_skipped_{relation_type}" for relation_type in relation_types)
+
+
+#
+#   endpoint_clause:
+#       bulk edges MATCH their endpoints, ensure_endpoints MERGEs them
+#
+def endpoint_clause(
+    ensure_endpoints: bool = False
+) -> str:
+    if ensure_endpoints:
+        return "MERGE"
+    return "MATCH"
+
+
 def set_relation_predicate(
     unique_key: Optional[str] = None
 ) -> str:
@@ -193,6 +363,14 @@ def set_relation_predicate(
     return relation_predicate
 
 
+def set_index_name(
+    index_kind: str,
+    token: str,
+    property_key: str
+) -> str:
+    return f"index_{index_kind}_{token.lower()}_{property_key.lower()}"
+
+
 def set_constraint_name(
     label: str,
     property_key: str
@@ -225,7 +403,8 @@ def cypher_vertex_add(
     is_bulk: bool,
     singleton: bool,
     label: str,
-    properties: Dict[str, Any]
+    properties: Dict[str, Any],
+    fingerprint: bool = False
 ) -> str:
     if check_mode:
         return str(CypherQuery.SIMULATION.value)
@@ -233,10 +412,12 @@ def cypher_vertex_add(
         if is_bulk:
             return str(CypherQuery.VERTEX_BULK_ADD_SINGLETON.value.format(
                 label=label,
-                set_clause=set_clause(
+                set_clause=set_clause_bulk(
                     relation_type=RelationType.NODE.value,
-                    properties=properties
-                    )
+                    properties=properties,
+                    fingerprint=fingerprint
+                    ),
+                skipped=skipped_clause((RelationType.NODE.value,), properties, fingerprint)
                 )
             )
         return str(CypherQuery.VERTEX_ADD_SINGLETON.value.format(
@@ -250,10 +431,12 @@ def cypher_vertex_add(
     if is_bulk:
         return str(CypherQuery.VERTEX_BULK_ADD.value.format(
             label=label,
-            set_clause=set_clause(
+            set_clause=set_clause_bulk(
                 relation_type=RelationType.NODE.value,
-                properties=properties
-                )
+                properties=properties,
+                fingerprint=fingerprint
+                ),
+            skipped=skipped_clause((RelationType.NODE.value,), properties, fingerprint)
             )
         )
     return str(CypherQuery.VERTEX_ADD.value.format(
@@ -309,20 +492,42 @@ def cypher_edge_add(
     label_to: str,
     relation_type: str,
     properties: Dict[str, Any],
-    unique_key: Optional[str] = None
+    unique_key: Optional[str] = None,
+    fingerprint: bool = False,
+    ensure_endpoints: bool = False,
+    ledger: bool = False
 ) -> str:
     if check_mode:
         return str(CypherQuery.SIMULATION.value)
+    if is_bulk and ledger and unique_key:
+        return str(CypherQuery.EDGE_BULK_LEDGER.value.format(
+            endpoint=endpoint_clause(ensure_endpoints),
+            label_from=label_from,
+            label_to=label_to,
+            relation_type=relation_type,
+            unique_key=unique_key,
+            relation_predicate=set_relation_predicate(unique_key=unique_key),
+            set_clause=set_clause_created(
+                relation_type=RelationType.RELATION.value,
+                properties=properties,
+                fingerprint=fingerprint
+                ),
+            skipped=skipped_clause((), {}, fingerprint)
+            )
+        )
     if is_bulk:
         return str(CypherQuery.EDGE_BULK_ADD.value.format(
+            endpoint=endpoint_clause(ensure_endpoints),
             label_from=label_from,
             label_to=label_to,
             relation_type=relation_type,
             relation_predicate=set_relation_predicate(unique_key=unique_key),
-            set_clause=set_clause(
+            set_clause=set_clause_bulk(
                 relation_type=RelationType.RELATION.value,
-                properties=properties
-                )
+                properties=properties,
+                fingerprint=fingerprint
+                ),
+            skipped=skipped_clause((RelationType.RELATION.value,), properties, fingerprint)
             )
         )
     return str(CypherQuery.EDGE_ADD.value.format(
@@ -344,24 +549,34 @@ def cypher_edge_add_bi(
     label_to: str,
     relation_type: str,
     properties: Dict[str, Any],
-    unique_key: Optional[str] = None
+    unique_key: Optional[str] = None,
+    fingerprint: bool = False,
+    ensure_endpoints: bool = False
 ) -> str:
     if check_mode:
         return str(CypherQuery.SIMULATION.value)
     if is_bulk:
         return str(CypherQuery.EDGE_BULK_ADD_BI.value.format(
+            endpoint=endpoint_clause(ensure_endpoints),
             label_from=label_from,
             label_to=label_to,
             relation_type=relation_type,
-            set_clause_r1=set_clause(
+            set_clause_r1=set_clause_bulk(
                 relation_type=RelationType.RELATION_BI_1.value,
-                properties=properties
+                properties=properties,
+                fingerprint=fingerprint
                 ),
-            set_clause_r2=set_clause(
+            set_clause_r2=set_clause_bulk(
                 relation_type=RelationType.RELATION_BI_2.value,
-                properties=properties
+                properties=properties,
+                fingerprint=fingerprint
                 ),
-            relation_predicate=set_relation_predicate(unique_key=unique_key)
+            relation_predicate=set_relation_predicate(unique_key=unique_key),
+            skipped=skipped_clause(
+                (RelationType.RELATION_BI_1.value, RelationType.RELATION_BI_2.value),
+                properties,
+                fingerprint
+                )
             )
         )
     return str(CypherQuery.EDGE_ADD_BI.value.format(
@@ -381,6 +596,56 @@ def cypher_edge_add_bi(
     )
 
 
+def cypher_relationship_index_add(
+    relation_type: str,
+    property_key: str
+) -> str:
+    return str(CypherQuery.RELATIONSHIP_INDEX_ADD.value.format(
+        index_name=set_index_name(
+            index_kind=INDEX_RELATIONSHIP,
+            token=relation_type,
+            property_key=property_key
+            ),
+        relation_type=relation_type,
+        property_key=property_key
+        )
+    )
+
+
+def cypher_node_index_add(
+    label: str,
+    property_key: str
+) -> str:
+    return str(CypherQuery.NODE_INDEX_ADD.value.format(
+        index_name=set_index_name(
+            index_kind=INDEX_NODE,
+            token=label,
+            property_key=property_key
+            ),
+        label=label,
+        property_key=property_key
+        )
+    )
+
+
+def cypher_label_count(
+    label: str
+) -> str:
+    return str(CypherQuery.LABEL_COUNT.value.format(
+        label=label
+        )
+    )
+
+
+def cypher_await_indexes(
+    timeout: int
+) -> str:
+    return str(CypherQuery.AWAIT_INDEXES.value.format(
+        timeout=timeout
+        )
+    )
+
+
 def cypher_constraint_del(
     check_mode: bool,
     label: str,
@@ -6,31 +6,134 @@
     Description: 
         Neo4j driver functions
 """
-from typing import Dict, Any
-from neo4j import GraphDatabase, Driver, basic_auth
+from typing import Dict, Any, List, Tuple, Optional, cast
+from neo4j import GraphDatabase, Driver, basic_auth, __version__ as neo4j_version
 
 from . import skeleton as u_skel
+from . import trace as u_trace
+
+#
+#   Notes:
+#   - driver config options are passed to GraphDatabase.driver() only when set
+#     unset options keep the defaults of the NEO4J driver
+#   - max_connection_pool_size, connection_acquisition_timeout -> pool capacity under concurrency (fan-out)
+#   - connection_timeout, liveness_check_timeout, keep_alive -> connection establishment and reuse
+#   - max_transaction_retry_time -> retry budget of managed transactions (execute_read/execute_write)
+#   - fetch_size -> records pulled per round trip, -1 fetches all records at once
+#   - notifications_min_severity, notifications_disabled_categories -> server side notification filtering
+#       neo4j 6 deprecates the driver option notifications_disabled_categories in favour of
+#       notifications_disabled_classifications (a preview feature before 6), the module option keeps its name
+#       and is passed as classifications from neo4j 6 on, as categories on older drivers
+#
+DRIVER_CONFIG: List[str] = [
+    u_skel.JsonTKN.MAX_CONNECTION_POOL_SIZE.value,
+    u_skel.JsonTKN.CONNECTION_ACQUISITION_TIMEOUT.value,
+    u_skel.JsonTKN.CONNECTION_TIMEOUT.value,
+    u_skel.JsonTKN.MAX_TRANSACTION_RETRY_TIME.value,
+    u_skel.JsonTKN.LIVENESS_CHECK_TIMEOUT.value,
+    u_skel.JsonTKN.KEEP_ALIVE.value,
+    u_skel.JsonTKN.FETCH_SIZE.value,
+    u_skel.JsonTKN.NOTIFICATIONS_MIN_SEVERITY.value,
+    u_skel.JsonTKN.NOTIFICATIONS_DISABLED_CATEGORIES.value
+]
+
+NOTIFICATIONS_DISABLED_CLASSIFICATIONS: str = "notifications_disabled_classifications"
+CLASSIFICATIONS_MAJOR_VERSION: int = 6
+
+DRIVER_CONFIG_POSITIVE: List[str] = [
+    u_skel.JsonTKN.MAX_CONNECTION_POOL_SIZE.value,
+    u_skel.JsonTKN.CONNECTION_ACQUISITION_TIMEOUT.value,
+    u_skel.JsonTKN.CONNECTION_TIMEOUT.value
+]
+
+DRIVER_CONFIG_NON_NEGATIVE: List[str] = [
+    u_skel.JsonTKN.MAX_TRANSACTION_RETRY_TIME.value,
+    u_skel.JsonTKN.LIVENESS_CHECK_TIMEOUT.value
+]
+
+
+#
+#   notifications_disabled_key:
+#       driver option that disables notification categories, depends on the version of the NEO4J driver
+#
+def notifications_disabled_key(
+    version: str = neo4j_version
+) -> str:
+    if int(version.split(".")[0]) >= CLASSIFICATIONS_MAJOR_VERSION:
+        return NOTIFICATIONS_DISABLED_CLASSIFICATIONS
+    return str(u_skel.JsonTKN.NOTIFICATIONS_DISABLED_CATEGORIES.value)
+
+
+def driver_config(
+    module_params: Dict[str, Any]
+) -> Dict[str, Any]:
+    config: Dict[str, Any] = {
+        key: module_params[key] for key in DRIVER_CONFIG if module_params.get(key) is not None
+    }
+    categories: Optional[List[str]] = config.pop(u_skel.JsonTKN.NOTIFICATIONS_DISABLED_CATEGORIES.value, None)
+    if categories is not None:
+        config[notifications_disabled_key()] = categories
+    return config
+
+#
+#   validate_driver_config:
+#       range checks on driver config options, choices are validated by argument_spec
+#
+#   returns:
+#       result -> True if driver config is valid
+#       payload -> driver config that is passed to GraphDatabase.driver()
+#       diagnostics -> error on first invalid option
+#
+def validate_driver_config(
+    module_params: Dict[str, Any]
+) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+    config: Dict[str, Any] = driver_config(module_params)
+    for key in DRIVER_CONFIG_POSITIVE:
+        if key in config and config[key] <= 0:
+            return (False, {}, {u_skel.JsonTKN.ERROR_MSG.value: f"'{key}' must be > 0, got {config[key]}"})
+    for key in DRIVER_CONFIG_NON_NEGATIVE:
+        if key in config and config[key] < 0:
+            return (False, {}, {u_skel.JsonTKN.ERROR_MSG.value: f"'{key}' must be >= 0, got {config[key]}"})
+    fetch_size: Optional[int] = config.get(u_skel.JsonTKN.FETCH_SIZE.value)
+    if fetch_size is not None and (fetch_size == 0 or fetch_size < -1):
+        return (False, {}, {u_skel.JsonTKN.ERROR_MSG.value: f"'fetch_size' must be > 0 or -1, got {fetch_size}"})
+    return (True, config, {})
 
 
 def get_neo4j_driver(
     db_uri: str,
     db_username: str,
-    db_password: str
+    db_password: str,
+    config: Optional[Dict[str, Any]] = None
 ) -> Driver:
     return GraphDatabase.driver(
         uri=db_uri,
-        auth=basic_auth(db_username, db_password)
+        auth=basic_auth(db_username, db_password),
+        **(config or {})
     )
 
 
+@u_trace.stage(u_trace.SPAN_DRIVER)
 def get_driver(
     module_params: Dict[str, Any],
 ) -> Driver:
     db_uri: str = module_params[u_skel.JsonTKN.NEO4J_URI.value]
     db_username: str = module_params[u_skel.JsonTKN.USERNAME.value]
     db_password: str = module_params[u_skel.JsonTKN.PASSWORD.value]
+    config: Dict[str, Any] = driver_config(module_params)
+    if module_params.get(u_skel.JsonTKN.BROKER.value):
+        from . import broker as u_broker # pylint: disable=import-outside-toplevel
+        return cast(Driver, u_broker.BrokerDriver(
+            db_uri=db_uri,
+            db_username=db_username,
+            db_password=db_password,
+            socket_path=module_params.get(u_skel.JsonTKN.BROKER_SOCKET.value),
+            idle_timeout=module_params.get(u_skel.JsonTKN.BROKER_IDLE_TIMEOUT.value) or u_broker.BROKER_IDLE_TIMEOUT,
+            config=config
+        ))
     return get_neo4j_driver(
         db_uri=db_uri,
         db_username=db_username,
-        db_password=db_password
+        db_password=db_password,
+        config=config
     )
@@ -0,0 +1,110 @@
+"""
+    Filename: ./module_utils/fanout.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        Concurrent fan-out of independent read queries
+"""
+from typing import Dict, Any, List, Tuple, Optional
+from time import perf_counter
+from concurrent.futures import ThreadPoolExecutor
+
+from neo4j import Driver
+from neo4j.exceptions import Neo4jError
+
+from . import skeleton as u_skel
+from . import trace as u_trace
+from . import cypher as u_cypher
+from . import shared as u_shared
+from . import stats as u_stats
+from . import slowlog as u_slowlog
+
+#
+#   Notes:
+#   - a NEO4J driver is thread-safe, a session is not: every query acquires its own session
+#   - the pool of sessions is bounded by max_concurrency (number of worker threads)
+#   - queries are independent: a failing query does not cancel the other queries
+#   - fan-out is protected by session.execute_read(), write queries are rejected by NEO4J
+#   - wall-clock time is determined by the slowest query instead of the sum of all queries
+#   - slow queries are appended to the slow log by the caller thread, as results are collected
+#
+
+#
+#   query_read:
+#       executes a single named query in its own session
+#
+#   returns:
+#       name -> name of the query
+#       result -> True if query succeeded
+#       payload -> payload_exit on success, payload_fail/payload_abend on failure
+#
+def query_read(
+    driver: Driver,
+    database: str,
+    name: str,
+    query_result: Tuple[str, Dict[str, Any], str],
+    result_format: str,
+    property_keys: Optional[List[str]] = None
+) -> Tuple[str, bool, Dict[str, Any]]:
+    cypher_query, cypher_params, cypher_query_inline = query_result
+    start: float = perf_counter()
+    try:
+        with u_trace.session_span(cypher_query), driver.session(database=database) as session:
+            cypher_response, result_summary = session.execute_read(
+                u_cypher.query_tx_format,
+                cypher_query,
+                cypher_params,
+                result_format,
+                property_keys
+                )
+        round_trip_msec: float = (perf_counter() - start) * 1000
+    except Neo4jError as e:
+        return (name, False, u_skel.payload_fail(cypher_query, cypher_params, cypher_query_inline, e))
+    except Exception as e: # pylint: disable=broad-exception-caught
+        return (name, False, u_skel.payload_abend(e))
+    payload: Dict[str, Any] = u_skel.payload_exit(
+        cypher_query,
+        cypher_params,
+        cypher_query_inline,
+        u_shared.serialize_neo4j(cypher_response),
+        u_stats.cypher_stats(result_summary, round_trip_msec)
+        )
+    return (name, True, payload)
+
+#
+#   query_fanout:
+#       executes named queries concurrently over a bounded pool of sessions
+#       succeeded queries slower than slow_threshold_ms are appended to the slow log (when given)
+#
+#   returns:
+#       result -> True if all queries succeeded
+#       payload -> results keyed by query name
+#       diagnostics -> failures keyed by query name
+#
+def query_fanout(
+    driver: Driver,
+    database: str,
+    query_results: List[Tuple[str, Tuple[str, Dict[str, Any], str]]],
+    max_concurrency: int,
+    result_format: str,
+    property_keys: Optional[List[str]] = None,
+    slow_log: Optional[u_slowlog.SlowLog] = None
+) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+    payload: Dict[str, Any] = {}
+    diagnostics: Dict[str, Any] = {}
+    max_workers: int = max(1, min(max_concurrency, len(query_results)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(query_read, driver, database, name, query_result, result_format, property_keys)
+            for name, query_result in query_results
+        ]
+        for future in futures:
+            name, result, response = future.result()
+            if result:
+                payload[name] = response
+                if slow_log is not None:
+                    slow_log.capture_query(response, name)
+            else:
+                diagnostics[name] = response
+    return (not diagnostics, payload, diagnostics)
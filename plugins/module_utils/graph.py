@@ -0,0 +1,149 @@
+"""
+    Filename: ./module_utils/graph.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        Graph-native result shape: deduplicated node, relationship and path tables
+"""
+from typing import Dict, Any, List, Optional, Tuple
+
+from neo4j import Record
+from neo4j.graph import Node, Relationship, Path
+
+from . import skeleton as u_skel
+
+#
+#   Notes:
+#   - response.data() flattens nodes, relationships and paths into nested dicts
+#     and repeats every shared node in every path
+#   - graph_response stores every node and relationship once, keyed by its element_id
+#       nodes -> {element_id, labels, properties}
+#       relationships -> {element_id, type, start, end, properties}, start/end are node indices
+#       paths -> {nodes, relationships}, both are index sequences into the tables above, deduplicated
+#   - rows keep the query column order, graph values are replaced by a reference
+#       {"node": idx} | {"relationship": idx} | {"path": idx}
+#   - indices are assigned in order of first appearance, element_ids are stable within a transaction
+#   - a node only known as endpoint of a relationship is completed when the full node appears later
+#   - graph_properties projects properties of nodes and relationships to the given keys
+#   - values are not serialized, serialize_neo4j is applied when building the payload
+#
+
+
+class GraphEncoder:
+
+    def __init__(
+        self,
+        property_keys: Optional[List[str]] = None
+    ) -> None:
+        self.property_keys: Optional[List[str]] = property_keys
+        self.nodes: List[Dict[str, Any]] = []
+        self.relationships: List[Dict[str, Any]] = []
+        self.paths: List[Dict[str, Any]] = []
+        self._node_index: Dict[str, int] = {}
+        self._relationship_index: Dict[str, int] = {}
+        self._path_index: Dict[Tuple[Tuple[int, ...], Tuple[int, ...]], int] = {}
+
+    def _properties(
+        self,
+        entity: Any
+    ) -> Dict[str, Any]:
+        if self.property_keys is None:
+            return dict(entity.items())
+        return {key: entity[key] for key in self.property_keys if key in entity}
+
+    def node(
+        self,
+        node: Node
+    ) -> int:
+        idx: Optional[int] = self._node_index.get(node.element_id)
+        if idx is None:
+            idx = len(self.nodes)
+            self._node_index[node.element_id] = idx
+            self.nodes.append({
+                u_skel.JsonTKN.ELEMENT_ID.value: node.element_id,
+                u_skel.JsonTKN.LABELS.value: sorted(node.labels),
+                u_skel.JsonTKN.PROPERTIES.value: self._properties(node)
+                })
+            return idx
+
+        # endpoint-only node (no labels, no properties) completed by full node
+        known: Dict[str, Any] = self.nodes[idx]
+        if not known[u_skel.JsonTKN.LABELS.value] and node.labels:
+            known[u_skel.JsonTKN.LABELS.value] = sorted(node.labels)
+        if not known[u_skel.JsonTKN.PROPERTIES.value] and len(node) > 0:
+            known[u_skel.JsonTKN.PROPERTIES.value] = self._properties(node)
+        return idx
+
+    def relationship(
+        self,
+        relationship: Relationship
+    ) -> int:
+        idx: Optional[int] = self._relationship_index.get(relationship.element_id)
+        if idx is not None:
+            return idx
+        start: Optional[int] = self.node(relationship.start_node) if relationship.start_node is not None else None
+        end: Optional[int] = self.node(relationship.end_node) if relationship.end_node is not None else None
+        idx = len(self.relationships)
+        self._relationship_index[relationship.element_id] = idx
+        self.relationships.append({
+            u_skel.JsonTKN.ELEMENT_ID.value: relationship.element_id,
+            u_skel.JsonTKN.TYPE.value: relationship.type,
+            u_skel.JsonTKN.START.value: start,
+            u_skel.JsonTKN.END.value: end,
+            u_skel.JsonTKN.PROPERTIES.value: self._properties(relationship)
+            })
+        return idx
+
+    def path(
+        self,
+        path: Path
+    ) -> int:
+        nodes: Tuple[int, ...] = tuple(self.node(node) for node in path.nodes)
+        relationships: Tuple[int, ...] = tuple(self.relationship(relationship) for relationship in path.relationships)
+        idx: Optional[int] = self._path_index.get((nodes, relationships))
+        if idx is not None:
+            return idx
+        idx = len(self.paths)
+        self._path_index[(nodes, relationships)] = idx
+        self.paths.append({
+            u_skel.JsonTKN.NODES.value: list(nodes),
+            u_skel.JsonTKN.RELATIONSHIPS.value: list(relationships)
+            })
+        return idx
+
+    def encode(
+        self,
+        value: Any
+    ) -> Any:
+        if isinstance(value, Node):
+            return {u_skel.JsonTKN.NODE.value: self.node(value)}
+        if isinstance(value, Relationship):
+            return {u_skel.JsonTKN.RELATIONSHIP.value: self.relationship(value)}
+        if isinstance(value, Path):
+            return {u_skel.JsonTKN.PATH.value: self.path(value)}
+        if isinstance(value, list):
+            return [self.encode(v) for v in value]
+        if isinstance(value, dict):
+            return {k: self.encode(v) for k, v in value.items()}
+        return value
+
+#
+#   graph_response:
+#       encodes records as deduplicated node, relationship and path tables
+#       plus rows that reference these tables by index
+#
+def graph_response(
+    columns: List[str],
+    records: List[Record],
+    property_keys: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    encoder: GraphEncoder = GraphEncoder(property_keys)
+    rows: List[List[Any]] = [[encoder.encode(value) for value in record.values()] for record in records]
+    return {
+        u_skel.JsonTKN.COLUMNS.value: columns,
+        u_skel.JsonTKN.NODES.value: encoder.nodes,
+        u_skel.JsonTKN.RELATIONSHIPS.value: encoder.relationships,
+        u_skel.JsonTKN.PATHS.value: encoder.paths,
+        u_skel.JsonTKN.ROWS.value: rows
+        }
@@ -0,0 +1,162 @@
+"""
+    Filename: ./module_utils/histogram.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        Fixed memory latency histogram and slowest batches for bulk execution
+"""
+from typing import Dict, Any, List, Tuple
+import heapq
+
+from . import skeleton as u_skel
+
+#
+#   Notes:
+#   - LatencyHistogram is log-linear (HDR style), latencies are recorded in microseconds
+#       values below SUB_BUCKETS have their own bucket (exact)
+#       above, every power of 2 is split in SUB_BUCKETS/2 linear buckets -> relative error below 1/32 (~3%)
+#       memory is fixed (BUCKETS counters) regardless of the number of batches, values beyond the range are clamped
+#   - percentiles report the upper bound of their bucket (never below the real value), max is exact
+#   - cumulative(le) counts the buckets that lie entirely below le (Prometheus histogram buckets),
+#     a bucket that straddles le is counted in the next bound
+#   - SlowestBatches keeps the SLOWEST_BATCHES slowest batches (min-heap), with batch index and row range
+#       the row range is the offset of the batch in the processed rows, as object_index of payload_bulk_fail
+#
+SUB_BUCKET_BITS: int = 6
+SUB_BUCKETS: int = 1 << SUB_BUCKET_BITS
+HALF_SUB_BUCKETS: int = SUB_BUCKETS >> 1
+MAX_SHIFT: int = 30
+BUCKETS: int = SUB_BUCKETS + MAX_SHIFT * HALF_SUB_BUCKETS
+SLOWEST_BATCHES: int = 5
+PERCENTILES: List[Tuple[str, float]] = [
+    (u_skel.JsonTKN.LATENCY_P50_MSEC.value, 50.0),
+    (u_skel.JsonTKN.LATENCY_P90_MSEC.value, 90.0),
+    (u_skel.JsonTKN.LATENCY_P99_MSEC.value, 99.0)
+]
+
+
+def bucket_index(
+    usec: int
+) -> int:
+    if usec < SUB_BUCKETS:
+        return max(usec, 0)
+    shift: int = usec.bit_length() - SUB_BUCKET_BITS
+    if shift > MAX_SHIFT:
+        return BUCKETS - 1
+    return SUB_BUCKETS + (shift - 1) * HALF_SUB_BUCKETS + (usec >> shift) - HALF_SUB_BUCKETS
+
+#
+#   bucket_upper:
+#       highest latency (usec) that is recorded in bucket idx
+#
+def bucket_upper(
+    idx: int
+) -> int:
+    if idx < SUB_BUCKETS:
+        return idx
+    shift: int = (idx - SUB_BUCKETS) // HALF_SUB_BUCKETS + 1
+    sub_bucket: int = (idx - SUB_BUCKETS) % HALF_SUB_BUCKETS + HALF_SUB_BUCKETS
+    return ((sub_bucket + 1) << shift) - 1
+
+
+class LatencyHistogram:
+
+    def __init__(
+        self
+    ) -> None:
+        self.counts: List[int] = [0] * BUCKETS
+        self.count: int = 0
+        self.max_usec: int = 0
+        self.sum_usec: int = 0
+
+    def record(
+        self,
+        latency_msec: float
+    ) -> None:
+        usec: int = int(latency_msec * 1000)
+        self.counts[bucket_index(usec)] += 1
+        self.count += 1
+        self.max_usec = max(self.max_usec, usec)
+        self.sum_usec += usec
+
+    def merge(
+        self,
+        other: "LatencyHistogram"
+    ) -> None:
+        self.counts = [count + other_count for count, other_count in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.max_usec = max(self.max_usec, other.max_usec)
+        self.sum_usec += other.sum_usec
+
+    #
+    #   percentile:
+    #       latency (msec) below which percent of the recorded batches fall, 0 when nothing is recorded
+    #
+    def percentile(
+        self,
+        percent: float
+    ) -> float:
+        if self.count == 0:
+            return 0
+        rank: float = max(percent / 100 * self.count, 1)
+        cumulative: int = 0
+        for idx, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return min(bucket_upper(idx), self.max_usec) / 1000
+        return self.max_usec / 1000
+
+    #
+    #   cumulative:
+    #       number of recorded batches with a latency of at most le_msec (bucket resolution)
+    #
+    def cumulative(
+        self,
+        le_msec: float
+    ) -> int:
+        le_usec: int = int(le_msec * 1000)
+        return sum(count for idx, count in enumerate(self.counts) if count and bucket_upper(idx) <= le_usec)
+
+    def as_payload(
+        self
+    ) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {key: self.percentile(percent) for key, percent in PERCENTILES}
+        payload[u_skel.JsonTKN.LATENCY_MAX_MSEC.value] = self.max_usec / 1000
+        return payload
+
+
+class SlowestBatches:
+
+    def __init__(
+        self,
+        size: int = SLOWEST_BATCHES
+    ) -> None:
+        self.size: int = size
+        self._heap: List[Tuple[float, int, int, int]] = []
+
+    def record(
+        self,
+        latency_msec: float,
+        idx: int,
+        first_row: int,
+        rows: int
+    ) -> None:
+        entry: Tuple[float, int, int, int] = (latency_msec, idx, first_row, first_row + rows - 1)
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    #
+    #   as_payload:
+    #       slowest batches first, row range is [first_row, last_row]
+    #
+    def as_payload(
+        self
+    ) -> List[Dict[str, Any]]:
+        return [{
+            u_skel.JsonTKN.BATCH.value: idx,
+            u_skel.JsonTKN.ROWS.value: [first_row, last_row],
+            u_skel.JsonTKN.LATENCY_MSEC.value: latency_msec
+            } for latency_msec, idx, first_row, last_row in sorted(self._heap, reverse=True)]
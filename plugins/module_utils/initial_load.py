@@ -0,0 +1,150 @@
+"""
+    Filename: ./module_utils/initial_load.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        Initial-load fast path for vertex_bulk - CREATE into empty labels
+"""
+from typing import Dict, Any, List, Tuple, Optional
+
+from neo4j import Driver
+from neo4j.exceptions import Neo4jError
+
+from . import skeleton as u_skel
+from . import cypher as u_cypher
+from . import cypher_query as u_cyph_q
+from . import input as u_input
+
+#
+#   Notes:
+#   - initial_load (vertex_bulk) is the fast path for a first-time load into empty labels
+#       singleton vertices are CREATEd instead of MERGEd - no index lookup and no lock per row
+#       CREATE is only equivalent to MERGE when nothing can match:
+#       every label of the vertex file is empty and (label, entity_name) is unique within the file
+#       both preconditions are checked before the first batch, a violation fails without writes
+#   - post_load_indexes lists (label, property_key) indexes that are created after the last batch
+#       an index that exists during the load is maintained by every CREATE
+#       the module waits until the indexes are online, build time is reported as index_build_msec
+#       unique constraints (constraint module) are not postponed, create them before the load when required
+#   - initial_load is not combined with sharding, shards would find each other's vertices in the emptiness check
+#
+SHARD_OPTIONS: List[str] = [
+    u_skel.JsonTKN.SHARD_INDEX.value,
+    u_skel.JsonTKN.SHARD_COUNT.value,
+    u_skel.JsonTKN.AUTO_SHARD.value
+]
+
+INDEX_INPUTS: List[str] = [
+    u_skel.JsonTKN.LABEL.value,
+    u_skel.JsonTKN.PROPERTY_KEY.value
+]
+
+#
+#   validate_post_load_indexes:
+#       every index has a valid label and property_key (NEO4J identifiers)
+#
+#   returns:
+#       result -> True if all indexes are valid
+#       payload -> list of (normalised label, normalised property_key)
+#       diagnostics -> error of first invalid index, including its index
+#
+def validate_post_load_indexes(
+    indexes: List[Dict[str, Any]]
+) -> Tuple[bool, List[Tuple[str, str]], Dict[str, Any]]:
+    validated: List[Tuple[str, str]] = []
+    for idx, index in enumerate(indexes):
+        if not isinstance(index, dict) or not all(index.get(key) for key in INDEX_INPUTS):
+            return (False, [], {
+                u_skel.JsonTKN.ERROR_MSG.value: "post_load_indexes entries require 'label' and 'property_key'",
+                u_skel.JsonTKN.OBJECT_INDEX.value: idx
+                })
+        result, diagnostics = u_input.validate_cypher_inputs(INDEX_INPUTS, index)
+        if not result:
+            return (False, [], diagnostics | {u_skel.JsonTKN.OBJECT_INDEX.value: idx})
+        validated.append((
+            index[u_skel.JsonTKN.LABEL.value].capitalize(),
+            index[u_skel.JsonTKN.PROPERTY_KEY.value].lower()
+            ))
+    return (True, validated, {})
+
+#
+#   initial_load_check:
+#       option checks and duplicate check on the entities of the vertex file
+#
+#   returns:
+#       result -> True if initial_load is off or its preconditions in the file hold
+#       payload -> (labels, post_load_indexes) or None when initial_load is off
+#       diagnostics -> error on invalid options or the first duplicate vertex
+#
+def initial_load_check(
+    module_params: Dict[str, Any],
+    entities: List[Dict[str, Any]]
+) -> Tuple[bool, Optional[Tuple[List[str], List[Tuple[str, str]]]], Dict[str, Any]]:
+    indexes: List[Dict[str, Any]] = module_params.get(u_skel.JsonTKN.POST_LOAD_INDEXES.value) or []
+    if not module_params.get(u_skel.JsonTKN.INITIAL_LOAD.value):
+        if indexes:
+            return (False, None, {u_skel.JsonTKN.ERROR_MSG.value: "'post_load_indexes' requires 'initial_load'"})
+        return (True, None, {})
+    for option in SHARD_OPTIONS:
+        if module_params.get(option) is not None and module_params.get(option) is not False:
+            return (False, None, {u_skel.JsonTKN.ERROR_MSG.value:
+                f"'initial_load' and '{option}' are mutually exclusive"})
+    index_result: Tuple[bool, List[Tuple[str, str]], Dict[str, Any]] = validate_post_load_indexes(indexes)
+    result, validated_indexes, diagnostics = index_result
+    if not result:
+        return (False, None, diagnostics)
+
+    # CREATE requires unique vertices - (label, entity_name) occurs once in the file
+    seen: Dict[Tuple[str, str], int] = {}
+    for idx, entity in enumerate(entities):
+        label: Any = entity.get(u_skel.JsonTKN.LABEL.value)
+        entity_name: Any = entity.get(u_skel.JsonTKN.ENTITY_NAME.value)
+        if not isinstance(label, str) or not isinstance(entity_name, str):
+            continue
+        key: Tuple[str, str] = (label.capitalize(), entity_name)
+        if key in seen:
+            return (False, None, {
+                u_skel.JsonTKN.ERROR_MSG.value:
+                    f"initial_load requires unique vertices, '{key[0]}:{entity_name}' duplicates object {seen[key]}",
+                u_skel.JsonTKN.OBJECT_INDEX.value: idx
+                })
+        seen[key] = idx
+    labels: List[str] = list(dict.fromkeys(label for label, _ in seen))
+    return (True, (labels, validated_indexes), {})
+
+#
+#   labels_empty:
+#       initial_load precondition in the graph - no vertex carries one of the labels (count store lookup)
+#
+#   returns:
+#       result -> True if all labels are empty
+#       payload -> empty
+#       diagnostics -> first populated label or payload_fail
+#
+def labels_empty(
+    driver: Driver,
+    database: str,
+    labels: List[str]
+) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+    with driver.session(database=database) as session:
+        for label in labels:
+            cypher_query: str = u_cyph_q.cypher_label_count(label)
+            try:
+                record = session.run(cypher_query).single()
+            except Neo4jError as e:
+                return (False, {}, u_skel.payload_fail(cypher_query, {}, cypher_query, e))
+            count: int = record[u_skel.JsonTKN.COUNT.value] if record is not None else 0
+            if count > 0:
+                return (False, {}, {u_skel.JsonTKN.ERROR_MSG.value:
+                    f"initial_load requires an empty label, '{label}' has {count} vertices"})
+    return (True, {}, {})
+
+
+def post_load_indexes(
+    driver: Driver,
+    database: str,
+    indexes: List[Tuple[str, str]]
+) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+    statements: List[str] = [u_cyph_q.cypher_node_index_add(label, property_key) for label, property_key in indexes]
+    return u_cypher.schema_run(driver, database, statements)
@@ -0,0 +1,113 @@
+"""
+    Filename: ./module_utils/ledger.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        Append-only ledger ingest for edges with a unique_key
+"""
+from typing import Dict, Any, Tuple, Set, Optional, List
+import json
+
+from neo4j import Driver
+
+from . import skeleton as u_skel
+from . import cypher as u_cypher
+from . import cypher_query as u_cyph_q
+
+#
+#   Notes:
+#   - ledger (edge_bulk) is meant for append-only relationship streams (TRANSACTION with unique_key)
+#       MERGE (a)-[r:TYPE {unique_key: $value}]->(b) scans all relationships between a and b,
+#       its cost grows with the history of the accounts
+#   - ledger edges: state present, unique_key set and not stored as two relationships (bi_directional double)
+#       other edges of the file follow the regular MERGE path
+#   - before the first batch a relationship property index is created per (type, unique_key), IF NOT EXISTS,
+#     and db.awaitIndexes waits until the indexes are online
+#   - every batch checks existence per row by index seek and CREATEs the new relationships (EDGE_BULK_LEDGER)
+#       with fingerprint the new relationships store _fingerprint, existing ones are never compared or rewritten
+#   - duplicates within the edge file (same type, endpoints and unique_key value) are dropped before batching,
+#     the first occurrence wins, duplicates are reported in the summary
+#
+
+
+def ledger_edge(
+    entity: Dict[str, Any]
+) -> bool:
+    return bool(
+        u_skel.state_present(entity[u_skel.JsonTKN.STATE.value]) and
+        entity.get(u_skel.JsonTKN.UNIQUE_KEY.value) and
+        (not entity[u_skel.JsonTKN.BI_DIRECTIONAL.value] or u_cypher.single_storage(entity))
+    )
+
+#
+#   ledger_key:
+#       identity of a ledger edge - type, canonical endpoints, unique_key and its (uncasted) value
+#
+#   returns:
+#       key or None when the entity does not take the ledger path
+#
+def ledger_key(
+    entity: Dict[str, Any]
+) -> Optional[Tuple[str, ...]]:
+    if not ledger_edge(entity):
+        return None
+    vertex_from, vertex_to = u_cypher.edge_endpoints(entity)
+    unique_key: str = entity[u_skel.JsonTKN.UNIQUE_KEY.value].lower()
+    properties: Dict[str, Any] = entity.get(u_skel.JsonTKN.PROPERTIES.value) or {}
+    value: Any = next((value for key, value in properties.items() if key.lower() == unique_key), None)
+    return (
+        entity[u_skel.JsonTKN.TYPE.value].upper(),
+        vertex_from[u_skel.JsonTKN.LABEL.value].capitalize(),
+        vertex_from[u_skel.JsonTKN.ENTITY_NAME.value],
+        vertex_to[u_skel.JsonTKN.LABEL.value].capitalize(),
+        vertex_to[u_skel.JsonTKN.ENTITY_NAME.value],
+        unique_key,
+        json.dumps(value, sort_keys=True, default=str)
+    )
+
+
+class Ledger: # pylint: disable=too-few-public-methods
+
+    def __init__(
+        self
+    ) -> None:
+        self.seen: Set[Tuple[str, ...]] = set()
+        self.indexes: Set[Tuple[str, str]] = set()
+        self.duplicates: int = 0
+
+    #
+    #   admit:
+    #       member filter for bulk_prepare - drops duplicate ledger edges, collects the indexes to create
+    #
+    def admit(
+        self,
+        entity: Dict[str, Any]
+    ) -> bool:
+        key: Optional[Tuple[str, ...]] = ledger_key(entity)
+        if key is None:
+            return True
+        if key in self.seen:
+            self.duplicates += 1
+            return False
+        self.seen.add(key)
+        self.indexes.add((key[0], key[5]))
+        return True
+
+#
+#   ledger_indexes:
+#       creates the relationship property indexes of the ledger and waits until they are online
+#
+#   returns:
+#       result -> True if all indexes are online
+#       payload -> empty
+#       diagnostics -> payload_fail of the failing statement
+#
+def ledger_indexes(
+    driver: Driver,
+    database: str,
+    indexes: Set[Tuple[str, str]]
+) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+    statements: List[str] = [u_cyph_q.cypher_relationship_index_add(relation_type, property_key)
+        for relation_type, property_key in sorted(indexes)]
+    return u_cypher.schema_run(driver, database, statements)
@@ -0,0 +1,381 @@
+"""
+    Filename: ./module_utils/loader.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        Combined vertex and edge pipeline (graph_load) - edge preparation overlaps vertex writes
+"""
+from typing import Dict, Any, List, Tuple, Optional, Callable
+from functools import partial
+from threading import Condition, Thread
+from time import perf_counter
+
+from neo4j import Driver
+
+from . import argument_spec as u_args
+from . import skeleton as u_skel
+from . import cypher as u_cypher
+from . import shared as u_shared
+from . import driver as u_driver
+from . import stats as u_stats
+from . import throttle as u_throttle
+from . import bulk as u_bulk
+from . import slowlog as u_slowlog
+from . import memory as u_mem
+from . import metrics as u_metrics
+
+#
+#   Notes:
+#   - one driver, two sessions: vertex writer (thread) and edge writer (caller)
+#       vertex_file is loaded, validated and batched before the vertex writer starts
+#       edge_file is loaded, validated and batched while the vertex writer runs
+#   - vertex batches are ordered by label (order of first appearance in vertex_file)
+#       rank of a label is its position in that order, a label is committed after its last batch
+#   - rank of an edge is the highest rank of its endpoint labels, -1 if no endpoint label is loaded
+#       edge batches are ordered by rank, a batch starts once the vertex writer committed its rank
+#   - edge and vertex batches never lock the same label at the same time
+#   - the first failure aborts the other writer between batches, committed batches stay committed
+#   - throttle options apply to the combined load (one shared budget)
+#   - both writers append to one slow log, the batch index of a record is relative to its phase
+#   - wall-clock time approaches max(vertex load, edge load) instead of the sum
+#       phase timers of the combined summary are the sum of both phases, they overlap in wall-clock time
+#       latency percentiles cover the batches of both phases, slowest_batches are reported per phase
+#       memory_phases of the combined summary hold the highest high-water mark of both phases (one process)
+#
+ENTITY_COUNTERS: List[str] = list(dict.fromkeys(u_bulk.VERTEX_COUNTERS + u_bulk.EDGE_COUNTERS))
+
+SUMMARY_COUNTERS: List[str] = [
+    u_skel.JsonTKN.PROCESSED.value,
+    u_skel.JsonTKN.SKIPPED.value,
+    u_skel.JsonTKN.RETRIES.value,
+    u_skel.JsonTKN.PROPERTIES_SKIPPED.value,
+    u_skel.JsonTKN.ERRORS.value
+]
+
+
+class GraphGate:
+
+    def __init__(
+        self
+    ) -> None:
+        self.committed: int = 0
+        self.aborted: bool = False
+        self.diagnostics: Dict[str, Any] = {}
+        self._condition: Condition = Condition()
+
+    def commit(
+        self,
+        rank: int
+    ) -> None:
+        with self._condition:
+            self.committed = max(self.committed, rank + 1)
+            self._condition.notify_all()
+
+    #
+    #   abort:
+    #       stops both writers, diagnostics of the first failure are kept as root cause
+    #
+    def abort(
+        self,
+        diagnostics: Dict[str, Any]
+    ) -> None:
+        with self._condition:
+            if not self.aborted:
+                self.aborted = True
+                self.diagnostics = diagnostics
+            self._condition.notify_all()
+
+    #
+    #   wait:
+    #       blocks until all vertex labels up to rank are committed
+    #
+    #   returns:
+    #       False if the load was aborted
+    #
+    def wait(
+        self,
+        rank: int
+    ) -> bool:
+        with self._condition:
+            self._condition.wait_for(lambda: self.aborted or self.committed > rank)
+            return not self.aborted
+
+#
+#   ranked_batches:
+#       batches entity results per rank, in ascending rank order
+#
+#   returns:
+#       batches -> List of (bulk_cypher_query, batch_bindings)
+#       ranks -> rank per batch
+#
+def ranked_batches(
+    entity_results: List[Tuple[str, Dict[str, Any], str]],
+    entity_ranks: List[int],
+    batcher: Callable[[List[Tuple[str, Dict[str, Any], str]], int], List[Tuple[str, Dict[str, Any]]]]
+) -> Tuple[List[Tuple[str, Dict[str, Any]]], List[int]]:
+    groups: Dict[int, List[Tuple[str, Dict[str, Any], str]]] = {}
+    for rank, entity_result in zip(entity_ranks, entity_results):
+        groups.setdefault(rank, []).append(entity_result)
+    batches: List[Tuple[str, Dict[str, Any]]] = []
+    ranks: List[int] = []
+    for rank in sorted(groups):
+        rank_batches: List[Tuple[str, Dict[str, Any]]] = batcher(groups[rank], u_bulk.BATCH_SIZE)
+        batches.extend(rank_batches)
+        ranks.extend([rank] * len(rank_batches))
+    return (batches, ranks)
+
+#
+#   graph_prepare:
+#       loads and validates one entity file, ranks every entity
+#       sets total and the load, validate, cast and build time in summary
+#
+#   returns:
+#       result -> True if file is valid
+#       payload -> (batches, ranks per batch)
+#       diagnostics -> error of first invalid entity
+#
+def graph_prepare(
+    check_mode: bool,
+    entity_file: str,
+    entity_anchor: str,
+    entity_spec: Dict[str, Any],
+    input_list: List[str],
+    primitive: Callable[[bool, Dict[str, Any], Dict[str, Any]], Tuple[str, Dict[str, Any], str]],
+    batcher: Callable[[List[Tuple[str, Dict[str, Any], str]], int], List[Tuple[str, Dict[str, Any]]]],
+    rank: Callable[[Dict[str, Any]], int],
+    summary: u_stats.EntitySummary
+) -> Tuple[bool, Tuple[List[Tuple[str, Dict[str, Any]]], List[int]], Dict[str, Any]]:
+    start: float = perf_counter()
+    load_result: Tuple[bool, Any, Dict[str, Any]] = u_shared.load_yaml_file(entity_file, entity_anchor)
+    summary.load_msec = (perf_counter() - start) * 1000
+    result, entities, diagnostics = load_result
+    if not result:
+        return (False, ([], []), diagnostics)
+    summary.total = len(entities)
+    memory_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = summary.memory_mark(u_mem.PHASE_LOAD)
+    if not memory_result[0]:
+        return (False, ([], []), memory_result[2])
+    prepare_result: Tuple[bool, List[Tuple[str, Dict[str, Any], str]], Dict[str, Any]] = u_bulk.bulk_prepare(
+        entities,
+        entity_spec,
+        input_list,
+        primitive,
+        check_mode,
+        summary=summary
+        )
+    result, entity_results, diagnostics = prepare_result
+    if not result:
+        return (False, ([], []), diagnostics)
+    start = perf_counter()
+    batches, ranks = ranked_batches(entity_results, [rank(entity) for entity in entities], batcher)
+    summary.build_msec += (perf_counter() - start) * 1000
+    memory_result = summary.memory_mark(u_mem.PHASE_BUILD)
+    if not memory_result[0]:
+        return (False, ([], []), memory_result[2])
+    return (True, (batches, ranks), {})
+
+
+def vertex_rank(
+    ranks: Dict[str, int],
+    entity: Dict[str, Any]
+) -> int:
+    return ranks.setdefault(entity[u_skel.JsonTKN.LABEL.value].capitalize(), len(ranks))
+
+
+def edge_rank(
+    ranks: Dict[str, int],
+    entity: Dict[str, Any]
+) -> int:
+    return max(
+        ranks.get(entity[u_skel.JsonTKN.FROM.value][u_skel.JsonTKN.LABEL.value].capitalize(), -1),
+        ranks.get(entity[u_skel.JsonTKN.TO.value][u_skel.JsonTKN.LABEL.value].capitalize(), -1)
+    )
+
+
+def summary_merge(
+    summary: u_stats.EntitySummary,
+    phases: List[u_stats.EntitySummary]
+) -> None:
+    for key in SUMMARY_COUNTERS + ENTITY_COUNTERS + u_stats.PHASE_TIMERS:
+        setattr(summary, key, sum(getattr(phase, key) for phase in phases))
+    for phase in phases:
+        summary.merge_latency(phase)
+        summary.merge_memory(phase)
+
+#
+#   vertex_writer:
+#       executes vertex batches, commits the rank of a label after its last batch
+#       aborts the gate on failure, so the edge writer stops waiting
+#
+def vertex_writer(
+    driver: Driver,
+    database: str,
+    vertex_batches: Tuple[List[Tuple[str, Dict[str, Any]]], List[int]],
+    summary: u_stats.EntitySummary,
+    throttle: u_throttle.Throttle,
+    gate: GraphGate,
+    outcome: List[Tuple[bool, Dict[str, Any], Dict[str, Any]]],
+    slow_log: Optional[u_slowlog.SlowLog]
+) -> None:
+    batches, ranks = vertex_batches
+
+    def committed(idx: int) -> None:
+        if idx + 1 == len(ranks) or ranks[idx + 1] != ranks[idx]:
+            gate.commit(ranks[idx])
+
+    try:
+        execute_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_bulk.bulk_execute(
+            driver,
+            database,
+            batches,
+            summary,
+            u_bulk.VERTEX_COUNTERS,
+            throttle,
+            before=lambda _: not gate.aborted,
+            after=committed,
+            slow_log=slow_log
+            )
+    except Exception as e: # pylint: disable=broad-exception-caught
+        execute_result = (False, {}, u_skel.payload_abend(e))
+    if not execute_result[0]:
+        gate.abort(execute_result[2])
+    outcome.append(execute_result)
+
+#
+#   edge_writer:
+#       loads and validates edge_file, executes edge batches once the ranks of their endpoint labels are committed
+#       aborts the gate on failure, so the vertex writer stops after its current batch
+#
+def edge_writer(
+    module_params: Dict[str, Any],
+    check_mode: bool,
+    driver: Driver,
+    summary: u_stats.EntitySummary,
+    throttle: u_throttle.Throttle,
+    gate: GraphGate,
+    ranks: Dict[str, int],
+    slow_log: Optional[u_slowlog.SlowLog]
+) -> None:
+    fingerprint: bool = bool(module_params.get(u_skel.JsonTKN.FINGERPRINT.value))
+    edge_result: Tuple[bool, Tuple[List[Tuple[str, Dict[str, Any]]], List[int]], Dict[str, Any]] = graph_prepare(
+        check_mode,
+        module_params[u_skel.JsonTKN.EDGE_FILE.value],
+        module_params[u_skel.JsonTKN.EDGE_ANCHOR.value],
+        u_args.argument_spec_edge(),
+        u_bulk.EDGE_INPUTS,
+        partial(u_bulk.edge_primitive, fingerprint=fingerprint),
+        partial(u_cypher.edge_bulk_add, fingerprint=fingerprint),
+        partial(edge_rank, ranks),
+        summary
+        )
+    result, (edge_batches, edge_ranks), diagnostics = edge_result
+    if not result:
+        gate.abort(diagnostics | {u_skel.JsonTKN.EDGE_FILE.value: module_params[u_skel.JsonTKN.EDGE_FILE.value]})
+        return
+    execute_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_bulk.bulk_execute(
+        driver,
+        module_params[u_skel.JsonTKN.DATABASE.value],
+        edge_batches,
+        summary,
+        u_bulk.EDGE_COUNTERS,
+        throttle,
+        before=lambda idx: gate.wait(edge_ranks[idx]),
+        slow_log=slow_log
+        )
+    result, _, diagnostics = execute_result
+    if not result:
+        gate.abort(diagnostics)
+
+#
+#   graph_load:
+#       vertex and edge pipeline on one driver, edge preparation overlaps vertex writes
+#
+#   returns:
+#       result -> True if all vertices and edges are loaded
+#       payload -> combined EntitySummary, per phase summaries in vertices/edges
+#       diagnostics -> error of first failing stage
+#
+def graph_load(
+    module_params: Dict[str, Any],
+    check_mode: bool
+) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+    summary: u_stats.EntitySummary = u_stats.EntitySummary(
+        memory_budget_mb=module_params.get(u_skel.JsonTKN.MEMORY_BUDGET_MB.value)
+        )
+    fingerprint: bool = bool(module_params.get(u_skel.JsonTKN.FINGERPRINT.value))
+    options_result: Tuple[bool, Tuple[Optional[Tuple[int, int]], Optional[u_throttle.Throttle]], Dict[str, Any]] = (
+        u_bulk.validate_bulk_options(module_params)
+        )
+    result, (_, throttle), diagnostics = options_result
+    if not result or throttle is None:
+        return (False, {}, diagnostics)
+
+    # labels of vertex_file in order of first appearance determine the rank
+    ranks: Dict[str, int] = {}
+    vertex_summary: u_stats.EntitySummary = u_stats.EntitySummary(memory_budget_mb=summary.memory_budget_mb)
+    vertex_result: Tuple[bool, Tuple[List[Tuple[str, Dict[str, Any]]], List[int]], Dict[str, Any]] = (
+        graph_prepare(
+            check_mode,
+            module_params[u_skel.JsonTKN.VERTEX_FILE.value],
+            module_params[u_skel.JsonTKN.VERTEX_ANCHOR.value],
+            u_args.argument_spec_vertex(),
+            u_bulk.VERTEX_INPUTS,
+            partial(u_bulk.vertex_primitive, fingerprint=fingerprint),
+            partial(u_cypher.vertex_bulk_add, fingerprint=fingerprint),
+            partial(vertex_rank, ranks),
+            vertex_summary
+            )
+        )
+    result, (vertex_batches, vertex_ranks), diagnostics = vertex_result
+    if not result:
+        return (False, {}, diagnostics | {u_skel.JsonTKN.VERTEX_FILE.value: module_params[u_skel.JsonTKN.VERTEX_FILE.value]})
+
+    edge_summary: u_stats.EntitySummary = u_stats.EntitySummary(memory_budget_mb=summary.memory_budget_mb)
+    gate: GraphGate = GraphGate()
+    outcome: List[Tuple[bool, Dict[str, Any], Dict[str, Any]]] = []
+    slow_log: Optional[u_slowlog.SlowLog] = u_slowlog.slow_log(module_params)
+    driver: Driver = u_driver.get_driver(module_params)
+    writer: Thread = Thread(
+        target=vertex_writer,
+        args=(
+            driver,
+            module_params[u_skel.JsonTKN.DATABASE.value],
+            (vertex_batches, vertex_ranks),
+            vertex_summary,
+            throttle,
+            gate,
+            outcome,
+            slow_log
+            ),
+        daemon=True
+        )
+    try:
+        writer.start()
+
+        # edge_file is loaded and validated while vertices are written
+        edge_writer(module_params, check_mode, driver, edge_summary, throttle, gate, ranks, slow_log)
+        writer.join()
+    except Exception as e: # pylint: disable=broad-exception-caught
+        gate.abort(u_skel.payload_abend(e))
+        writer.join()
+    finally:
+        driver.close()
+    summary.total = vertex_summary.total + edge_summary.total
+    summary_merge(summary, [vertex_summary, edge_summary])
+    u_bulk.throttle_stats(summary, throttle)
+    if not check_mode:
+        u_metrics.bulk_metrics(module_params, summary, not gate.aborted)
+    if gate.aborted:
+        return (False, {}, gate.diagnostics)
+    _, vertex_payload, _ = outcome[0]
+    return (True, summary.as_payload() | {
+        u_skel.JsonTKN.VERTICES.value: vertex_payload,
+        u_skel.JsonTKN.EDGES.value: edge_summary.as_payload()
+        }, {})
+
+
+def graph_changed(
+    payload: Dict[str, Any]
+) -> bool:
+    return u_bulk.vertex_changed(payload) or u_bulk.edge_changed(payload)
@@ -0,0 +1,81 @@
+"""
+    Filename: ./module_utils/memory.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        Process memory probes for the bulk summary and the soft memory budget
+"""
+from typing import Dict, Any, Optional
+from types import ModuleType
+import os
+import resource
+import sys
+
+from . import skeleton as u_skel
+
+#
+#   Notes:
+#   - peak RSS is the high-water mark of the process (getrusage), it never decreases
+#       the peak RSS of a phase is the high-water mark at the end of that phase
+#   - current RSS is read from /proc/self/statm (Linux), other platforms fall back to peak RSS
+#   - traced Python memory requires tracemalloc (trace_memory or profile_dir), it is None otherwise
+#       tracemalloc is only imported by profiler.start, a module that does not trace never loads it
+#       the traced peak is reset at the end of every phase -> the traced peak of a phase is the peak within that phase
+#   - the soft memory budget compares current RSS with memory_budget_mb, it is checked at phase boundaries and
+#     before every batch; a bulk run that exceeds it stops before its next write
+#
+MIB: int = 1024 * 1024
+STATM: str = "/proc/self/statm"
+PHASE_LOAD: str = "load"
+PHASE_PREPARE: str = "prepare"
+PHASE_BUILD: str = "build"
+PHASE_EXECUTE: str = "execute"
+
+
+def peak_rss_mb() -> float:
+    maxrss: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return maxrss / MIB
+    return maxrss / 1024
+
+
+def rss_mb() -> float:
+    try:
+        with open(STATM, "r", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / MIB
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+
+#
+#   tracer:
+#       tracemalloc when it is loaded and tracing, None otherwise
+#
+def tracer() -> Optional[ModuleType]:
+    module: Optional[ModuleType] = sys.modules.get("tracemalloc")
+    if module is None or not module.is_tracing():
+        return None
+    return module
+
+#
+#   traced_peak_mb:
+#       peak traced Python memory since the previous call (reset), None when tracemalloc is not tracing
+#
+def traced_peak_mb() -> Optional[float]:
+    traced: Optional[ModuleType] = tracer()
+    if traced is None:
+        return None
+    peak: int = traced.get_traced_memory()[1]
+    traced.reset_peak()
+    return peak / MIB
+
+#
+#   phase_marks:
+#       high-water marks at the end of a phase
+#
+def phase_marks() -> Dict[str, Any]:
+    traced: Optional[float] = traced_peak_mb()
+    return {
+        u_skel.JsonTKN.PEAK_RSS_MB.value: round(peak_rss_mb(), 1),
+        u_skel.JsonTKN.PEAK_TRACED_MB.value: round(traced, 1) if traced is not None else None
+        }
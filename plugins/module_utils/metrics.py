@@ -0,0 +1,206 @@
+"""
+    Filename: ./module_utils/metrics.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        Prometheus textfile-collector export of bulk runs and graph_reset
+"""
+from typing import Dict, Any, List, Optional, Tuple
+import os
+import tempfile
+import time
+
+from . import skeleton as u_skel
+from . import stats as u_stats
+
+#
+#   Notes:
+#   - metrics_file (bulk modules, graph_reset) writes the metrics of the run in the Prometheus text format,
+#     node_exporter picks it up with --collector.textfile.directory pointing at its directory
+#   - the file is replaced atomically (temporary file in the same directory + rename), a scrape never sees half a file
+#       the temporary file does not end in .prom, the textfile collector ignores it
+#   - every metric is a gauge of the last run (not a counter), labelled by file and database
+#       neo4j_bulk_entity_rows breaks the rows of the run down per label (vertices) or type (edges)
+#       write counters are reported per run, UNWIND batches mix labels and types
+#   - neo4j_bulk_batch_latency_seconds is a histogram of the batch latencies (LATENCY_BUCKETS, seconds)
+#       bucket counts come from the latency histogram of the summary (~3% resolution)
+#   - a failed run writes neo4j_bulk_success 0 with the counters of the batches committed before the failure
+#   - metrics are not written in check_mode, a metrics file that cannot be written never fails a module
+#
+BULK_PREFIX: str = "neo4j_bulk"
+RESET_PREFIX: str = "neo4j_graph_reset"
+LATENCY_BUCKETS: List[float] = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+
+# (metric, summary key, scale, help)
+BULK_GAUGES: List[Tuple[str, str, float, str]] = [
+    ("rows_total", u_skel.JsonTKN.TOTAL.value, 1, "Rows in the entity files of the last run"),
+    ("rows_processed", u_skel.JsonTKN.PROCESSED.value, 1, "Rows written by the last run"),
+    ("rows_skipped", u_skel.JsonTKN.SKIPPED.value, 1, "Rows of other shards or duplicates in the last run"),
+    ("nodes_created", u_skel.JsonTKN.NODES_CREATED.value, 1, "Nodes created by the last run"),
+    ("nodes_deleted", u_skel.JsonTKN.NODES_DELETED.value, 1, "Nodes deleted by the last run"),
+    ("relationships_created", u_skel.JsonTKN.RELATIONSHIPS_CREATED.value, 1, "Relationships created by the last run"),
+    ("relationships_deleted", u_skel.JsonTKN.RELATIONSHIPS_DELETED.value, 1, "Relationships deleted by the last run"),
+    ("properties_set", u_skel.JsonTKN.PROPERTIES_SET.value, 1, "Properties set by the last run"),
+    ("retries", u_skel.JsonTKN.RETRIES.value, 1, "Batches retried after a TransientError in the last run"),
+    ("errors", u_skel.JsonTKN.ERRORS.value, 1, "Errors of the last run"),
+    ("duration_seconds", u_skel.JsonTKN.ELAPSED_TIME_MSEC.value, 0.001, "Duration of the last run"),
+    ("execute_seconds", u_skel.JsonTKN.EXECUTE_MSEC.value, 0.001, "Client side batch time of the last run"),
+    ("server_seconds", u_skel.JsonTKN.SERVER_MSEC.value, 0.001, "Server time of the batches of the last run")
+]
+
+RESET_GAUGES: List[Tuple[str, str, float, str]] = [
+    ("nodes_deleted", u_skel.JsonTKN.NODES_DELETED.value, 1, "Nodes deleted by the last reset"),
+    ("relationships_deleted", u_skel.JsonTKN.RELATIONSHIPS_DELETED.value, 1, "Relationships deleted by the last reset"),
+    ("duration_seconds", u_skel.JsonTKN.ROUND_TRIP_MSEC.value, 0.001, "Duration of the last reset")
+]
+
+
+def escape(
+    value: str
+) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def sample(
+    name: str,
+    labels: Dict[str, str],
+    value: float
+) -> str:
+    label_text: str = ",".join(f'{key}="{escape(str(label))}"' for key, label in labels.items())
+    return f"{name}{{{label_text}}} {value}"
+
+
+class MetricsText:
+
+    def __init__(
+        self,
+        prefix: str,
+        labels: Dict[str, str]
+    ) -> None:
+        self.prefix: str = prefix
+        self.labels: Dict[str, str] = labels
+        self.lines: List[str] = []
+
+    def gauge(
+        self,
+        metric: str,
+        help_text: str,
+        value: float,
+        labels: Optional[Dict[str, str]] = None
+    ) -> None:
+        name: str = f"{self.prefix}_{metric}"
+        if labels is None or not any(line.startswith(f"# TYPE {name} ") for line in self.lines):
+            self.lines.append(f"# HELP {name} {help_text}")
+            self.lines.append(f"# TYPE {name} gauge")
+        self.lines.append(sample(name, self.labels | (labels or {}), value))
+
+    def gauges(
+        self,
+        gauges: List[Tuple[str, str, float, str]],
+        payload: Dict[str, Any]
+    ) -> None:
+        for metric, key, scale, help_text in gauges:
+            self.gauge(metric, help_text, (payload.get(key) or 0) * scale)
+
+    def histogram(
+        self,
+        metric: str,
+        help_text: str,
+        summary: u_stats.EntitySummary
+    ) -> None:
+        name: str = f"{self.prefix}_{metric}"
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} histogram")
+        for le in LATENCY_BUCKETS:
+            self.lines.append(sample(f"{name}_bucket", self.labels | {"le": f"{le:g}"}, summary.latency().cumulative(le * 1000)))
+        self.lines.append(sample(f"{name}_bucket", self.labels | {"le": "+Inf"}, summary.latency().count))
+        self.lines.append(sample(f"{name}_sum", self.labels, summary.latency().sum_usec / 1_000_000))
+        self.lines.append(sample(f"{name}_count", self.labels, summary.latency().count))
+
+    #
+    #   write:
+    #       replaces metrics_file atomically, the temporary file is removed when the write fails
+    #
+    def write(
+        self,
+        metrics_file: str
+    ) -> None:
+        fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(metrics_file)), prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write("\n".join(self.lines) + "\n")
+            os.chmod(tmp_file, 0o644)
+            os.replace(tmp_file, metrics_file)
+        except OSError:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+
+#
+#   validate_metrics_file:
+#       metrics_file ends in .prom and its directory is writable
+#
+#   returns:
+#       result -> True if metrics_file is not set or valid
+#       payload -> empty
+#       diagnostics -> error on an invalid metrics_file
+#
+def validate_metrics_file(
+    module_params: Dict[str, Any]
+) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+    metrics_file: Optional[str] = module_params.get(u_skel.JsonTKN.METRICS_FILE.value)
+    if not metrics_file:
+        return (True, {}, {})
+    if not metrics_file.endswith(".prom"):
+        return (False, {}, {u_skel.JsonTKN.ERROR_MSG.value: f"metrics_file must end in .prom, got {metrics_file}"})
+    metrics_dir: str = os.path.dirname(os.path.abspath(metrics_file))
+    if not os.path.isdir(metrics_dir) or not os.access(metrics_dir, os.W_OK):
+        return (False, {}, {u_skel.JsonTKN.ERROR_MSG.value: f"metrics_file directory is not writable: {metrics_dir}"})
+    return (True, {}, {})
+
+#
+#   bulk_metrics:
+#       writes the metrics of a bulk run (vertex_bulk, edge_bulk, graph_load) when metrics_file is set
+#
+def bulk_metrics(
+    module_params: Dict[str, Any],
+    summary: u_stats.EntitySummary,
+    result: bool
+) -> None:
+    metrics_file: Optional[str] = module_params.get(u_skel.JsonTKN.METRICS_FILE.value)
+    if not metrics_file:
+        return
+    entity_files: List[str] = [
+        str(module_params[key]) for key in (u_skel.JsonTKN.VERTEX_FILE.value, u_skel.JsonTKN.EDGE_FILE.value)
+        if module_params.get(key)
+        ]
+    metrics: MetricsText = MetricsText(BULK_PREFIX, {
+        "file": ",".join(entity_files),
+        u_skel.JsonTKN.DATABASE.value: str(module_params.get(u_skel.JsonTKN.DATABASE.value))
+        })
+    metrics.gauge("success", "1 if the last run succeeded", int(result))
+    metrics.gauge("last_run_timestamp_seconds", "End of the last run (unix time)", time.time())
+    metrics.gauges(BULK_GAUGES, summary.as_payload())
+    for (kind, name), rows in sorted(summary.entity_rows().items()):
+        metrics.gauge("entity_rows", "Rows of the last run per label or type", rows, {kind: name})
+    metrics.histogram("batch_latency_seconds", "Latency of the committed batches of the last run", summary)
+    metrics.write(metrics_file)
+
+#
+#   reset_metrics:
+#       writes the metrics of graph_reset when metrics_file is set, stats is None when the reset failed
+#
+def reset_metrics(
+    module_params: Dict[str, Any],
+    stats: Optional[Dict[str, Any]]
+) -> None:
+    metrics_file: Optional[str] = module_params.get(u_skel.JsonTKN.METRICS_FILE.value)
+    if not metrics_file:
+        return
+    metrics: MetricsText = MetricsText(RESET_PREFIX, {
+        u_skel.JsonTKN.DATABASE.value: str(module_params.get(u_skel.JsonTKN.DATABASE.value))
+        })
+    metrics.gauge("success", "1 if the last reset succeeded", int(stats is not None))
+    metrics.gauge("last_run_timestamp_seconds", "End of the last reset (unix time)", time.time())
+    metrics.gauges(RESET_GAUGES, stats or {})
+    metrics.write(metrics_file)
@@ -0,0 +1,166 @@
+"""
+    Filename: ./module_utils/profiler.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        Opt-in cProfile and tracemalloc run of a module execution
+"""
+from typing import Dict, Any, List, Optional, Tuple
+from types import FrameType, ModuleType
+from datetime import datetime
+import os
+import sys
+import threading
+
+from . import skeleton as u_skel
+from . import memory as u_mem
+
+#
+#   Notes:
+#   - profiling is off unless profile_dir (module option) or NEO4J_PROFILE_DIR (environment) is set,
+#     the module option takes precedence
+#   - the module then runs under cProfile and tracemalloc, at the end of the module two files are written to profile_dir
+#       <module>-<timestamp>-<pid>.prof -> cProfile stats (pstats, snakeviz)
+#       <module>-<timestamp>-<pid>.alloc.txt -> peak traced memory and the top ALLOCATION_LINES allocations by line
+#   - both paths are registered as artifacts before the module runs, they are part of the module result
+#   - run_on_controller profiles the pipeline in the controller process (type casting, query build, batching)
+#   - cProfile only sees the thread that enables it, threads started while profiling (graph_load vertex_writer)
+#     get a profiler of their own via threading.setprofile, their stats are merged into the .prof file at the end
+#       python 3.12+ allows one cProfile per process, it already covers all threads and the thread profiler is skipped
+#       a thread still running when the module ends contributes what it ran so far
+#   - tracemalloc slows down allocation heavy code considerably, timings of a profiled run are not representative
+#   - trace_memory (bulk modules) starts tracemalloc without cProfile, for peak_traced_mb in the bulk summary
+#   - cProfile and tracemalloc are imported when profiling starts, a module without profiling never loads them
+#
+PROFILE_ENV: str = "NEO4J_PROFILE_DIR"
+ALLOCATION_LINES: int = 25
+
+
+class Profiler:
+
+    def __init__(
+        self,
+        profile_dir: str,
+        name: str
+    ) -> None:
+        stem: str = f"{name}-{datetime.now().strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+        self.profile_file: str = os.path.join(profile_dir, f"{stem}.prof")
+        self.allocation_file: str = os.path.join(profile_dir, f"{stem}.alloc.txt")
+        import cProfile # pylint: disable=import-outside-toplevel
+        self.profile: cProfile.Profile = cProfile.Profile()
+        self.thread_profiles: List[cProfile.Profile] = []
+
+    #
+    #   profile_thread:
+    #       threading.setprofile hook, runs once in a new thread and replaces itself by a profiler for that thread
+    #
+    def profile_thread(
+        self,
+        frame: FrameType,
+        event: str,
+        arg: Any
+    ) -> None:
+        del frame, event, arg
+        import cProfile # pylint: disable=import-outside-toplevel
+        sys.setprofile(None)
+        profile: cProfile.Profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            return
+        self.thread_profiles.append(profile)
+
+    def start(
+        self
+    ) -> None:
+        import tracemalloc # pylint: disable=import-outside-toplevel
+        tracemalloc.start()
+        self.profile.enable()
+        threading.setprofile(self.profile_thread)
+
+    def stop(
+        self
+    ) -> None:
+        import pstats # pylint: disable=import-outside-toplevel
+        import tracemalloc # pylint: disable=import-outside-toplevel
+        threading.setprofile(None)
+        self.profile.disable()
+        snapshot: tracemalloc.Snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        stats: pstats.Stats = pstats.Stats(self.profile)
+        if self.thread_profiles:
+            stats.add(*self.thread_profiles)
+        stats.dump_stats(self.profile_file)
+        statistics: List[tracemalloc.Statistic] = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__)
+            ]).statistics("lineno")
+        lines: List[str] = [
+            f"current traced memory: {current / 1024:.1f} KiB",
+            f"peak traced memory: {peak / 1024:.1f} KiB",
+            f"top {ALLOCATION_LINES} allocations by line:"
+            ]
+        lines.extend(str(statistic) for statistic in statistics[:ALLOCATION_LINES])
+        with open(self.allocation_file, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+ACTIVE: List[Profiler] = []
+
+
+def stop_tracer() -> None:
+    traced: Optional[ModuleType] = u_mem.tracer()
+    if traced is not None:
+        traced.stop()
+
+#
+#   start:
+#       starts cProfile and tracemalloc when profile_dir or NEO4J_PROFILE_DIR is set
+#       registers profile_file and allocation_file as artifacts of the module result
+#       starts tracemalloc only when trace_memory is set
+#
+#   returns:
+#       result -> True if profiling is off or profile_dir is a writable directory
+#       payload -> empty
+#       diagnostics -> error when profile_dir is not a writable directory or another profiler is active
+#
+def start(
+    module_params: Dict[str, Any],
+    name: str
+) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+    ACTIVE.clear()
+    profile_dir: Optional[str] = module_params.get(u_skel.JsonTKN.PROFILE_DIR.value) or os.environ.get(PROFILE_ENV)
+    if not profile_dir:
+        if module_params.get(u_skel.JsonTKN.TRACE_MEMORY.value) and u_mem.tracer() is None:
+            import tracemalloc # pylint: disable=import-outside-toplevel
+            tracemalloc.start()
+        return (True, {}, {})
+    if not os.path.isdir(profile_dir) or not os.access(profile_dir, os.W_OK):
+        return (False, {}, {u_skel.JsonTKN.ERROR_MSG.value: f"profile_dir is not a writable directory: {profile_dir}"})
+    profiler: Profiler = Profiler(profile_dir, name)
+    try:
+        profiler.start()
+    except ValueError as e:
+        stop_tracer()
+        return (False, {}, {u_skel.JsonTKN.ERROR_MSG.value: f"profiler cannot be started: {e}"})
+    u_skel.register_artifact(u_skel.JsonTKN.PROFILE_FILE.value, profiler.profile_file)
+    u_skel.register_artifact(u_skel.JsonTKN.ALLOCATION_FILE.value, profiler.allocation_file)
+    ACTIVE.append(profiler)
+    return (True, {}, {})
+
+#
+#   finish:
+#       stops profiling and writes the profile artifacts, stops tracemalloc of trace_memory
+#
+def finish() -> None:
+    if not ACTIVE:
+        stop_tracer()
+        return
+    profiler: Profiler = ACTIVE.pop()
+
+    # profile_dir was writable at start, a profile is never the reason a module fails
+    try:
+        profiler.stop()
+    except OSError:
+        pass
@@ -8,10 +8,9 @@
         morphed into regex-based validation
 """
 from typing import Dict, Any, Tuple
+from functools import lru_cache
 from strenum import StrEnum
 
-import regex
-
 from . import skeleton as u_skel
 
 
@@ -20,10 +19,22 @@ class IdentifierPattern(StrEnum):
     NEO4J_IDENTIFIER = r"^[A-Za-z_][A-Za-z0-9_]*$"
 
 
+#
+#   compiled_pattern:
+#       regex (\p{L} support) is imported and the pattern compiled on first use only
+#
+@lru_cache(maxsize=None)
+def compiled_pattern(
+    pattern: str
+) -> Any:
+    import regex # pylint: disable=import-outside-toplevel
+    return regex.compile(pattern)
+
+
 def validate_patterns(
     pattern: IdentifierPattern,
     value: str
 ) -> Tuple[bool, Dict[str, Any]]:
-    if not regex.match(pattern.value, value):
+    if not compiled_pattern(pattern.value).match(value):
         return (False, {u_skel.JsonTKN.ERROR_MSG.value: f"value {value} must match pattern {pattern}"})
     return (True, {})
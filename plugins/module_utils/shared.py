@@ -9,7 +9,6 @@
 from typing import Dict, Any, Tuple, List, Optional
 
 import os
-import yaml
 
 from neo4j.time import DateTime, Date, Time
 
@@ -25,7 +24,8 @@ def load_yaml_file(
     if not os.path.exists(vertex_path):
         return False, None, {u_skel.JsonTKN.ERROR_MSG.value: f"YAML file not found: {vertex_path}"}
 
-    # load yaml into payload
+    # load yaml into payload - yaml is only imported by modules that read files
+    import yaml # pylint: disable=import-outside-toplevel
     try:
         with open(vertex_path, "r", encoding="utf-8") as f:
             extract = yaml.safe_load(f)
@@ -83,6 +83,7 @@ def validate_entity_from_file(
         is_required = rules.get(u_skel.YamlATTR.REQUIRED.value, False)
         default_val = rules.get(u_skel.YamlATTR.DEFAULT.value, None)
         expected_type = rules.get(u_skel.YamlATTR.TYPE.value)
+        choices = rules.get(u_skel.YamlATTR.CHOICES.value)
 
         # Required field missing
         if is_required and key not in vertex:
@@ -104,4 +105,12 @@ def validate_entity_from_file(
                     {u_skel.JsonTKN.ERROR_MSG.value: f"Field '{key}' must be a string"}
                 )
 
+        # Choices checking (only when value is present)
+        if choices and validated[key] is not None and validated[key] not in choices:
+            return (
+                False,
+                {},
+                {u_skel.JsonTKN.ERROR_MSG.value: f"Field '{key}' must be one of {choices}"}
+            )
+
     return (True, validated, {})
@@ -15,7 +15,9 @@ from strenum import StrEnum
 
 class YamlATTR(StrEnum):
     CHANGED = "changed"
+    CHOICES = "choices"
     DEFAULT = "default"
+    ELEMENTS = "elements"
     MSG = "msg"
     NO_LOG = "no_log"
     OPTION = "option"
@@ -36,12 +38,58 @@ class YamlState(StrEnum):
     PRESENT = "present"
 
 
+class YamlResultFormat(StrEnum):
+    COLUMNAR = "columnar"
+    GRAPH = "graph"
+    ROWS = "rows"
+
+
+class YamlBiDirectionalStorage(StrEnum):
+    DOUBLE = "double"
+    SINGLE = "single"
+
+
+class YamlNotificationSeverity(StrEnum):
+    INFORMATION = "INFORMATION"
+    OFF = "OFF"
+    WARNING = "WARNING"
+
+
+class YamlNotificationCategory(StrEnum):
+    DEPRECATION = "DEPRECATION"
+    GENERIC = "GENERIC"
+    HINT = "HINT"
+    PERFORMANCE = "PERFORMANCE"
+    SCHEMA = "SCHEMA"
+    SECURITY = "SECURITY"
+    TOPOLOGY = "TOPOLOGY"
+    UNRECOGNIZED = "UNRECOGNIZED"
+    UNSUPPORTED = "UNSUPPORTED"
+
+
 class JsonTKN(StrEnum):
+    ADAPTIVE_THROTTLE = "adaptive_throttle"
+    ALLOCATION_FILE = "allocation_file"
+    ANSIBLE_PLAY_HOSTS = "ansible_play_hosts"
     ARGS = "args"
+    ARTIFACTS = "artifacts"
+    AUTO_SHARD = "auto_shard"
     BASE_LABEL = "base_label"
     BATCH = "batch"
     BI_DIRECTIONAL = "bi_directional"
+    BI_DIRECTIONAL_STORAGE = "bi_directional_storage"
+    BROKER = "broker"
+    BROKER_IDLE_TIMEOUT = "broker_idle_timeout"
+    BROKER_SOCKET = "broker_socket"
+    BUILD_MSEC = "build_msec"
+    CAST_MSEC = "cast_msec"
+    CATEGORY = "category"
     CHANGED = "changed"
+    CODE = "code"
+    COLUMN = "column"
+    COLUMNS = "columns"
+    CONNECTION_ACQUISITION_TIMEOUT = "connection_acquisition_timeout"
+    CONNECTION_TIMEOUT = "connection_timeout"
     CONSTRAINTS_ADDED = "constraints_added"
     CONSTRAINTS_REMOVED = "constraints_removed"
     COUNT = "count"
@@ -49,49 +97,138 @@ class JsonTKN(StrEnum):
     CYPHER_QUERY = "cypher_query"
     CYPHER_QUERY_INLINE = "cypher_query_inline"
     CYPHER_RESPONSE = "cypher_response"
+    DATA = "data"
     DATABASE = "database"
+    DESCRIPTION = "description"
     DIAGNOSTICS = "diagnostics"
     EDGE_ANCHOR = "edge_anchor"
     EDGE_FILE = "edge_file"
+    EDGES = "edges"
+    ELAPSED_TIME_MSEC = "elapsed_time_msec"
+    ELEMENT_ID = "element_id"
     ELEMENT_TYPE = "element_type"
+    END = "end"
+    ENSURE_ENDPOINTS = "ensure_endpoints"
     ENTITY_NAME = "entity_name"
     ENTITY_NAME_FROM = "entity_name_from"
     ENTITY_NAME_TO = "entity_name_to"
     ERROR_MSG = "error_msg"
+    ERRORS = "errors"
+    EXECUTE_MSEC = "execute_msec"
+    FETCH_SIZE = "fetch_size"
+    FINGERPRINT = "fingerprint"
     FROM = "from"
+    GRAPH_PROPERTIES = "graph_properties"
+    IDX = "_idx"
+    INITIAL_LOAD = "initial_load"
+    INVENTORY_HOSTNAME = "inventory_hostname"
+    ITEMS = "items"
     JSON_KEYS = "json_keys"
+    KEEP_ALIVE = "keep_alive"
     LABEL = "label"
     LABELS = "labels"
     LABELS_ADDED = "labels_added"
     LABELS_REMOVED = "labels_removed"
+    LATENCY_MAX_MSEC = "latency_max_msec"
+    LATENCY_MSEC = "latency_msec"
+    LATENCY_P50_MSEC = "latency_p50_msec"
+    LATENCY_P90_MSEC = "latency_p90_msec"
+    LATENCY_P99_MSEC = "latency_p99_msec"
+    LEDGER = "ledger"
+    LINE = "line"
+    LIVENESS_CHECK_TIMEOUT = "liveness_check_timeout"
+    LOAD_MSEC = "load_msec"
+    MAX_CONCURRENCY = "max_concurrency"
+    MAX_CONNECTION_POOL_SIZE = "max_connection_pool_size"
+    MAX_ROWS_PER_SEC = "max_rows_per_sec"
+    MAX_TRANSACTION_RETRY_TIME = "max_transaction_retry_time"
+    MAX_TX_PER_SEC = "max_tx_per_sec"
+    MEMORY_BUDGET_MB = "memory_budget_mb"
+    MEMORY_PHASES = "memory_phases"
+    METRICS_FILE = "metrics_file"
     MODULE = "module"
     MSG = "msg"
+    NAME = "name"
     NEO4J_URI = "neo4j_uri"
+    NETWORK_MSEC = "network_msec"
+    NODE = "node"
+    NODES = "nodes"
     NODES_CREATED = "nodes_created"
     NODES_DELETED = "nodes_deleted"
+    NOTIFICATIONS_DISABLED_CATEGORIES = "notifications_disabled_categories"
+    NOTIFICATIONS_MIN_SEVERITY = "notifications_min_severity"
     OBJECT_INDEX = "object_index"
+    OFFSET = "offset"
     PARAMETERS = "parameters"
     PASSWORD = "password"
+    PATH = "path"
+    PATHS = "paths"
     PATTERN = "pattern"
+    PEAK_RSS_MB = "peak_rss_mb"
+    PEAK_TRACED_MB = "peak_traced_mb"
+    PERFORMANCE_NOTIFICATIONS = "performance_notifications"
+    PHASE = "phase"
+    POSITION = "position"
+    POST_LOAD_INDEXES = "post_load_indexes"
+    PROCESSED = "processed"
+    PROFILE_DIR = "profile_dir"
+    PROFILE_FILE = "profile_file"
     PROPERTIES = "properties"
     PROPERTIES_SET = "properties_set"
+    PROPERTIES_SKIPPED = "properties_skipped"
     PROPERTY_KEY = "property_key"
+    QUERIES = "queries"
     QUERY = "query"
+    QUERY_HASH = "query_hash"
     QUERY_TYPE = "query_type"
+    RELATIONSHIP = "relationship"
+    RELATIONSHIPS = "relationships"
     RELATIONSHIPS_CREATED = "relationships_created"
     RELATIONSHIPS_DELETED = "relationships_deleted"
     REPR = "repr"
     RESULT = "result"
+    RESULT_AVAILABLE_AFTER = "result_available_after"
+    RESULT_CONSUMED_AFTER = "result_consumed_after"
+    RESULT_FILE = "result_file"
+    RESULT_FORMAT = "result_format"
+    RETRIES = "retries"
+    ROUND_TRIP_MSEC = "round_trip_msec"
+    ROW_COUNT = "row_count"
+    ROWS = "rows"
+    ROWS_PER_SEC = "rows_per_sec"
+    RSS_MB = "rss_mb"
+    RUN_ON_CONTROLLER = "run_on_controller"
+    SERVER_ADDRESS = "server_address"
+    SERVER_MSEC = "server_msec"
+    SEVERITY = "severity"
+    SHARD_COUNT = "shard_count"
+    SHARD_INDEX = "shard_index"
     SINGLETON = "singleton"
+    SKIPPED = "skipped"
+    SLOW_LOG_FILE = "slow_log_file"
+    SLOW_LOG_REDACT = "slow_log_redact"
+    SLOW_LOG_SAMPLE = "slow_log_sample"
+    SLOW_THRESHOLD_MS = "slow_threshold_ms"
+    SLOWEST_BATCHES = "slowest_batches"
+    START = "start"
     STATE = "state"
     STATS = "stats"
+    THROTTLE_LATENCY_MSEC = "throttle_latency_msec"
+    TITLE = "title"
     TO = "to"
+    TOTAL = "total"
+    TRACE_FILE = "trace_file"
+    TRACE_MEMORY = "trace_memory"
     TYPE = "type"
+    TYPES = "types"
     UNIQUE_KEY = "unique_key"
     USERNAME = "username"
+    VALIDATE_MSEC = "validate_msec"
     VALUE = "value"
     VERTEX_ANCHOR = "vertex_anchor"
     VERTEX_FILE = "vertex_file"
+    VERTICES = "vertices"
+    WRITE_ROWS_PER_SEC = "write_rows_per_sec"
     WRITE_ACCESS = "write_access"
 
 
@@ -101,10 +238,13 @@ def state_present(
     return state.lower() == str(YamlState.PRESENT.value)
 
 
+WHITESPACE: re.Pattern[str] = re.compile(r'\s+')
+
+
 def flatten_query(
     query: str
 ) -> str:
-    return re.sub(r'\s+', ' ', query).strip()
+    return WHITESPACE.sub(' ', query).strip()
 
 
 def file_splitext(
@@ -183,6 +323,31 @@ def ansible_diagnostics(
         }
 
 
+#
+#   artifacts:
+#       files written by a module execution besides its result (profiles), keyed by artifact
+#       registered artifacts are reported under artifacts in the module result
+#
+ARTIFACTS: Dict[str, str] = {}
+
+
+def register_artifact(
+    key: str,
+    path: str
+) -> None:
+    ARTIFACTS[key] = path
+
+
+def clear_artifacts() -> None:
+    ARTIFACTS.clear()
+
+
+def ansible_artifacts() -> Dict[str, Any]:
+    if not ARTIFACTS:
+        return {}
+    return {JsonTKN.ARTIFACTS.value: dict(ARTIFACTS)}
+
+
 def ansible_fail(
     diagnostics: Dict[str, Any]
 ) -> Dict[str, Any]:
@@ -190,7 +355,7 @@ def ansible_fail(
         JsonTKN.RESULT.value: False,
         JsonTKN.CHANGED.value: False,
         JsonTKN.MSG.value: diagnostics
-        }
+        } | ansible_artifacts()
 
 
 def ansible_exit(
@@ -202,4 +367,4 @@ def ansible_exit(
         JsonTKN.RESULT.value: True,
         JsonTKN.CHANGED.value: changed,
         payload_key: payload
-        }
+        } | ansible_artifacts()
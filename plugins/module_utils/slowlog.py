@@ -0,0 +1,197 @@
+"""
+    Filename: ./module_utils/slowlog.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        Slow batch and slow query capture to a local JSONL log
+"""
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timezone
+from threading import Lock
+import json
+import socket
+
+from . import skeleton as u_skel
+from . import trace as u_trace
+
+#
+#   Notes:
+#   - slow_threshold_ms (bulk modules, query) enables the slow log, slow_log_file is required with it
+#       a batch or query whose client side latency exceeds the threshold appends one JSON record to slow_log_file
+#   - a record holds the query template (flattened), its hash (same as the trace span), the batch index and row range,
+#     latency, server time, counters and a sample of the parameters
+#       slow_log_sample bounds the rows of a batch in the record, long strings are cut at SAMPLE_VALUE_LEN
+#       values of keys in slow_log_redact (case insensitive, at any depth) are replaced by REDACTED
+#   - the log is appended record by record, concurrent writers (graph_load, fan-out) share a lock
+#   - the slow log never fails a module, a record that cannot be written is dropped
+#
+SAMPLE_ROWS: int = 5
+SAMPLE_VALUE_LEN: int = 256
+REDACTED: str = "********"
+
+
+def redact(
+    value: Any,
+    redact_keys: List[str]
+) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if str(key).lower() in redact_keys else redact(item, redact_keys)
+            for key, item in value.items()
+            }
+    if isinstance(value, (list, tuple)):
+        return [redact(item, redact_keys) for item in value]
+    if isinstance(value, str) and len(value) > SAMPLE_VALUE_LEN:
+        return value[:SAMPLE_VALUE_LEN] + "..."
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+class SlowLog:
+
+    def __init__(
+        self,
+        slow_log_file: str,
+        threshold_msec: float,
+        sample: int,
+        redact_keys: List[str],
+        database: Optional[str]
+    ) -> None:
+        self.slow_log_file: str = slow_log_file
+        self.threshold_msec: float = threshold_msec
+        self.sample: int = sample
+        self.redact_keys: List[str] = [key.lower() for key in redact_keys]
+        self.database: Optional[str] = database
+        self.records: int = 0
+        self._lock: Lock = Lock()
+
+    def slow(
+        self,
+        latency_msec: float
+    ) -> bool:
+        return latency_msec > self.threshold_msec
+
+    def append(
+        self,
+        record: Dict[str, Any]
+    ) -> None:
+        line: str = json.dumps({
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "host": socket.gethostname(),
+            u_skel.JsonTKN.DATABASE.value: self.database
+            } | record, default=str)
+        with self._lock:
+            try:
+                with open(self.slow_log_file, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            except OSError:
+                return
+            self.records += 1
+
+    #
+    #   capture_batch:
+    #       appends a bulk batch, rows are the batch parameters (list of rows), first_row its offset in the processed rows
+    #
+    def capture_batch(
+        self,
+        cypher_query: str,
+        rows: List[Dict[str, Any]],
+        idx: int,
+        first_row: int,
+        timings: Tuple[float, float],
+        counters: Dict[str, Any]
+    ) -> None:
+        latency_msec, server_msec = timings
+        self.append({
+            u_skel.JsonTKN.BATCH.value: idx,
+            u_skel.JsonTKN.ROWS.value: [first_row, first_row + len(rows) - 1],
+            u_skel.JsonTKN.LATENCY_MSEC.value: latency_msec,
+            u_skel.JsonTKN.SERVER_MSEC.value: server_msec,
+            u_skel.JsonTKN.QUERY_HASH.value: u_trace.query_hash(cypher_query),
+            u_skel.JsonTKN.CYPHER_QUERY.value: u_skel.flatten_query(cypher_query),
+            u_skel.JsonTKN.CYPHER_PARAMS.value: redact(rows[:self.sample], self.redact_keys),
+            u_skel.JsonTKN.STATS.value: counters
+            })
+
+    #
+    #   capture_query:
+    #       appends a single query when its round trip exceeds the threshold, payload is a payload_exit
+    #
+    def capture_query(
+        self,
+        payload: Dict[str, Any],
+        name: Optional[str] = None
+    ) -> None:
+        stats: Dict[str, Any] = payload.get(u_skel.JsonTKN.STATS.value) or {}
+        latency_msec: Optional[float] = stats.get(u_skel.JsonTKN.ROUND_TRIP_MSEC.value)
+        if latency_msec is None or not self.slow(latency_msec):
+            return
+        cypher_params: Any = payload.get(u_skel.JsonTKN.CYPHER_PARAMS.value) or {}
+        self.append({
+            u_skel.JsonTKN.NAME.value: name,
+            u_skel.JsonTKN.LATENCY_MSEC.value: latency_msec,
+            u_skel.JsonTKN.SERVER_MSEC.value: (
+                (stats.get(u_skel.JsonTKN.RESULT_AVAILABLE_AFTER.value) or 0) +
+                (stats.get(u_skel.JsonTKN.RESULT_CONSUMED_AFTER.value) or 0)
+                ),
+            u_skel.JsonTKN.QUERY_HASH.value: u_trace.query_hash(payload[u_skel.JsonTKN.CYPHER_QUERY.value]),
+            u_skel.JsonTKN.CYPHER_QUERY.value: u_skel.flatten_query(payload[u_skel.JsonTKN.CYPHER_QUERY.value]),
+            u_skel.JsonTKN.CYPHER_PARAMS.value: redact(
+                {key: value[:self.sample] if isinstance(value, list) else value for key, value in cypher_params.items()},
+                self.redact_keys
+                ),
+            u_skel.JsonTKN.STATS.value: stats
+            })
+
+#
+#   validate_slow_log:
+#       slow_threshold_ms > 0 requires a writable slow_log_file, slow_log_sample >= 0
+#
+#   returns:
+#       result -> True if the slow log is off or valid
+#       payload -> empty
+#       diagnostics -> error on first invalid option
+#
+def validate_slow_log(
+    module_params: Dict[str, Any]
+) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+    threshold_msec: Optional[float] = module_params.get(u_skel.JsonTKN.SLOW_THRESHOLD_MS.value)
+    slow_log_file: Optional[str] = module_params.get(u_skel.JsonTKN.SLOW_LOG_FILE.value)
+    if threshold_msec is None:
+        if slow_log_file:
+            return (False, {}, {u_skel.JsonTKN.ERROR_MSG.value: "'slow_log_file' requires 'slow_threshold_ms'"})
+        return (True, {}, {})
+    if threshold_msec <= 0:
+        return (False, {}, {u_skel.JsonTKN.ERROR_MSG.value: f"'slow_threshold_ms' must be > 0, got {threshold_msec}"})
+    if not slow_log_file:
+        return (False, {}, {u_skel.JsonTKN.ERROR_MSG.value: "'slow_threshold_ms' requires 'slow_log_file'"})
+    sample: Optional[int] = module_params.get(u_skel.JsonTKN.SLOW_LOG_SAMPLE.value)
+    if sample is not None and sample < 0:
+        return (False, {}, {u_skel.JsonTKN.ERROR_MSG.value: f"'slow_log_sample' must be >= 0, got {sample}"})
+    try:
+        with open(slow_log_file, "a", encoding="utf-8"):
+            pass
+    except OSError as e:
+        return (False, {}, {u_skel.JsonTKN.ERROR_MSG.value: f"slow_log_file is not writable: {e}"})
+    return (True, {}, {})
+
+#
+#   slow_log:
+#       SlowLog of the (validated) module params, None when slow_threshold_ms is not set
+#
+def slow_log(
+    module_params: Dict[str, Any]
+) -> Optional[SlowLog]:
+    threshold_msec: Optional[float] = module_params.get(u_skel.JsonTKN.SLOW_THRESHOLD_MS.value)
+    if threshold_msec is None:
+        return None
+    sample: Optional[int] = module_params.get(u_skel.JsonTKN.SLOW_LOG_SAMPLE.value)
+    return SlowLog(
+        slow_log_file=module_params[u_skel.JsonTKN.SLOW_LOG_FILE.value],
+        threshold_msec=threshold_msec,
+        sample=SAMPLE_ROWS if sample is None else sample,
+        redact_keys=module_params.get(u_skel.JsonTKN.SLOW_LOG_REDACT.value) or [],
+        database=module_params.get(u_skel.JsonTKN.DATABASE.value)
+        )
@@ -6,16 +6,116 @@
     Description: 
         NEO4J stats functions for bulk
 """
-from dataclasses import dataclass, asdict, field
-from typing import Dict, Any
+from dataclasses import dataclass, fields, field
+from typing import Dict, Any, List, Optional, Tuple
 from time import perf_counter
-from neo4j import ResultSummary
+from neo4j import ResultSummary, __version__ as neo4j_version
 
 from . import skeleton as u_skel
+from . import histogram as u_hist
+from . import memory as u_mem
 
-def cypher_stats(
+#
+#   Notes:
+#   - EntitySummary breaks the elapsed time of a bulk run down per phase (msec)
+#       load_msec -> reading and parsing the YAML-file
+#       validate_msec -> completeness and NEO4J constraint checks per entity
+#       cast_msec -> typecasting of dynamic properties
+#       build_msec -> primitive cypher per entity and UNWIND batches
+#       execute_msec -> client side batch time, session.run until the result is consumed (throttle wait excluded)
+#       server_msec -> result_available_after + result_consumed_after reported by NEO4J per batch
+#       network_msec -> execute_msec - server_msec, round trips and driver overhead
+#   - rows_per_sec is processed over elapsed time, write_rows_per_sec is processed over execute_msec
+#   - every committed batch is recorded in a latency histogram (see histogram.py)
+#       latency_p50/p90/p99/max_msec and slowest_batches (batch index, row range, latency) are set by as_payload
+#   - memory_phases holds the memory high-water marks at the end of load, prepare, build and execute (see memory.py)
+#       peak_rss_mb and peak_traced_mb are the peaks of the run, peak_traced_mb requires tracemalloc
+#
+PHASE_TIMERS: List[str] = [
+    u_skel.JsonTKN.LOAD_MSEC.value,
+    u_skel.JsonTKN.VALIDATE_MSEC.value,
+    u_skel.JsonTKN.CAST_MSEC.value,
+    u_skel.JsonTKN.BUILD_MSEC.value,
+    u_skel.JsonTKN.EXECUTE_MSEC.value,
+    u_skel.JsonTKN.SERVER_MSEC.value
+]
+
+GQL_STATUS_MAJOR_VERSION: int = 6
+
+#
+#   gql_notification:
+#       GqlStatusObject of a notification in the layout of a raw server notification
+#       a GQL status has no title, code is the GQLSTATUS code (e.g. 03N90 for a cartesian product)
+#       GqlStatusObject is not imported, importing it warns on drivers before 6 (preview feature)
+#
+def gql_notification(
+    status: Any
+) -> Dict[str, Any]:
+    return {
+        u_skel.JsonTKN.CODE.value: status.gql_status,
+        u_skel.JsonTKN.TITLE.value: None,
+        u_skel.JsonTKN.DESCRIPTION.value: status.status_description,
+        u_skel.JsonTKN.SEVERITY.value: status.raw_severity,
+        u_skel.JsonTKN.CATEGORY.value: status.raw_classification,
+        u_skel.JsonTKN.POSITION.value: {
+            u_skel.JsonTKN.LINE.value: status.position.line,
+            u_skel.JsonTKN.COLUMN.value: status.position.column,
+            u_skel.JsonTKN.OFFSET.value: status.position.offset
+            } if status.position is not None else None
+        }
+
+#
+#   raw_notifications:
+#       notifications of a result summary as raw server notifications (dicts)
+#       neo4j >= 6 deprecates notifications and summary_notifications -> gql_status_objects
+#       older drivers (gql_status_objects is a preview feature before 6) and BrokerSummary -> raw notifications
+#
+def raw_notifications(
     result_summary: ResultSummary
+) -> List[Dict[str, Any]]:
+    if int(neo4j_version.split(".", maxsplit=1)[0]) >= GQL_STATUS_MAJOR_VERSION and isinstance(result_summary, ResultSummary):
+        return [gql_notification(status) for status in result_summary.gql_status_objects if status.is_notification]
+    return list(result_summary.notifications or [])
+
+#
+#   notification_stats:
+#       PERFORMANCE notifications of a ResultSummary (e.g. cartesian product, unbounded variable length pattern)
+#       notifications_min_severity/notifications_disabled_categories filter them on the server
+#
+def notification_stats(
+    result_summary: ResultSummary
+) -> List[Dict[str, Any]]:
+    notifications: List[Dict[str, Any]] = []
+    for notification in raw_notifications(result_summary):
+        if notification.get(u_skel.JsonTKN.CATEGORY.value) != u_skel.YamlNotificationCategory.PERFORMANCE.value:
+            continue
+        position: Optional[Dict[str, Any]] = notification.get(u_skel.JsonTKN.POSITION.value)
+        notifications.append({
+            u_skel.JsonTKN.CODE.value: notification.get(u_skel.JsonTKN.CODE.value),
+            u_skel.JsonTKN.TITLE.value: notification.get(u_skel.JsonTKN.TITLE.value),
+            u_skel.JsonTKN.DESCRIPTION.value: notification.get(u_skel.JsonTKN.DESCRIPTION.value),
+            u_skel.JsonTKN.SEVERITY.value: notification.get(u_skel.JsonTKN.SEVERITY.value),
+            u_skel.JsonTKN.CATEGORY.value: notification.get(u_skel.JsonTKN.CATEGORY.value),
+            u_skel.JsonTKN.POSITION.value: {
+                u_skel.JsonTKN.LINE.value: position.get(u_skel.JsonTKN.LINE.value),
+                u_skel.JsonTKN.COLUMN.value: position.get(u_skel.JsonTKN.COLUMN.value),
+                u_skel.JsonTKN.OFFSET.value: position.get(u_skel.JsonTKN.OFFSET.value)
+                } if position else None
+            })
+    return notifications
+
+#
+#   cypher_stats:
+#       update counters, server timing (msec) and origin of a single query
+#       round_trip_msec is the client side time from session to consumed result, it includes connection acquisition
+#
+def cypher_stats(
+    result_summary: ResultSummary,
+    round_trip_msec: Optional[float] = None
 ) -> Dict[str, Any]:
+    server_address: Optional[str] = None
+    if result_summary.server is not None and result_summary.server.address is not None:
+        server_address = f"{result_summary.server.address.host}:{result_summary.server.address.port}"
     return {
         u_skel.JsonTKN.NODES_CREATED.value: result_summary.counters.nodes_created,
         u_skel.JsonTKN.NODES_DELETED.value: result_summary.counters.nodes_deleted,
@@ -27,6 +127,12 @@ def cypher_stats(
         u_skel.JsonTKN.PROPERTIES_SET.value: result_summary.counters.properties_set,
         u_skel.JsonTKN.CONSTRAINTS_ADDED.value: result_summary.counters.constraints_added,
         u_skel.JsonTKN.CONSTRAINTS_REMOVED.value: result_summary.counters.constraints_removed,
+        u_skel.JsonTKN.RESULT_AVAILABLE_AFTER.value: result_summary.result_available_after,
+        u_skel.JsonTKN.RESULT_CONSUMED_AFTER.value: result_summary.result_consumed_after,
+        u_skel.JsonTKN.ROUND_TRIP_MSEC.value: round_trip_msec,
+        u_skel.JsonTKN.SERVER_ADDRESS.value: server_address,
+        u_skel.JsonTKN.DATABASE.value: result_summary.database,
+        u_skel.JsonTKN.PERFORMANCE_NOTIFICATIONS.value: notification_stats(result_summary)
         }
 
 
@@ -42,10 +148,43 @@ class EntitySummary:
     labels_added: int = 0
     labels_removed: int = 0
     properties_set: int = 0
+    properties_skipped: int = 0
     errors: int = 0
+    skipped: int = 0
+    duplicates: int = 0
+    index_build_msec: float = 0
+    load_msec: float = 0
+    validate_msec: float = 0
+    cast_msec: float = 0
+    build_msec: float = 0
+    execute_msec: float = 0
+    server_msec: float = 0
+    network_msec: float = 0
+    rows_per_sec: float = 0
+    write_rows_per_sec: float = 0
+    latency_p50_msec: float = 0
+    latency_p90_msec: float = 0
+    latency_p99_msec: float = 0
+    latency_max_msec: float = 0
+    slowest_batches: List[Dict[str, Any]] = field(default_factory=list)
+    shard_index: Optional[int] = None
+    shard_count: Optional[int] = None
+    retries: int = 0
+    throttle_rows_per_sec: Optional[float] = None
+    throttle_min_rows_per_sec: Optional[float] = None
+    throttle_tx_per_sec: Optional[float] = None
+    throttle_adjustments: int = 0
+    throttle_wait_msec: float = 0
+    memory_budget_mb: Optional[float] = None
+    peak_rss_mb: float = 0
+    peak_traced_mb: Optional[float] = None
+    memory_phases: Dict[str, Dict[str, Any]] = field(default_factory=dict)
 
-    # internal private field for timing
+    # internal private fields for timing and batch latency
     _start_time: float = field(init=False, repr=False)
+    _latency: u_hist.LatencyHistogram = field(default_factory=u_hist.LatencyHistogram, init=False, repr=False)
+    _slowest: u_hist.SlowestBatches = field(default_factory=u_hist.SlowestBatches, init=False, repr=False)
+    _entities: Dict[Tuple[str, str], int] = field(default_factory=dict, init=False, repr=False)
 
     def __post_init__(
         self
@@ -57,9 +196,128 @@ class EntitySummary:
     ) -> None:
         self.elapsed_time_msec = (perf_counter() - self._start_time) * 1000
 
+    #
+    #   record_batch:
+    #       records the latency of committed batch idx, first_row is its offset in the processed rows
+    #
+    def record_batch(
+        self,
+        idx: int,
+        first_row: int,
+        rows: int,
+        latency_msec: float
+    ) -> None:
+        self._latency.record(latency_msec)
+        self._slowest.record(latency_msec, idx, first_row, rows)
+
+    #
+    #   record_entity:
+    #       counts a prepared entity per (label, name) or (type, name) for the metrics export
+    #
+    def record_entity(
+        self,
+        kind: str,
+        name: str
+    ) -> None:
+        self._entities[(kind, name)] = self._entities.get((kind, name), 0) + 1
+
+    def entity_rows(
+        self
+    ) -> Dict[Tuple[str, str], int]:
+        return dict(self._entities)
+
+    def latency(
+        self
+    ) -> u_hist.LatencyHistogram:
+        return self._latency
+
+    #
+    #   merge_latency:
+    #       adds the batch latencies and entity counts of other, slowest batches stay per summary
+    #
+    def merge_latency(
+        self,
+        other: "EntitySummary"
+    ) -> None:
+        self._latency.merge(other._latency) # pylint: disable=protected-access
+        for key, rows in other.entity_rows().items():
+            self._entities[key] = self._entities.get(key, 0) + rows
+
+    #
+    #   merge_memory:
+    #       highest high-water mark per phase of this summary and other
+    #
+    def merge_memory(
+        self,
+        other: "EntitySummary"
+    ) -> None:
+        for phase, marks in other.memory_phases.items():
+            merged: Dict[str, Any] = self.memory_phases.setdefault(phase, dict(marks))
+            for key, value in marks.items():
+                if value is not None and (merged.get(key) is None or value > merged[key]):
+                    merged[key] = value
+
+    #
+    #   memory_budget:
+    #       checks current RSS against memory_budget_mb
+    #
+    #   returns:
+    #       result -> True if no budget is set or RSS is within budget
+    #       payload -> empty
+    #       diagnostics -> budget, RSS, phase and the memory high-water marks so far
+    #
+    def memory_budget(
+        self,
+        phase: str
+    ) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+        if self.memory_budget_mb is None:
+            return (True, {}, {})
+        rss_mb: float = u_mem.rss_mb()
+        if rss_mb <= self.memory_budget_mb:
+            return (True, {}, {})
+        return (False, {}, {
+            u_skel.JsonTKN.ERROR_MSG.value:
+                f"memory budget of {self.memory_budget_mb} MiB exceeded in phase {phase}: RSS is {rss_mb:.1f} MiB",
+            u_skel.JsonTKN.PHASE.value: phase,
+            u_skel.JsonTKN.RSS_MB.value: round(rss_mb, 1),
+            u_skel.JsonTKN.MEMORY_BUDGET_MB.value: self.memory_budget_mb,
+            u_skel.JsonTKN.MEMORY_PHASES.value: self.memory_phases,
+            u_skel.JsonTKN.PROCESSED.value: self.processed
+            })
+
+    #
+    #   memory_mark:
+    #       records the memory high-water marks at the end of phase and checks the budget
+    #
+    def memory_mark(
+        self,
+        phase: str
+    ) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+        self.memory_phases[phase] = u_mem.phase_marks()
+        return self.memory_budget(phase)
+
+    #
+    #   as_payload:
+    #       stops the timer and derives network_msec (client side execute time minus server time),
+    #       the row rates over the elapsed time and over the execute phase and the latency percentiles
+    #
     def as_payload(
         self
     ) -> Dict[str, Any]:
         self.elapsed_time_msec = (perf_counter() - self._start_time) * 1000
-        payload: Dict[str, Any] = {key: value for key, value in asdict(self).items() if not key.startswith("_")}
+        self.network_msec = max(self.execute_msec - self.server_msec, 0)
+        self.rows_per_sec = self.processed * 1000 / self.elapsed_time_msec if self.elapsed_time_msec > 0 else 0
+        self.write_rows_per_sec = self.processed * 1000 / self.execute_msec if self.execute_msec > 0 else 0
+        for key, value in self._latency.as_payload().items():
+            setattr(self, key, value)
+        self.slowest_batches = self._slowest.as_payload()
+        self.peak_rss_mb = round(u_mem.peak_rss_mb(), 1)
+        traced_peaks: List[float] = [
+            marks[u_skel.JsonTKN.PEAK_TRACED_MB.value] for marks in self.memory_phases.values()
+            if marks.get(u_skel.JsonTKN.PEAK_TRACED_MB.value) is not None
+            ]
+        self.peak_traced_mb = max(traced_peaks) if traced_peaks else None
+        payload: Dict[str, Any] = {
+            entry.name: getattr(self, entry.name) for entry in fields(self) if not entry.name.startswith("_")
+            }
         return payload
@@ -0,0 +1,195 @@
+"""
+    Filename: ./module_utils/throttle.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        Write rate limiting and adaptive backpressure for bulk batches
+"""
+from typing import Optional, Callable
+from time import perf_counter, sleep
+from threading import Lock
+
+from neo4j.exceptions import Neo4jError, TransientError
+
+#
+#   Notes:
+#   - TokenBucket refills at rate tokens/sec up to one second of burst
+#       acquire() may run into debt (batch larger than the bucket), the caller sleeps until the debt is repaid
+#   - max_rows_per_sec limits rows (entities) per second, max_tx_per_sec limits batches (transactions) per second
+#   - adaptive throttle (AIMD) controls the rows/sec limit from batch latency and transient errors
+#       breach (latency > threshold or TransientError) -> rate is halved, starting from the observed rate
+#       recovery (latency <= threshold) -> rate grows by ADAPTIVE_STEP of the ceiling
+#       observed rate is the throughput of the last successful batch, a failing batch says nothing about throughput
+#       ceiling is max_rows_per_sec, or the observed rate at the first breach when no limit is set
+#       rate never drops below ADAPTIVE_FLOOR of the ceiling (and ADAPTIVE_MIN_ROWS_PER_SEC)
+#       reaching the ceiling without max_rows_per_sec removes the limit again
+#   - TransientError (deadlock, lock timeout, memory pressure) is retried ADAPTIVE_RETRIES times in adaptive mode
+#       a failed batch is rolled back by NEO4J, bulk queries are MERGE based and safe to repeat
+#   - Throttle is thread-safe, concurrent writers (graph_load) share one budget
+#
+ADAPTIVE_DECREASE: float = 0.5
+ADAPTIVE_STEP: float = 0.1
+ADAPTIVE_FLOOR: float = 0.05
+ADAPTIVE_MIN_ROWS_PER_SEC: float = 1.0
+ADAPTIVE_RETRIES: int = 5
+ADAPTIVE_LATENCY_MSEC: float = 1000.0
+TRANSIENT_ERROR_PREFIX: str = "Neo.TransientError"
+
+
+def transient_error(
+    e: Neo4jError
+) -> bool:
+    if isinstance(e, TransientError):
+        return True
+    return (e.code or "").startswith(TRANSIENT_ERROR_PREFIX)
+
+
+class TokenBucket:
+
+    def __init__(
+        self,
+        rate: float,
+        clock: Callable[[], float] = perf_counter
+    ) -> None:
+        self.rate: float = rate
+        self.tokens: float = rate
+        self._clock: Callable[[], float] = clock
+        self._stamp: float = clock()
+
+    def set_rate(
+        self,
+        rate: float
+    ) -> None:
+        self.refill()
+        self.rate = rate
+        self.tokens = min(self.tokens, rate)
+
+    def refill(
+        self
+    ) -> None:
+        now: float = self._clock()
+        self.tokens = min(self.rate, self.tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    #
+    #   acquire:
+    #       takes n tokens from the bucket
+    #
+    #   returns:
+    #       seconds to wait before the tokens are available
+    #
+    def acquire(
+        self,
+        n: float
+    ) -> float:
+        self.refill()
+        self.tokens -= n
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class Throttle: # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+        self,
+        max_rows_per_sec: Optional[float] = None,
+        max_tx_per_sec: Optional[float] = None,
+        adaptive: bool = False,
+        latency_threshold_msec: float = ADAPTIVE_LATENCY_MSEC,
+        wait: Callable[[float], None] = sleep,
+        clock: Callable[[], float] = perf_counter
+    ) -> None:
+        self.adaptive: bool = adaptive
+        self.latency_threshold: float = latency_threshold_msec / 1000
+        self.max_rows_per_sec: Optional[float] = max_rows_per_sec
+        self.ceiling: Optional[float] = max_rows_per_sec
+        self.rows: Optional[TokenBucket] = TokenBucket(max_rows_per_sec, clock) if max_rows_per_sec else None
+        self.tx: Optional[TokenBucket] = TokenBucket(max_tx_per_sec, clock) if max_tx_per_sec else None
+        self.wait_time: float = 0.0
+        self.adjustments: int = 0
+        self.min_rows_per_sec: Optional[float] = max_rows_per_sec
+        self.observed: Optional[float] = None
+        self._lock: Lock = Lock()
+        self._wait: Callable[[float], None] = wait
+        self._clock: Callable[[], float] = clock
+
+    @property
+    def rows_per_sec(
+        self
+    ) -> Optional[float]:
+        return self.rows.rate if self.rows is not None else None
+
+    #
+    #   before_batch:
+    #       blocks until row and transaction budget allow the next batch
+    #
+    def before_batch(
+        self,
+        rows: int
+    ) -> None:
+        with self._lock:
+            delay: float = 0.0
+            if self.rows is not None:
+                delay = max(delay, self.rows.acquire(rows))
+            if self.tx is not None:
+                delay = max(delay, self.tx.acquire(1))
+            if delay > 0:
+                self.wait_time += delay
+                self._wait(delay)
+
+    #
+    #   after_batch:
+    #       adaptive mode only - adjusts the rows/sec limit from latency and outcome of the batch
+    #
+    def after_batch(
+        self,
+        rows: int,
+        latency: float,
+        failed: bool = False
+    ) -> None:
+        if not self.adaptive:
+            return
+        with self._lock:
+            self._adapt(rows, latency, failed)
+
+    def _adapt(
+        self,
+        rows: int,
+        latency: float,
+        failed: bool
+    ) -> None:
+        if not failed and latency > 0:
+            self.observed = rows / latency
+        if failed or latency > self.latency_threshold:
+            observed: float = self.observed or ADAPTIVE_MIN_ROWS_PER_SEC
+            current: float = self.rows.rate if self.rows is not None else observed
+            if self.ceiling is None:
+                self.ceiling = observed
+            floor: float = max(ADAPTIVE_MIN_ROWS_PER_SEC, self.ceiling * ADAPTIVE_FLOOR)
+            self._set_rows_per_sec(max(floor, min(current, observed) * ADAPTIVE_DECREASE))
+            return
+        if self.rows is None or self.ceiling is None:
+            return
+        rate: float = self.rows.rate + self.ceiling * ADAPTIVE_STEP
+        if rate < self.ceiling:
+            self._set_rows_per_sec(rate)
+        elif self.max_rows_per_sec is None:
+            self.adjustments += 1
+            self.rows = None
+            self.ceiling = None
+        elif self.rows.rate < self.ceiling:
+            self._set_rows_per_sec(self.ceiling)
+
+    def _set_rows_per_sec(
+        self,
+        rate: float
+    ) -> None:
+        self.adjustments += 1
+        if self.rows is None:
+            self.rows = TokenBucket(rate, self._clock)
+        else:
+            self.rows.set_rate(rate)
+        if self.min_rows_per_sec is None or rate < self.min_rows_per_sec:
+            self.min_rows_per_sec = rate
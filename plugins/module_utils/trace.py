@@ -0,0 +1,376 @@
+"""
+    Filename: ./module_utils/trace.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        Opt-in trace spans of a module execution, exported as OTLP JSON to a local file
+"""
+from typing import Dict, Any, List, Optional, Tuple, Callable, Iterator, TypeVar, ContextManager, cast
+from contextlib import contextmanager
+from functools import wraps, lru_cache
+from hashlib import blake2b
+from threading import local
+from urllib.parse import urlparse
+import json
+import os
+import re
+import socket
+import time
+
+from . import skeleton as u_skel
+from . import profiler as u_profiler
+
+#
+#   Notes:
+#   - tracing is off unless trace_file is set, spans are then collected in memory during the module execution
+#       the root span covers the module (or action plugin), child spans cover driver creation, the session,
+#       every pipeline stage and every batch (query template hash, rows, counters, retries)
+#   - at the end of the module one ExportTraceServiceRequest (OTLP/JSON encoding) is appended to trace_file
+#       one JSON document per line (OTLP file exporter format), many tasks may append to the same file
+#   - the trace id is taken from TRACEPARENT (W3C trace context) in the environment of the module,
+#       a playbook that sets TRACEPARENT via environment groups all tasks in one trace, otherwise every task is a trace
+#   - spans of other threads (graph_load vertex writer) are children of the root span
+#   - the session of the NEO4J driver acquires its connection on the first query, acquisition time is part of
+#     the first batch span
+#   - when tracing is off, span() yields a shared no-op span - no allocation per batch
+#   - start() and finish() also start and finish the profiler (profile_dir), both bracket every module execution
+#
+SCOPE_NAME: str = "platform42.neo4j"
+SERVICE_NAME: str = "platform42.neo4j"
+SPAN_KIND_INTERNAL: int = 1
+SPAN_KIND_CLIENT: int = 3
+STATUS_UNSET: int = 0
+STATUS_OK: int = 1
+STATUS_ERROR: int = 2
+TRACEPARENT: str = "TRACEPARENT"
+TRACEPARENT_PATTERN: re.Pattern[str] = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+SPAN_DRIVER: str = "neo4j.driver"
+SPAN_SESSION: str = "neo4j.session"
+SPAN_BATCH: str = "neo4j.batch"
+SPAN_SCHEMA: str = "neo4j.schema"
+SPAN_LOAD: str = "pipeline.load"
+SPAN_PREPARE: str = "pipeline.prepare"
+SPAN_BUILD: str = "pipeline.build"
+SPAN_EXECUTE: str = "pipeline.execute"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def otlp_value(
+    value: Any
+) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+#
+#   query_hash:
+#       short hash of the flattened query template, batches of one template share the hash (cached)
+#
+@lru_cache(maxsize=64)
+def query_hash(
+    cypher_query: str
+) -> str:
+    return blake2b(u_skel.flatten_query(cypher_query).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def query_attributes(
+    cypher_query: str
+) -> Dict[str, Any]:
+    return {"db.system": "neo4j", "db.query.hash": query_hash(cypher_query)}
+
+
+def batch_attributes(
+    current: "Span",
+    idx: int,
+    rows: int,
+    retries: int
+) -> None:
+    current.set("neo4j.batch.index", idx)
+    current.set("neo4j.batch.rows", rows)
+    current.set("neo4j.batch.retries", retries)
+
+
+class Span: # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str],
+        kind: int,
+        attributes: Optional[Dict[str, Any]] = None
+    ) -> None:
+        self.name: str = name
+        self.trace_id: str = trace_id
+        self.span_id: str = os.urandom(8).hex()
+        self.parent_id: Optional[str] = parent_id
+        self.kind: int = kind
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.status: int = STATUS_UNSET
+        self.message: str = ""
+        self.start_ns: int = time.time_ns()
+        self.end_ns: int = 0
+
+    def set(
+        self,
+        key: str,
+        value: Any
+    ) -> None:
+        if value is not None:
+            self.attributes[key] = value
+
+    def fail(
+        self,
+        message: str
+    ) -> None:
+        self.status = STATUS_ERROR
+        self.message = message
+
+    def end(
+        self
+    ) -> None:
+        if self.status == STATUS_UNSET:
+            self.status = STATUS_OK
+        self.end_ns = time.time_ns()
+
+    def as_otlp(
+        self
+    ) -> Dict[str, Any]:
+        otlp: Dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": [{"key": key, "value": otlp_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": self.status, "message": self.message} if self.message else {"code": self.status}
+            }
+        if self.parent_id:
+            otlp["parentSpanId"] = self.parent_id
+        return otlp
+
+
+class NoopSpan(Span):
+
+    def __init__(
+        self
+    ) -> None:
+        super().__init__("", "", None, SPAN_KIND_INTERNAL)
+
+    def set(
+        self,
+        key: str,
+        value: Any
+    ) -> None:
+        return
+
+    def fail(
+        self,
+        message: str
+    ) -> None:
+        return
+
+
+NOOP_SPAN: NoopSpan = NoopSpan()
+
+
+class Tracer:
+
+    active: Optional["Tracer"] = None
+
+    def __init__(
+        self,
+        trace_file: str,
+        name: str,
+        attributes: Dict[str, Any]
+    ) -> None:
+        self.trace_file: str = trace_file
+        trace_id, parent_id = traceparent()
+        self.root: Span = Span(name, trace_id, parent_id, SPAN_KIND_INTERNAL, attributes)
+        self.spans: List[Span] = [self.root]
+        self._local: local = local()
+
+    def stack(
+        self
+    ) -> List[Span]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = [self.root]
+        return cast(List[Span], self._local.stack)
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]],
+        kind: int
+    ) -> Iterator[Span]:
+        stack: List[Span] = self.stack()
+        current: Span = Span(name, self.root.trace_id, stack[-1].span_id, kind, attributes)
+        self.spans.append(current)
+        stack.append(current)
+        try:
+            yield current
+        except Exception as e:
+            current.fail(f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            stack.pop()
+            current.end()
+
+    def export(
+        self
+    ) -> Dict[str, Any]:
+        resource: Dict[str, Any] = {
+            "service.name": SERVICE_NAME,
+            "host.name": socket.gethostname(),
+            "process.pid": os.getpid()
+            }
+        return {"resourceSpans": [{
+            "resource": {"attributes": [{"key": key, "value": otlp_value(value)} for key, value in resource.items()]},
+            "scopeSpans": [{
+                "scope": {"name": SCOPE_NAME},
+                "spans": [span.as_otlp() for span in self.spans]
+                }]
+            }]}
+
+#
+#   traceparent:
+#       trace id and parent span id from TRACEPARENT in the environment
+#
+#   returns:
+#       (trace_id, parent_span_id) or a new trace id without parent
+#
+def traceparent() -> Tuple[str, Optional[str]]:
+    match: Optional[re.Match[str]] = TRACEPARENT_PATTERN.match(os.environ.get(TRACEPARENT, "").strip().lower())
+    if match is None or set(match.group(1)) == {"0"}:
+        return (os.urandom(16).hex(), None)
+    return (match.group(1), match.group(2))
+
+#
+#   start:
+#       starts the profiler, and the root span of a module execution when trace_file is set
+#
+#   returns:
+#       result -> True if tracing is off or trace_file is writable, profiler started
+#       payload -> empty
+#       diagnostics -> error when trace_file cannot be opened or profile_dir is invalid
+#
+def start(
+    module_params: Dict[str, Any],
+    name: str
+) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+    Tracer.active = None
+    u_skel.clear_artifacts()
+    profile_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_profiler.start(module_params, name)
+    if not profile_result[0]:
+        return profile_result
+    trace_file: Optional[str] = module_params.get(u_skel.JsonTKN.TRACE_FILE.value)
+    if not trace_file:
+        return (True, {}, {})
+    try:
+        with open(trace_file, "a", encoding="utf-8"):
+            pass
+    except OSError as e:
+        return (False, {}, {u_skel.JsonTKN.ERROR_MSG.value: f"trace_file is not writable: {e}"})
+    neo4j_uri: str = module_params.get(u_skel.JsonTKN.NEO4J_URI.value) or ""
+    Tracer.active = Tracer(trace_file, name, {
+        "ansible.module": name,
+        "db.system": "neo4j",
+        "db.namespace": module_params.get(u_skel.JsonTKN.DATABASE.value),
+        "server.address": urlparse(neo4j_uri).hostname or neo4j_uri
+        })
+    return (True, {}, {})
+
+#
+#   finish:
+#       writes the profile, ends the root span and appends the trace to trace_file, no-op when both are off
+#
+def finish(
+    result: bool
+) -> None:
+    u_profiler.finish()
+    tracer: Optional[Tracer] = Tracer.active
+    if tracer is None:
+        return
+    Tracer.active = None
+    if not result:
+        tracer.root.fail("module failed")
+    tracer.root.end()
+
+    # trace_file was writable at start, a trace is never the reason a module fails
+    try:
+        with open(tracer.trace_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(tracer.export(), separators=(",", ":"), default=str) + "\n")
+    except OSError:
+        pass
+
+
+@contextmanager
+def span(
+    name: str,
+    attributes: Optional[Dict[str, Any]] = None,
+    kind: int = SPAN_KIND_INTERNAL
+) -> Iterator[Span]:
+    tracer: Optional[Tracer] = Tracer.active
+    if tracer is None:
+        yield NOOP_SPAN
+        return
+    with tracer.span(name, attributes, kind) as current:
+        yield current
+
+#
+#   session_span:
+#       span of a session that runs one query (single-entity modules, fan-out)
+#
+def session_span(
+    cypher_query: str
+) -> ContextManager[Span]:
+    return span(SPAN_SESSION, query_attributes(cypher_query), SPAN_KIND_CLIENT)
+
+#
+#   stage:
+#       decorator, runs a pipeline function in a span
+#       a 3-tuple (result, payload, diagnostics) with result False marks the span as failed
+#
+def stage(
+    name: str
+) -> Callable[[F], F]:
+    def decorator(function: F) -> F:
+        @wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name, {"code.function": function.__name__}) as current:
+                outcome: Any = function(*args, **kwargs)
+                if isinstance(outcome, tuple) and len(outcome) == 3 and outcome[0] is False:
+                    current.fail(str(outcome[2].get(u_skel.JsonTKN.ERROR_MSG.value, "failed")))
+                return outcome
+        return cast(F, wrapper)
+    return decorator
+
+#
+#   traced:
+#       decorator for main() of a module, finishes the trace when the module exits (exit_json/fail_json)
+#
+def traced(
+    main: Callable[[], None]
+) -> Callable[[], None]:
+    @wraps(main)
+    def wrapper() -> None:
+        try:
+            main()
+        except SystemExit as e:
+            finish(e.code in (None, 0))
+            raise
+        except BaseException:
+            finish(False)
+            raise
+        finish(True)
+    return wrapper
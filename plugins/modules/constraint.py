@@ -11,10 +11,12 @@
 
 # pylint: disable=import-error
 from typing import Dict, Any, Tuple, List
+from time import perf_counter
 from ansible.module_utils.basic import AnsibleModule
 
 import ansible_collections.platform42.neo4j.plugins.module_utils.argument_spec as u_args
 import ansible_collections.platform42.neo4j.plugins.module_utils.skeleton as u_skel
+import ansible_collections.platform42.neo4j.plugins.module_utils.trace as u_trace
 import ansible_collections.platform42.neo4j.plugins.module_utils.cypher as u_cypher
 import ansible_collections.platform42.neo4j.plugins.module_utils.shared as u_shared
 import ansible_collections.platform42.neo4j.plugins.module_utils.driver as u_driver
@@ -83,11 +85,16 @@ def constraint_module(
     return constraint_result
 
 
+@u_trace.traced
 def main() -> None:
     module: AnsibleModule = AnsibleModule(
         argument_spec=u_args.argument_spec_neo4j() | u_args.argument_spec_constraint(),
         supports_check_mode=True
         )
+    trace_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_trace.start(module.params, u_skel.file_splitext(__file__))
+    result, _, diagnostics = trace_result
+    if not result:
+        module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
     input_list: List[str] = [
         u_skel.JsonTKN.LABEL.value,
         u_skel.JsonTKN.PROPERTY_KEY.value
@@ -99,6 +106,10 @@ def main() -> None:
         supports_casting=False
         )
     result, _, diagnostics = validate_result
+    if not result:
+        module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
+    driver_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_driver.validate_driver_config(module.params)
+    result, _, diagnostics = driver_result
     if not result:
         module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
     driver: Driver = u_driver.get_driver(module.params)
@@ -108,11 +119,13 @@ def main() -> None:
         )
     cypher_query, cypher_params, cypher_query_inline = constraint_result
     payload: Dict[str, Any]
+    start: float = perf_counter()
     try:
-        with driver.session(database=module.params[u_skel.JsonTKN.DATABASE.value]) as session:
+        with u_trace.session_span(cypher_query), driver.session(database=module.params[u_skel.JsonTKN.DATABASE.value]) as session:
             response: Result = session.run(cypher_query, cypher_params)
             cypher_response: List[Dict[str, Any]] = [record.data() for record in list(response)]
             result_summary: ResultSummary = response.consume()
+        round_trip_msec: float = (perf_counter() - start) * 1000
     except Neo4jError as e:
         payload = u_skel.payload_fail(cypher_query, cypher_params, cypher_query_inline, e)
         module.fail_json(**u_skel.ansible_fail(diagnostics=payload))
@@ -126,7 +139,7 @@ def main() -> None:
         cypher_params,
         cypher_query_inline,
         u_shared.serialize_neo4j(cypher_response),
-        u_stats.cypher_stats(result_summary)
+        u_stats.cypher_stats(result_summary, round_trip_msec)
         )
     counters: SummaryCounters = result_summary.counters
     changed: bool = (counters.constraints_added > 0 or counters.constraints_removed > 0)
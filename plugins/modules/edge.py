@@ -11,15 +11,18 @@
 
 # pylint: disable=import-error
 from typing import Dict, Any, Tuple, List
+from time import perf_counter
 from ansible.module_utils.basic import AnsibleModule
 
 import ansible_collections.platform42.neo4j.plugins.module_utils.argument_spec as u_args
 import ansible_collections.platform42.neo4j.plugins.module_utils.skeleton as u_skel
+import ansible_collections.platform42.neo4j.plugins.module_utils.trace as u_trace
 import ansible_collections.platform42.neo4j.plugins.module_utils.cypher as u_cypher
 import ansible_collections.platform42.neo4j.plugins.module_utils.shared as u_shared
 import ansible_collections.platform42.neo4j.plugins.module_utils.driver as u_driver
 import ansible_collections.platform42.neo4j.plugins.module_utils.input as u_input
 import ansible_collections.platform42.neo4j.plugins.module_utils.stats as u_stats
+import ansible_collections.platform42.neo4j.plugins.module_utils.bulk as u_bulk
 
 from neo4j import Driver, ResultSummary, Result, SummaryCounters
 from neo4j.exceptions import Neo4jError
@@ -43,6 +46,10 @@ notes:
   - edge-type follows uppercase naming style.
   - check_mode will validate all input parameters and returns version of Neo4j as proof that connection is established.
   - properties must be specified as a value/type pair, since Ansible turns everything into a string
+  - items replaces loop over this module, all items are sent as UNWIND batches in one module execution.
+    every item is merged over the top-level edge parameters, results are returned per item.
+  - bi_directional_storage single stores a bi_directional edge as one relationship in canonical direction
+    (lower label/entity_name first), half the writes and storage of double; queries must match undirected
 '''
 
 EXAMPLES = r'''
@@ -82,11 +89,26 @@ EXAMPLES = r'''
     to:
       label: "Product"
       entity_name: "widget-123"
+
+# Create many edges in one module execution instead of loop
+- name: "Create PURCHASED edges"
+  platform42.neo4j.edge:
+    neo4j_uri: "neo4j://127.0.0.1:7687"
+    database: "neo4j"
+    username: "neo4j"
+    password: "*****"
+    type: PURCHASED
+    state: PRESENT
+    items:
+      - from: {label: "Customer", entity_name: "bob"}
+        to: {label: "Product", entity_name: "widget-123"}
+      - from: {label: "Customer", entity_name: "carol"}
+        to: {label: "Product", entity_name: "widget-123"}
 '''
 
 def edge_module(
     check_mode: bool,
-    module_params: u_skel.ModuleParamsEdge,
+    module_params: Dict[str, Any],
     properties: Dict[str, Any]
 ) -> Tuple[str, Dict[str, Any], str]:
     state: str = module_params[u_skel.JsonTKN.STATE.value]
@@ -106,11 +128,41 @@ def edge_module(
     return edge_result
 
 
+def edge_items_module(
+    module: AnsibleModule
+) -> None:
+    items_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_bulk.edge_items(
+        module.params,
+        module.check_mode
+        )
+    result, payload, diagnostics = items_result
+    if not result:
+        module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
+    module.exit_json(**u_skel.ansible_exit(
+        changed=u_bulk.edge_changed(payload[u_skel.JsonTKN.STATS.value]),
+        payload_key=u_skel.file_splitext(__file__),
+        payload=payload)
+        )
+
+
+@u_trace.traced
 def main() -> None:
     module: AnsibleModule = AnsibleModule(
-        argument_spec=u_args.argument_spec_neo4j() | u_args.argument_spec_edge(),
+        argument_spec=(
+            u_args.argument_spec_neo4j() |
+            u_args.argument_spec_items_entity(u_args.argument_spec_edge()) |
+            u_args.argument_spec_items()
+            ),
+        required_one_of=u_args.required_unless_items(u_args.argument_spec_edge()),
         supports_check_mode=True
         )
+    trace_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_trace.start(module.params, u_skel.file_splitext(__file__))
+    result, _, diagnostics = trace_result
+    if not result:
+        module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
+    if module.params[u_skel.JsonTKN.ITEMS.value] is not None:
+        edge_items_module(module)
+        return
     input_list: List[str] = [
         u_skel.JsonTKN.TYPE.value,
         u_skel.JsonTKN.FROM.value,
@@ -125,6 +177,10 @@ def main() -> None:
         supports_casting=True
         )
     result, casted_properties, diagnostics = input_result
+    if not result:
+        module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
+    driver_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_driver.validate_driver_config(module.params)
+    result, _, diagnostics = driver_result
     if not result:
         module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
     driver: Driver = u_driver.get_driver(module.params)
@@ -135,11 +191,13 @@ def main() -> None:
         )
     cypher_query, cypher_params, cypher_query_inline = edge_result
     payload: Dict[str, Any]
+    start: float = perf_counter()
     try:
-        with driver.session(database=module.params[u_skel.JsonTKN.DATABASE.value]) as session:
+        with u_trace.session_span(cypher_query), driver.session(database=module.params[u_skel.JsonTKN.DATABASE.value]) as session:
             response: Result = session.run(cypher_query, cypher_params)
             cypher_response: List[Dict[str, Any]] = [record.data() for record in list(response)]
             result_summary: ResultSummary = response.consume()
+        round_trip_msec: float = (perf_counter() - start) * 1000
     except Neo4jError as e:
         payload = u_skel.payload_fail(cypher_query, cypher_params, cypher_query_inline, e)
         module.fail_json(**u_skel.ansible_fail(diagnostics=payload))
@@ -153,7 +211,7 @@ def main() -> None:
         cypher_params,
         cypher_query_inline,
         u_shared.serialize_neo4j(cypher_response),
-        u_stats.cypher_stats(result_summary)
+        u_stats.cypher_stats(result_summary, round_trip_msec)
         )
     counters: SummaryCounters = result_summary.counters
     changed: bool = (counters.relationships_created > 0 or counters.relationships_deleted > 0)
@@ -10,19 +10,13 @@
 """
 
 # pylint: disable=import-error
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Tuple
 from ansible.module_utils.basic import AnsibleModule
 
 import ansible_collections.platform42.neo4j.plugins.module_utils.argument_spec as u_args
 import ansible_collections.platform42.neo4j.plugins.module_utils.skeleton as u_skel
-import ansible_collections.platform42.neo4j.plugins.module_utils.cypher as u_cypher
-import ansible_collections.platform42.neo4j.plugins.module_utils.shared as u_shared
-import ansible_collections.platform42.neo4j.plugins.module_utils.driver as u_driver
-import ansible_collections.platform42.neo4j.plugins.module_utils.input as u_input
-import ansible_collections.platform42.neo4j.plugins.module_utils.stats as u_stats
-
-from neo4j import Driver, ResultSummary, Result
-from neo4j.exceptions import Neo4jError
+import ansible_collections.platform42.neo4j.plugins.module_utils.trace as u_trace
+import ansible_collections.platform42.neo4j.plugins.module_utils.bulk as u_bulk
 
 DOCUMENTATION = r'''
 ---
@@ -34,16 +28,40 @@ author:
 description:
   - This module creates a relationship (edge) between two existing vertices (nodes) in a Neo4j graph database.
   - It uses the official Neo4j Python driver and supports Aura (neo4j+s://) and self-hosted instances.
-  - Both source and target nodes must already exist in the graph; the module will fail if either node cannot be found.
+  - Both source and target nodes must already exist in the graph, unless ensure_endpoints is set.
   - Relationship direction is always from C(source) → C(target).
 notes:
   - The module uses a Cypher MERGE statement to ensure the relationship is created once between existing vertices.
   - For idempotent behavior, ensure source and target vertices are uniquely identifiable.
-  - Relationship creation will fail if source or target nodes are missing.
+  - Relationship creation will fail if source or target nodes are missing, unless ensure_endpoints is set.
   - edge-type follows uppercase naming style.
   - check_mode will validate all input parameters and returns version of Neo4j as proof that connection is established.
   - properties must be specified as a value/type pair, since Ansible turns everything into a string
   - bulk interface expects all relationship attributes in a YAML inputfile
+  - run_on_controller executes the bulk pipeline in the controller process (action plugin),
+    edge_file is read on the controller and no module is transferred to the target host
+  - shard_index/shard_count load one hash partition of the edge_file (key is the from-vertex),
+    no two shards write the same relationship; auto_shard derives both from ansible_play_hosts
+  - max_rows_per_sec/max_tx_per_sec pace the batches (token bucket), adaptive_throttle halves the rate
+    when batch latency exceeds throttle_latency_msec or NEO4J reports a TransientError and restores it on recovery
+  - fingerprint stores a hash of the casted properties in _fingerprint on every relationship,
+    re-runs only SET properties whose hash differs; skipped writes are reported as properties_skipped
+  - ensure_endpoints MERGEs missing source and target vertices by label and entity_name in the same batch,
+    a single edge YAML-file builds the graph in one pass; created vertices are reported as nodes_created;
+    ensure_endpoints is rejected together with shard_count > 1 (or auto_shard over several hosts),
+    shards share target vertices and concurrent MERGEs of one vertex create duplicates
+  - bi_directional_storage single (per edge) stores a bi_directional edge as one relationship in canonical direction
+    (lower label/entity_name first), half the writes and storage of double; queries must match undirected
+  - ledger is an append-only mode for edges with a unique_key (e.g. TRANSACTION): a relationship property index
+    on (type, unique_key) is created and awaited, new relationships are CREATEd after an index seek instead of
+    a MERGE over all relationships between both vertices; duplicates in the edge_file are reported as duplicates;
+    with fingerprint the created relationships store _fingerprint, existing ledger edges are left untouched
+  - slow_threshold_ms appends every batch slower than the threshold to slow_log_file (JSON lines) with the query template,
+    batch index, row range, timings, counters and the first slow_log_sample rows; values of slow_log_redact keys are masked
+  - memory_phases reports the memory high-water marks (peak RSS, peak traced Python memory with trace_memory) per phase,
+    memory_budget_mb fails the task before the next batch when the RSS of the module exceeds the budget
+  - metrics_file writes the run as Prometheus textfile-collector gauges (neo4j_bulk_*) labelled by file and database,
+    rows per type and a batch latency histogram; the file is replaced atomically and not written in check_mode
 '''
 
 EXAMPLES = r'''
@@ -64,6 +82,7 @@ EXAMPLES = r'''
 #     label: Station
 #   type: Track
 #   bi_directional: True
+#   bi_directional_storage: single
 #
 - name: "create edges via input YAML"
   platform42.neo4j.edge_bulk:
@@ -73,124 +92,87 @@ EXAMPLES = r'''
     password: "*****"
     edge_file: "./vars/edges/u1_tracks.yml"
     edge_anchor: "u1_tracks"
-'''
 
-def edge_module(
-    check_mode: bool,
-    module_params: Dict[str, Any],
-    properties: Dict[str, Any]
-) -> Tuple[str, Dict[str, Any], str]:
-    state: str = module_params[u_skel.JsonTKN.STATE.value]
-    edge_result: Tuple[str, Dict[str, Any], str]
-    if u_skel.state_present(state):
-        edge_result = u_cypher.edge_add(
-            check_mode=check_mode,
-            is_bulk=True,
-            module_params=module_params,
-            properties=properties
-        )
-        return edge_result
-    edge_result = u_cypher.edge_del(
-        check_mode=check_mode,
-        module_params=module_params
-    )
-    return edge_result
+- name: "create edges via input YAML, read and executed on the controller"
+  platform42.neo4j.edge_bulk:
+    neo4j_uri: "neo4j://127.0.0.1:7687"
+    database: "neo4j"
+    username: "neo4j"
+    password: "*****"
+    edge_file: "./vars/edges/u1_tracks.yml"
+    edge_anchor: "u1_tracks"
+    run_on_controller: true
+
+# every host of the play loads its own partition of the edge YAML-file
+- name: "create edges sharded over the play hosts"
+  platform42.neo4j.edge_bulk:
+    neo4j_uri: "neo4j://127.0.0.1:7687"
+    database: "neo4j"
+    username: "neo4j"
+    password: "*****"
+    edge_file: "./vars/edges/u1_tracks.yml"
+    edge_anchor: "u1_tracks"
+    auto_shard: true
 
+# limit the write load on a production cluster
+- name: "create edges with adaptive write throttle"
+  platform42.neo4j.edge_bulk:
+    neo4j_uri: "neo4j://127.0.0.1:7687"
+    database: "neo4j"
+    username: "neo4j"
+    password: "*****"
+    edge_file: "./vars/edges/u1_tracks.yml"
+    edge_anchor: "u1_tracks"
+    max_rows_per_sec: 2000
+    adaptive_throttle: true
+    throttle_latency_msec: 500
 
+# build the graph from one edge-list, vertices are created on first reference
+- name: "create edges and their missing endpoints via input YAML"
+  platform42.neo4j.edge_bulk:
+    neo4j_uri: "neo4j://127.0.0.1:7687"
+    database: "neo4j"
+    username: "neo4j"
+    password: "*****"
+    edge_file: "./vars/edges/u1_tracks.yml"
+    edge_anchor: "u1_tracks"
+    ensure_endpoints: true
+
+# append-only transactions, every edge in the YAML-file has a unique_key
+- name: "append transactions via input YAML"
+  platform42.neo4j.edge_bulk:
+    neo4j_uri: "neo4j://127.0.0.1:7687"
+    database: "neo4j"
+    username: "neo4j"
+    password: "*****"
+    edge_file: "./vars/edges/transactions.yml"
+    edge_anchor: "transactions"
+    ledger: true
+'''
+
+@u_trace.traced
 def main() -> None:
     module: AnsibleModule = AnsibleModule(
         argument_spec=u_args.argument_spec_neo4j() | u_args.argument_spec_edge_bulk(),
         supports_check_mode=True
         )
+    trace_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_trace.start(module.params, u_skel.file_splitext(__file__))
+    result, _, diagnostics = trace_result
+    if not result:
+        module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
 
-    # load edges from YAML-file
-    edge_load_result: Tuple[bool, List[Dict[str, Any]], Dict[str, Any]] = u_shared.load_yaml_file(
-        module.params[u_skel.JsonTKN.EDGE_FILE.value],
-        module.params[u_skel.JsonTKN.EDGE_ANCHOR.value]
+    # load, validate, batch and execute edges from YAML-file
+    bulk_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_bulk.edge_bulk(
+        module.params,
+        module.check_mode
         )
-    result, edges, diagnostics = edge_load_result
+    result, payload, diagnostics = bulk_result
     if not result:
         module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
-
-    batch_size: int = 100
-    edge_results: List[Tuple[str, Dict[str, Any], str]] = []
-    summary = u_stats.EntitySummary(total=len(edges))
-    driver: Driver = u_driver.get_driver(module.params)
-    for _, edge in enumerate(edges):
-
-        # check YAML-edge for completeness
-        edge_from_file_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_shared.validate_entity_from_file(
-            edge,
-            u_args.argument_spec_edge()
-            )
-        result, validated_edge, diagnostics = edge_from_file_result
-        if not result:
-            module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
-
-        # validate YAML against NEO4J constraints, typecast dynamic properties
-        input_list: List[str] = [
-            u_skel.JsonTKN.TYPE.value,
-            u_skel.JsonTKN.FROM.value,
-            u_skel.JsonTKN.TO.value,
-            u_skel.JsonTKN.PROPERTIES.value,
-            u_skel.JsonTKN.UNIQUE_KEY.value
-            ]
-        validate_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_input.validate_inputs(
-            cypher_input_list=input_list,
-            module_params=validated_edge,
-            supports_unique_key=False,
-            supports_casting=True
-            )
-        result, casted_properties, diagnostics = validate_result
-        if not result:
-            module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
-
-        # generate cypher query for edge operation (create/delete)
-        edge_result: Tuple[str, Dict[str, Any], str] = edge_module(
-            module.check_mode,
-            validated_edge,
-            casted_properties
-            )
-
-        # save cypher_query, cypher_params in edge_results
-        edge_results.append(edge_result)
-
-    # bundle edges in groups of batch_size - convert query to bulk paradigm
-    edge_bulk: List[Tuple[str, Dict[str, Any]]] = u_cypher.edge_bulk_add(
-        edge_results,
-        batch_size
-    )
-    try:
-        # execute cypher query
-        with driver.session(database=module.params[u_skel.JsonTKN.DATABASE.value]) as session:
-
-            # iterate over bulk-queries
-            for edge_bulk_query, edge_bulk_params in edge_bulk:
-                try:
-                    response: Result = session.run(edge_bulk_query, edge_bulk_params)
-                    result_summary: ResultSummary = response.consume()
-                    summary.processed += len(edge_bulk_params[u_skel.JsonTKN.BATCH.value])
-                    summary.relationships_created += result_summary.counters.relationships_created
-                    summary.relationships_deleted += result_summary.counters.relationships_deleted
-                    summary.properties_set += result_summary.counters.properties_set
-                except Neo4jError as e:
-                    payload = u_skel.payload_fail(
-                        cypher_query=edge_bulk_query,
-                        cypher_params=edge_bulk_params[u_skel.JsonTKN.BATCH.value],
-                        e=e,
-                        idx=summary.processed
-                        )
-                    module.fail_json(**u_skel.ansible_fail(diagnostics=payload))
-                except Exception as e: # pylint: disable=broad-exception-caught
-                    payload = u_skel.payload_abend(e)
-                    module.fail_json(**u_skel.ansible_fail(diagnostics=payload))
-    finally:
-        driver.close()
-    changed: bool = (summary.relationships_created > 0 or summary.relationships_deleted > 0)
     module.exit_json(**u_skel.ansible_exit(
-        changed=changed,
+        changed=u_bulk.edge_changed(payload),
         payload_key=u_skel.file_splitext(__file__),
-        payload=summary.as_payload()
+        payload=payload
         )
     )
 
@@ -0,0 +1,92 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+    Filename: ./modules/graph_load.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        Ansible module to load vertices and edges in one pipeline
+"""
+
+# pylint: disable=import-error
+from typing import Dict, Any, Tuple
+from ansible.module_utils.basic import AnsibleModule
+
+import ansible_collections.platform42.neo4j.plugins.module_utils.argument_spec as u_args
+import ansible_collections.platform42.neo4j.plugins.module_utils.skeleton as u_skel
+import ansible_collections.platform42.neo4j.plugins.module_utils.trace as u_trace
+import ansible_collections.platform42.neo4j.plugins.module_utils.loader as u_loader
+
+DOCUMENTATION = r'''
+---
+module: graph_load
+short_description: Create vertices (nodes) and edges (relationships) in Neo4j via one combined bulk load
+version_added: "4.3.0"
+author:
+  - Diederick de Buck (diederick.de.buck@platform-42.com)
+description:
+  - This module loads a vertex YAML-file and an edge YAML-file in one pipeline on one NEO4J driver.
+  - It uses the official Neo4j Python driver and supports Aura (neo4j+s://) and self-hosted databases.
+  - Vertices are written in the background while the edge YAML-file is loaded and validated.
+  - Edge batches start as soon as the labels of their endpoints are committed.
+notes:
+  - vertex_file and edge_file have the same layout as for vertex_bulk and edge_bulk.
+  - vertex labels are written in order of first appearance in vertex_file, edges follow label by label.
+  - the first failure stops both writers, batches that are already committed stay committed.
+  - check_mode will validate all input parameters and returns version of Neo4j as proof that connection is established.
+  - result is one combined summary, per phase summaries are reported under vertices and edges
+  - run_on_controller executes the pipeline in the controller process (action plugin),
+    vertex_file and edge_file are read on the controller and no module is transferred to the target host
+  - max_rows_per_sec/max_tx_per_sec/adaptive_throttle apply to vertices and edges together
+  - fingerprint stores a hash of the casted properties in _fingerprint, re-runs only SET properties whose hash differs
+  - slow_threshold_ms appends every batch slower than the threshold to slow_log_file (JSON lines) with the query template,
+    batch index, row range, timings, counters and the first slow_log_sample rows; values of slow_log_redact keys are masked
+  - memory_phases reports the memory high-water marks (peak RSS, peak traced Python memory with trace_memory) per phase,
+    memory_budget_mb fails the task before the next batch when the RSS of the module exceeds the budget
+  - metrics_file writes the run as Prometheus textfile-collector gauges (neo4j_bulk_*) labelled by file and database,
+    rows per label/type and a batch latency histogram; the file is replaced atomically and not written in check_mode
+'''
+
+EXAMPLES = r'''
+- name: "load U1 stations and tracks"
+  platform42.neo4j.graph_load:
+    neo4j_uri: "neo4j://127.0.0.1:7687"
+    database: "neo4j"
+    username: "neo4j"
+    password: "*****"
+    vertex_file: "./vars/vertices/u1_stations.yml"
+    vertex_anchor: "u1_stations"
+    edge_file: "./vars/edges/u1_tracks.yml"
+    edge_anchor: "u1_tracks"
+'''
+
+@u_trace.traced
+def main() -> None:
+    module: AnsibleModule = AnsibleModule(
+        argument_spec=u_args.argument_spec_neo4j() | u_args.argument_spec_graph_load(),
+        supports_check_mode=True
+        )
+    trace_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_trace.start(module.params, u_skel.file_splitext(__file__))
+    result, _, diagnostics = trace_result
+    if not result:
+        module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
+
+    # load, validate, batch and execute vertices and edges from YAML-files
+    load_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_loader.graph_load(
+        module.params,
+        module.check_mode
+        )
+    result, payload, diagnostics = load_result
+    if not result:
+        module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
+    module.exit_json(**u_skel.ansible_exit(
+        changed=u_loader.graph_changed(payload),
+        payload_key=u_skel.file_splitext(__file__),
+        payload=payload
+        )
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -11,14 +11,17 @@
 
 # pylint: disable=import-error
 from typing import Dict, Any, List, Tuple
+from time import perf_counter
 from ansible.module_utils.basic import AnsibleModule
 
 import ansible_collections.platform42.neo4j.plugins.module_utils.argument_spec as u_args
 import ansible_collections.platform42.neo4j.plugins.module_utils.skeleton as u_skel
+import ansible_collections.platform42.neo4j.plugins.module_utils.trace as u_trace
 import ansible_collections.platform42.neo4j.plugins.module_utils.cypher as u_cypher
 import ansible_collections.platform42.neo4j.plugins.module_utils.shared as u_shared
 import ansible_collections.platform42.neo4j.plugins.module_utils.driver as u_driver
 import ansible_collections.platform42.neo4j.plugins.module_utils.stats as u_stats
+import ansible_collections.platform42.neo4j.plugins.module_utils.metrics as u_metrics
 
 from neo4j import Driver, ResultSummary, Result
 from neo4j.exceptions import Neo4jError
@@ -36,6 +39,8 @@ description:
   - The module expects parameters defined in the collection’s common argument specification utilities.
   - check_mode will validate all input parameters and returns version of Neo4j as proof that connection is established.
   - properties must be specified as a value/type pair, since Ansible turns everything into a string
+  - metrics_file writes success, nodes/relationships deleted and duration of the reset as Prometheus textfile-collector
+    gauges (neo4j_graph_reset_*), the file is replaced atomically and not written in check_mode
   '''
 
 EXAMPLES = r'''
@@ -58,25 +63,44 @@ EXAMPLES = r'''
 '''
 
 
+@u_trace.traced
 def main() -> None:
     module: AnsibleModule = AnsibleModule(
         argument_spec=u_args.argument_spec_neo4j() | u_args.argument_spec_graph_reset(),
         supports_check_mode=True
         )
+    trace_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_trace.start(module.params, u_skel.file_splitext(__file__))
+    result, _, diagnostics = trace_result
+    if not result:
+        module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
+    driver_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_driver.validate_driver_config(module.params)
+    result, _, diagnostics = driver_result
+    if not result:
+        module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
+    metrics_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_metrics.validate_metrics_file(module.params)
+    result, _, diagnostics = metrics_result
+    if not result:
+        module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
     driver: Driver = u_driver.get_driver(module.params)
     graph_reset_result: Tuple[str, Dict[str, Any], str] = u_cypher.graph_reset(module.check_mode)
     cypher_query, cypher_params, cypher_query_inline = graph_reset_result
     payload: Dict[str, Any]
+    start: float = perf_counter()
     try:
-        with driver.session(database=module.params[u_skel.JsonTKN.DATABASE.value]) as session:
+        with u_trace.session_span(cypher_query), driver.session(database=module.params[u_skel.JsonTKN.DATABASE.value]) as session:
             response: Result = session.run(cypher_query)
             cypher_response: List[Dict[str, Any]] = [record.data() for record in list(response)]
             result_summary: ResultSummary = response.consume()
+        round_trip_msec: float = (perf_counter() - start) * 1000
     except Neo4jError as e:
         payload = u_skel.payload_fail(cypher_query, cypher_params, cypher_query_inline, e)
+        if not module.check_mode:
+            u_metrics.reset_metrics(module.params, None)
         module.fail_json(**u_skel.ansible_fail(diagnostics=payload))
     except Exception as e: # pylint: disable=broad-exception-caught
         payload = u_skel.payload_abend(e)
+        if not module.check_mode:
+            u_metrics.reset_metrics(module.params, None)
         module.fail_json(**u_skel.ansible_fail(diagnostics=payload))
     finally:
         driver.close()
@@ -85,8 +109,10 @@ def main() -> None:
         cypher_params,
         cypher_query_inline,
         u_shared.serialize_neo4j(cypher_response),
-        u_stats.cypher_stats(result_summary)
+        u_stats.cypher_stats(result_summary, round_trip_msec)
         )
+    if not module.check_mode:
+        u_metrics.reset_metrics(module.params, payload[u_skel.JsonTKN.STATS.value])
     module.exit_json(**u_skel.ansible_exit(
         changed=True,
         payload_key=u_skel.file_splitext(__file__),
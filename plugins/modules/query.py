@@ -10,16 +10,21 @@
 """
 
 # pylint: disable=import-error
-from typing import Dict, Any, Tuple, Callable, List
+from typing import Dict, Any, Tuple, Callable, List, Set, Optional
+from time import perf_counter
 from ansible.module_utils.basic import AnsibleModule
 
 import ansible_collections.platform42.neo4j.plugins.module_utils.argument_spec as u_args
 import ansible_collections.platform42.neo4j.plugins.module_utils.skeleton as u_skel
+import ansible_collections.platform42.neo4j.plugins.module_utils.trace as u_trace
 import ansible_collections.platform42.neo4j.plugins.module_utils.cypher as u_cypher
 import ansible_collections.platform42.neo4j.plugins.module_utils.shared as u_shared
 import ansible_collections.platform42.neo4j.plugins.module_utils.driver as u_driver
 import ansible_collections.platform42.neo4j.plugins.module_utils.input as u_input
 import ansible_collections.platform42.neo4j.plugins.module_utils.stats as u_stats
+import ansible_collections.platform42.neo4j.plugins.module_utils.fanout as u_fanout
+import ansible_collections.platform42.neo4j.plugins.module_utils.columnar as u_columnar
+import ansible_collections.platform42.neo4j.plugins.module_utils.slowlog as u_slowlog
 
 from neo4j import Driver
 from neo4j.exceptions import Neo4jError
@@ -53,6 +58,15 @@ notes:
   - The module will fail if a write operation is attempted (e.g., CREATE or MERGE).
   - check_mode it turned off, since this module is not able to modify any vertex, edge or attribute.
   - properties must be specified as a value/type pair, since Ansible turns everything into a string
+  - queries runs a list of independent named read queries concurrently, results are keyed by name.
+  - queries uses a bounded pool of max_concurrency sessions from one driver and is read-only.
+  - result_format columnar returns column names, column types and one array per column instead of row dicts.
+  - result_file writes the columnar response to an Arrow IPC (.arrow, .feather, .ipc) or NumPy (.npz) file.
+  - result_file requires pyarrow or numpy on the host that executes the module.
+  - result_format graph returns deduplicated node and relationship tables, paths as index sequences and rows with references.
+  - graph_properties limits the node and relationship properties returned by result_format graph.
+  - slow_threshold_ms appends every query slower than the threshold (round trip) to slow_log_file as a JSON line.
+  - slow log records hold the query, a sample of the parameters (slow_log_sample) and stats, slow_log_redact masks values.
 '''
 
 EXAMPLES = r'''
@@ -84,14 +98,166 @@ EXAMPLES = r'''
       name: 
         value: "Alice"
         type: str
+
+# Run independent health check queries concurrently, results keyed by name
+- name: "Dashboard counters"
+  platform42.neo4j.query:
+    neo4j_uri: "neo4j://127.0.0.1:7687"
+    database: "neo4j"
+    username: "neo4j"
+    password: "*****"
+    max_concurrency: 4
+    queries:
+      - name: persons
+        query: |
+          MATCH (p:Person)
+          RETURN count(p) AS total
+      - name: stations_on_line
+        query: |
+          MATCH (s:Station)-[:TRACK {line: $line}]-()
+          RETURN count(DISTINCT s) AS total
+        parameters:
+          line:
+            value: "U2"
+            type: str
+
+# Return a wide numeric result as columns and write it to an Arrow IPC file
+- name: "Export distances"
+  platform42.neo4j.query:
+    neo4j_uri: "neo4j://127.0.0.1:7687"
+    database: "neo4j"
+    username: "neo4j"
+    password: "*****"
+    query: |
+      MATCH (a:Station)-[t:TRACK]->(b:Station)
+      RETURN a.entity_name AS from, b.entity_name AS to, t.distance AS distance
+    result_format: columnar
+    result_file: "/tmp/distances.arrow"
+
+# Return traversal paths with every station stored once
+- name: "Routes from Pankow"
+  platform42.neo4j.query:
+    neo4j_uri: "neo4j://127.0.0.1:7687"
+    database: "neo4j"
+    username: "neo4j"
+    password: "*****"
+    query: |
+      MATCH p = (:Station {entity_name: "Pankow"})-[:TRACK*1..5]->(:Station)
+      RETURN p
+    result_format: graph
+    graph_properties:
+      - entity_name
+      - line
 '''
 
 
+#
+#   query_options:
+#       starts the trace and validates the slow log options, fails the module on invalid options
+#
+#   returns:
+#       SlowLog when slow_threshold_ms is set, otherwise None
+#
+def query_options(
+    module: AnsibleModule
+) -> Optional[u_slowlog.SlowLog]:
+    trace_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_trace.start(module.params, u_skel.file_splitext(__file__))
+    result, _, diagnostics = trace_result
+    if not result:
+        module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
+    slow_log_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_slowlog.validate_slow_log(module.params)
+    result, _, diagnostics = slow_log_result
+    if not result:
+        module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
+    return u_slowlog.slow_log(module.params)
+
+
+def query_fanout_module(
+    module: AnsibleModule,
+    slow_log: Optional[u_slowlog.SlowLog]
+) -> None:
+    if module.params[u_skel.JsonTKN.WRITE_ACCESS.value]:
+        module.fail_json(**u_skel.ansible_fail(diagnostics={
+            u_skel.JsonTKN.ERROR_MSG.value: "queries only supports read access, write_access must be False"
+        }))
+    if module.params[u_skel.JsonTKN.RESULT_FILE.value]:
+        module.fail_json(**u_skel.ansible_fail(diagnostics={
+            u_skel.JsonTKN.ERROR_MSG.value: "result_file is not supported in combination with queries"
+        }))
+    input_list: List[str] = [
+        u_skel.JsonTKN.PARAMETERS.value
+        ]
+    query_results: List[Tuple[str, Tuple[str, Dict[str, Any], str]]] = []
+    query_names: Set[str] = set()
+    for entry in module.params[u_skel.JsonTKN.QUERIES.value]:
+
+        # check query entry for completeness
+        entry_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_shared.validate_entity_from_file(
+            entry,
+            u_args.argument_spec_query_entry()
+            )
+        result, validated_entry, diagnostics = entry_result
+        if not result:
+            module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
+        name: str = validated_entry[u_skel.JsonTKN.NAME.value]
+        if name in query_names:
+            module.fail_json(**u_skel.ansible_fail(diagnostics={
+                u_skel.JsonTKN.ERROR_MSG.value: f"duplicate query name '{name}'"
+            }))
+        query_names.add(name)
+
+        # validate parameter keys, typecast parameters
+        validate_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_input.validate_inputs(
+            cypher_input_list=input_list,
+            module_params=validated_entry,
+            supports_unique_key=False,
+            supports_casting=True
+            )
+        result, casted_parameters, diagnostics = validate_result
+        if not result:
+            module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
+        query_results.append((name, u_cypher.query(
+            validated_entry[u_skel.JsonTKN.QUERY.value],
+            casted_parameters
+            )))
+    driver_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_driver.validate_driver_config(module.params)
+    result, _, diagnostics = driver_result
+    if not result:
+        module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
+    driver: Driver = u_driver.get_driver(module.params)
+    try:
+        fanout_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_fanout.query_fanout(
+            driver=driver,
+            database=module.params[u_skel.JsonTKN.DATABASE.value],
+            query_results=query_results,
+            max_concurrency=module.params[u_skel.JsonTKN.MAX_CONCURRENCY.value],
+            result_format=module.params[u_skel.JsonTKN.RESULT_FORMAT.value],
+            property_keys=module.params[u_skel.JsonTKN.GRAPH_PROPERTIES.value],
+            slow_log=slow_log
+            )
+    finally:
+        driver.close()
+    result, payload, diagnostics = fanout_result
+    if not result:
+        module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
+    module.exit_json(**u_skel.ansible_exit(
+        changed=False,
+        payload_key=u_skel.file_splitext(__file__),
+        payload=payload)
+        )
+
+
+@u_trace.traced
 def main() -> None:
     module: AnsibleModule = AnsibleModule(
         argument_spec=u_args.argument_spec_neo4j() | u_args.argument_spec_query(),
+        mutually_exclusive=[(u_skel.JsonTKN.QUERY.value, u_skel.JsonTKN.QUERIES.value)],
+        required_one_of=[(u_skel.JsonTKN.QUERY.value, u_skel.JsonTKN.QUERIES.value)],
         supports_check_mode=False
         )
+    slow_log: Optional[u_slowlog.SlowLog] = query_options(module)
+    if module.params[u_skel.JsonTKN.QUERIES.value] is not None:
+        query_fanout_module(module, slow_log)
     input_list: List[str] = [
         u_skel.JsonTKN.PARAMETERS.value
         ]
@@ -102,24 +268,41 @@ def main() -> None:
         supports_casting=True
         )
     result, casted_parameters, diagnostics = validate_result
+    if not result:
+        module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
+    result_format: str = module.params[u_skel.JsonTKN.RESULT_FORMAT.value]
+    result_file: Optional[str] = module.params[u_skel.JsonTKN.RESULT_FILE.value]
+    if result_file and result_format != u_skel.YamlResultFormat.COLUMNAR.value:
+        module.fail_json(**u_skel.ansible_fail(diagnostics={
+            u_skel.JsonTKN.ERROR_MSG.value: "result_file requires result_format columnar"
+        }))
+    driver_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_driver.validate_driver_config(module.params)
+    result, _, diagnostics = driver_result
     if not result:
         module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
     driver: Driver = u_driver.get_driver(module.params)
-    query: str = module.params[u_skel.JsonTKN.QUERY.value]
     query_read_result: Tuple[str, Dict[str, Any], str] = u_cypher.query(
-        query,
+        module.params[u_skel.JsonTKN.QUERY.value],
         casted_parameters
         )
     cypher_query, cypher_params, cypher_query_inline = query_read_result
     payload: Dict[str, Any]
     write_access: bool = module.params[u_skel.JsonTKN.WRITE_ACCESS.value]
+    start: float = perf_counter()
     try:
-        with driver.session(database=module.params[u_skel.JsonTKN.DATABASE.value]) as session:
+        with u_trace.session_span(cypher_query), driver.session(database=module.params[u_skel.JsonTKN.DATABASE.value]) as session:
             executor: Callable[
-                [Callable[[Any, Any, Any], Any], str, Dict[str, Any]],
+                [Callable[[Any, Any, Any, Any, Any], Any], str, Dict[str, Any], str, Optional[List[str]]],
                 Tuple[Any, Any]
                 ] = session.execute_write if write_access else session.execute_read
-            cypher_response, result_summary = executor(u_cypher.query_tx, cypher_query, cypher_params)
+            cypher_response, result_summary = executor(
+                u_cypher.query_tx_format,
+                cypher_query,
+                cypher_params,
+                result_format,
+                module.params[u_skel.JsonTKN.GRAPH_PROPERTIES.value]
+                )
+        round_trip_msec: float = (perf_counter() - start) * 1000
     except Neo4jError as e:
         payload = u_skel.payload_fail(cypher_query, cypher_params, cypher_query_inline, e)
         module.fail_json(**u_skel.ansible_fail(diagnostics=payload))
@@ -128,13 +311,23 @@ def main() -> None:
         module.fail_json(**u_skel.ansible_fail(diagnostics=payload))
     finally:
         driver.close()
+    if result_file:
+        columnar_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_columnar.write_columnar_file(
+            result_file,
+            cypher_response
+            )
+        result, cypher_response, diagnostics = columnar_result
+        if not result:
+            module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
     payload = u_skel.payload_exit(
         cypher_query,
         cypher_params,
         repr(cypher_query_inline),
         u_shared.serialize_neo4j(cypher_response),
-        u_stats.cypher_stats(result_summary),
+        u_stats.cypher_stats(result_summary, round_trip_msec),
         )
+    if slow_log is not None:
+        slow_log.capture_query(payload)
     module.exit_json(**u_skel.ansible_exit(
         changed=write_access,
         payload_key=u_skel.file_splitext(__file__),
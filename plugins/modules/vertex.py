@@ -11,15 +11,18 @@
 
 # pylint: disable=import-error
 from typing import Dict, Any, Tuple, List
+from time import perf_counter
 from ansible.module_utils.basic import AnsibleModule
 
 import ansible_collections.platform42.neo4j.plugins.module_utils.argument_spec as u_args
 import ansible_collections.platform42.neo4j.plugins.module_utils.skeleton as u_skel
+import ansible_collections.platform42.neo4j.plugins.module_utils.trace as u_trace
 import ansible_collections.platform42.neo4j.plugins.module_utils.cypher as u_cypher
 import ansible_collections.platform42.neo4j.plugins.module_utils.shared as u_shared
 import ansible_collections.platform42.neo4j.plugins.module_utils.driver as u_driver
 import ansible_collections.platform42.neo4j.plugins.module_utils.input as u_input
 import ansible_collections.platform42.neo4j.plugins.module_utils.stats as u_stats
+import ansible_collections.platform42.neo4j.plugins.module_utils.bulk as u_bulk
 
 from neo4j import Driver, ResultSummary, Result, SummaryCounters
 from neo4j.exceptions import Neo4jError
@@ -39,6 +42,8 @@ notes:
   - vertex-label follows capitalized naming style.
   - check_mode will validate all input parameters and returns version of Neo4j as proof that connection is established.
   - properties must be specified as a value/type pair, since Ansible turns everything into a string
+  - items replaces loop over this module, all items are sent as UNWIND batches in one module execution.
+    every item is merged over the top-level vertex parameters, results are returned per item.
 '''
 
 EXAMPLES = r'''
@@ -81,6 +86,23 @@ EXAMPLES = r'''
         type: list
         value: ["S", "M", "L", "XL", "XXL"]
         element_type: str
+
+# Create many vertices in one module execution instead of loop
+- name: "Create stations"
+  platform42.neo4j.vertex:
+    neo4j_uri: "neo4j://127.0.0.1:7687"
+    database: "neo4j"
+    username: "neo4j"
+    password: "*****"
+    label: "Station"
+    state: PRESENT
+    items:
+      - entity_name: "Krumme Lanke"
+      - entity_name: "Onkel Toms Hütte"
+        properties:
+          zone:
+            value: "B"
+            type: str
 '''
 
 def vertex_module(
@@ -105,11 +127,41 @@ def vertex_module(
     return vertex_result
 
 
+def vertex_items_module(
+    module: AnsibleModule
+) -> None:
+    items_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_bulk.vertex_items(
+        module.params,
+        module.check_mode
+        )
+    result, payload, diagnostics = items_result
+    if not result:
+        module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
+    module.exit_json(**u_skel.ansible_exit(
+        changed=u_bulk.vertex_changed(payload[u_skel.JsonTKN.STATS.value]),
+        payload_key=u_skel.file_splitext(__file__),
+        payload=payload)
+        )
+
+
+@u_trace.traced
 def main() -> None:
     module: AnsibleModule = AnsibleModule(
-        argument_spec=u_args.argument_spec_neo4j() | u_args.argument_spec_vertex(),
+        argument_spec=(
+            u_args.argument_spec_neo4j() |
+            u_args.argument_spec_items_entity(u_args.argument_spec_vertex()) |
+            u_args.argument_spec_items()
+            ),
+        required_one_of=u_args.required_unless_items(u_args.argument_spec_vertex()),
         supports_check_mode=True
         )
+    trace_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_trace.start(module.params, u_skel.file_splitext(__file__))
+    result, _, diagnostics = trace_result
+    if not result:
+        module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
+    if module.params[u_skel.JsonTKN.ITEMS.value] is not None:
+        vertex_items_module(module)
+        return
     input_list: List[str] = [
         u_skel.JsonTKN.LABEL.value,
         u_skel.JsonTKN.ENTITY_NAME.value,
@@ -122,6 +174,10 @@ def main() -> None:
         supports_casting=True
         )
     result, casted_properties, diagnostics = validate_result
+    if not result:
+        module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
+    driver_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_driver.validate_driver_config(module.params)
+    result, _, diagnostics = driver_result
     if not result:
         module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
     driver: Driver = u_driver.get_driver(module.params)
@@ -132,11 +188,13 @@ def main() -> None:
         )
     cypher_query, cypher_params, cypher_query_inline = vertex_result
     payload: Dict[str, Any]
+    start: float = perf_counter()
     try:
-        with driver.session(database=module.params[u_skel.JsonTKN.DATABASE.value]) as session:
+        with u_trace.session_span(cypher_query), driver.session(database=module.params[u_skel.JsonTKN.DATABASE.value]) as session:
             response: Result = session.run(cypher_query, cypher_params)
             cypher_response: List[Dict[str, Any]] = [record.data() for record in list(response)]
             result_summary: ResultSummary = response.consume()
+        round_trip_msec: float = (perf_counter() - start) * 1000
     except Neo4jError as e:
         payload = u_skel.payload_fail(cypher_query, cypher_params, cypher_query_inline, e)
         module.fail_json(**u_skel.ansible_fail(diagnostics=payload))
@@ -150,7 +208,7 @@ def main() -> None:
         cypher_params,
         cypher_query_inline,
         u_shared.serialize_neo4j(cypher_response),
-        u_stats.cypher_stats(result_summary)
+        u_stats.cypher_stats(result_summary, round_trip_msec)
         )
     counters: SummaryCounters = result_summary.counters
     changed: bool = (counters.nodes_created > 0 or  counters.nodes_deleted > 0)
@@ -10,19 +10,13 @@
 """
 
 # pylint: disable=import-error
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Tuple
 from ansible.module_utils.basic import AnsibleModule
 
 import ansible_collections.platform42.neo4j.plugins.module_utils.argument_spec as u_args
 import ansible_collections.platform42.neo4j.plugins.module_utils.skeleton as u_skel
-import ansible_collections.platform42.neo4j.plugins.module_utils.cypher as u_cypher
-import ansible_collections.platform42.neo4j.plugins.module_utils.shared as u_shared
-import ansible_collections.platform42.neo4j.plugins.module_utils.driver as u_driver
-import ansible_collections.platform42.neo4j.plugins.module_utils.input as u_input
-import ansible_collections.platform42.neo4j.plugins.module_utils.stats as u_stats
-
-from neo4j import Driver, ResultSummary, Result
-from neo4j.exceptions import Neo4jError
+import ansible_collections.platform42.neo4j.plugins.module_utils.trace as u_trace
+import ansible_collections.platform42.neo4j.plugins.module_utils.bulk as u_bulk
 
 DOCUMENTATION = r'''
 ---
@@ -39,6 +33,23 @@ notes:
   - vertex-label follows capitalized naming style.
   - check_mode will validate all input parameters and returns version of Neo4j as proof that connection is established.
   - properties must be specified as a value/type pair, since Ansible turns everything into a string
+  - run_on_controller executes the bulk pipeline in the controller process (action plugin),
+    vertex_file is read on the controller and no module is transferred to the target host
+  - shard_index/shard_count load one hash partition of the vertex_file (key is label and entity_name),
+    no two shards write the same vertex; auto_shard derives both from ansible_play_hosts
+  - max_rows_per_sec/max_tx_per_sec pace the batches (token bucket), adaptive_throttle halves the rate
+    when batch latency exceeds throttle_latency_msec or NEO4J reports a TransientError and restores it on recovery
+  - fingerprint stores a hash of the casted properties in _fingerprint on every node,
+    re-runs only SET properties whose hash differs; skipped writes are reported as properties_skipped
+  - initial_load CREATEs all vertices (also singletons) for a first-time load; every label of the vertex_file
+    must be empty and (label, entity_name) unique in the file, both are checked before the first batch
+  - post_load_indexes (initial_load only) are created after the last batch, the task waits until they are online
+  - slow_threshold_ms appends every batch slower than the threshold to slow_log_file (JSON lines) with the query template,
+    batch index, row range, timings, counters and the first slow_log_sample rows; values of slow_log_redact keys are masked
+  - memory_phases reports the memory high-water marks (peak RSS, peak traced Python memory with trace_memory) per phase,
+    memory_budget_mb fails the task before the next batch when the RSS of the module exceeds the budget
+  - metrics_file writes the run as Prometheus textfile-collector gauges (neo4j_bulk_*) labelled by file and database,
+    rows per label and a batch latency histogram; the file is replaced atomically and not written in check_mode
 '''
 
 EXAMPLES = r'''
@@ -60,124 +71,69 @@ EXAMPLES = r'''
     password: "*****"
     vertex_file: "./vars/vertices/u1_stations.yml"
     vertex_anchor: "u1_stations"
-'''
 
-def vertex_module(
-    check_mode: bool,
-    module_params: Dict[str, Any],
-    properties: Dict[str, Any]
-) -> Tuple[str, Dict[str, Any], str]:
-    state: str = module_params[u_skel.JsonTKN.STATE.value]
-    vertex_result: Tuple[str, Dict[str, Any], str]
-    if u_skel.state_present(state):
-        vertex_result = u_cypher.vertex_add(
-            check_mode=check_mode,
-            is_bulk=True,
-            module_params=module_params,
-            properties=properties
-            )
-        return vertex_result
-    vertex_result = u_cypher.vertex_del(
-        check_mode=check_mode,
-        module_params=module_params
-        )
-    return vertex_result
+# every host of the play loads its own partition of the vertex YAML-file
+- name: "create vertices sharded over the play hosts"
+  platform42.neo4j.vertex_bulk:
+    neo4j_uri: "neo4j://127.0.0.1:7687"
+    database: "neo4j"
+    username: "neo4j"
+    password: "*****"
+    vertex_file: "./vars/vertices/u1_stations.yml"
+    vertex_anchor: "u1_stations"
+    auto_shard: true
+
+# limit the write load on a production cluster
+- name: "create vertices with adaptive write throttle"
+  platform42.neo4j.vertex_bulk:
+    neo4j_uri: "neo4j://127.0.0.1:7687"
+    database: "neo4j"
+    username: "neo4j"
+    password: "*****"
+    vertex_file: "./vars/vertices/u1_stations.yml"
+    vertex_anchor: "u1_stations"
+    max_rows_per_sec: 2000
+    adaptive_throttle: true
+    throttle_latency_msec: 500
 
+# first load into empty labels, zone index is built once after the load
+- name: "initial load of vertices via input YAML"
+  platform42.neo4j.vertex_bulk:
+    neo4j_uri: "neo4j://127.0.0.1:7687"
+    database: "neo4j"
+    username: "neo4j"
+    password: "*****"
+    vertex_file: "./vars/vertices/u1_stations.yml"
+    vertex_anchor: "u1_stations"
+    initial_load: true
+    post_load_indexes:
+      - label: Station
+        property_key: zone
+'''
 
+@u_trace.traced
 def main() -> None:
     module: AnsibleModule = AnsibleModule(
         argument_spec=u_args.argument_spec_neo4j() | u_args.argument_spec_vertex_bulk(),
         supports_check_mode=True
         )
+    trace_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_trace.start(module.params, u_skel.file_splitext(__file__))
+    result, _, diagnostics = trace_result
+    if not result:
+        module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
 
-    # load vertices from YAML-file
-    vertex_load_result: Tuple[bool, List[Dict[str, Any]], Dict[str, Any]] = u_shared.load_yaml_file(
-        module.params[u_skel.JsonTKN.VERTEX_FILE.value],
-        module.params[u_skel.JsonTKN.VERTEX_ANCHOR.value]
+    # load, validate, batch and execute vertices from YAML-file
+    bulk_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_bulk.vertex_bulk(
+        module.params,
+        module.check_mode
         )
-    result, vertices, diagnostics = vertex_load_result
+    result, payload, diagnostics = bulk_result
     if not result:
         module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
-
-    batch_size: int = 100
-    vertex_results: List[Tuple[str, Dict[str, Any], str]] = []
-    summary = u_stats.EntitySummary(total=len(vertices))
-    driver: Driver = u_driver.get_driver(module.params)
-    for _, vertex in enumerate(vertices):
-
-        # check YAML-vertex for completeness
-        vertex_from_file_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_shared.validate_entity_from_file(
-            vertex,
-            u_args.argument_spec_vertex()
-            )
-        result, validated_vertex, diagnostics = vertex_from_file_result
-        if not result:
-            module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
-
-        # validate YAML against NEO4J constraints, typecast dynamic properties
-        input_list: List[str] = [
-            u_skel.JsonTKN.LABEL.value,
-            u_skel.JsonTKN.ENTITY_NAME.value,
-            u_skel.JsonTKN.PROPERTIES.value
-            ]
-        validate_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_input.validate_inputs(
-            cypher_input_list=input_list,
-            module_params=validated_vertex,
-            supports_unique_key=False,
-            supports_casting=True
-            )
-        result, casted_properties, diagnostics = validate_result
-        if not result:
-            module.fail_json(**u_skel.ansible_fail(diagnostics=diagnostics))
-
-        # generate cypher query for vertex operation (create/delete)
-        vertex_result: Tuple[str, Dict[str, Any], str] = vertex_module(
-            module.check_mode,
-            validated_vertex,
-            casted_properties
-            )
-
-        # save cypher_query, cypher_params in vertex_results
-        vertex_results.append(vertex_result)
-
-    # bundle vertices in groups of batch_size - convert query to bulk paradigm
-    vertex_bulk: List[Tuple[str, Dict[str, Any]]] = u_cypher.vertex_bulk_add(
-        vertex_results,
-        batch_size
-    )
-    try:
-        # execute cypher query
-        with driver.session(database=module.params[u_skel.JsonTKN.DATABASE.value]) as session:
-
-            # iterate over bulk-queries
-            for vertex_bulk_query, vertex_bulk_params in vertex_bulk:
-                try:
-                    response: Result = session.run(vertex_bulk_query, vertex_bulk_params)
-                    result_summary: ResultSummary = response.consume()
-                    summary.processed += len(vertex_bulk_params[u_skel.JsonTKN.BATCH.value])
-                    summary.nodes_created += result_summary.counters.nodes_created
-                    summary.nodes_deleted += result_summary.counters.nodes_deleted
-                    summary.labels_added += result_summary.counters.labels_added
-                    summary.labels_removed += result_summary.counters.labels_removed
-                    summary.properties_set += result_summary.counters.properties_set
-                except Neo4jError as e:
-                    payload = u_skel.payload_fail(
-                        cypher_query=vertex_bulk_query,
-                        cypher_params=vertex_bulk_params[u_skel.JsonTKN.BATCH.value],
-                        e=e,
-                        idx=summary.processed
-                        )
-                    module.fail_json(**u_skel.ansible_fail(diagnostics=payload))
-                except Exception as e: # pylint: disable=broad-exception-caught
-                    payload = u_skel.payload_abend(e)
-                    module.fail_json(**u_skel.ansible_fail(diagnostics=payload))
-    finally:
-        driver.close()
-    changed: bool = (summary.nodes_created > 0 or summary.nodes_deleted > 0)
     module.exit_json(**u_skel.ansible_exit(
-        changed=changed,
+        changed=u_bulk.vertex_changed(payload),
         payload_key=u_skel.file_splitext(__file__),
-        payload=summary.as_payload()
+        payload=payload
         )
     )
 
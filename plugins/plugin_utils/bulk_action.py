@@ -0,0 +1,158 @@
+"""
+    Filename: ./plugin_utils/bulk_action.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        Controller-side execution of bulk modules
+"""
+from typing import Dict, Any, List, Tuple, Optional
+from abc import ABC, abstractmethod
+
+# pylint: disable=import-error
+from ansible.plugins.action import ActionBase
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
+from ansible.module_utils.parsing.convert_bool import boolean
+
+import ansible_collections.platform42.neo4j.plugins.module_utils.argument_spec as u_args
+import ansible_collections.platform42.neo4j.plugins.module_utils.skeleton as u_skel
+import ansible_collections.platform42.neo4j.plugins.module_utils.trace as u_trace
+
+#
+#   Notes:
+#   - run_on_controller: false (default) -> module is executed on the target host, identical to a plain module
+#   - run_on_controller: true -> bulk pipeline runs inside the controller process
+#       entity files are resolved relative to the playbook/role (path_dwim) and read locally
+#       no AnsiballZ packaging, no transfer of module or entity file to the target host
+#       NEO4J driver (python neo4j) must be installed on the controller
+#   - arguments are validated with the module argument spec, defaults are applied identically
+#   - result has the same shape as the module result
+#   - auto_shard derives shard_index/shard_count from the position of inventory_hostname in ansible_play_hosts
+#       applies to both execution modes, every play host loads its own partition of the entity file
+#       hosts that failed earlier in the play are not in ansible_play_hosts, their partition moves to the others
+#   - trace_file traces the controller-side pipeline, the trace is appended when the pipeline returns
+#   - profile_dir (NEO4J_PROFILE_DIR on the controller) profiles the controller-side pipeline, artifacts are in the result
+#   - _requires_connection keeps its default (True): Ansible reads it from the class before the task arguments are known,
+#     so it cannot follow run_on_controller; False would swap the connection for 'local' and break the default path
+#   - argument_spec, bulk and changed are abstract, a subclass without them cannot be instantiated
+#
+
+
+#
+#   auto_shard:
+#       resolves shard_index/shard_count from the play hosts of the task
+#
+#   returns:
+#       result -> True if the host is part of the play
+#       payload -> module args with shard_index/shard_count
+#       diagnostics -> error if shard options are combined or host is unknown
+#
+def auto_shard(
+    module_args: Dict[str, Any],
+    task_vars: Dict[str, Any]
+) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+    if (module_args.get(u_skel.JsonTKN.SHARD_INDEX.value) is not None or
+        module_args.get(u_skel.JsonTKN.SHARD_COUNT.value) is not None):
+        return (False, {}, {u_skel.JsonTKN.ERROR_MSG.value:
+            "'auto_shard' is mutually exclusive with 'shard_index' and 'shard_count'"})
+    play_hosts: List[str] = list(task_vars.get(u_skel.JsonTKN.ANSIBLE_PLAY_HOSTS.value) or [])
+    hostname: Optional[str] = task_vars.get(u_skel.JsonTKN.INVENTORY_HOSTNAME.value)
+    if hostname not in play_hosts:
+        return (False, {}, {u_skel.JsonTKN.ERROR_MSG.value: f"'{hostname}' is not in ansible_play_hosts"})
+    return (True, module_args | {
+        u_skel.JsonTKN.SHARD_INDEX.value: play_hosts.index(hostname),
+        u_skel.JsonTKN.SHARD_COUNT.value: len(play_hosts)
+        }, {})
+
+
+class BulkActionBase(ActionBase, ABC):
+
+    TRANSFERS_FILES = False
+
+    # set by subclass
+    payload_key: str = ""
+    entity_file_keys: Tuple[str, ...] = ()
+
+    @abstractmethod
+    def argument_spec(self) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def bulk(
+        self,
+        module_params: Dict[str, Any],
+        check_mode: bool
+    ) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def changed(
+        self,
+        payload: Dict[str, Any]
+    ) -> bool:
+        ...
+
+    def run(
+        self,
+        tmp: Optional[str] = None,
+        task_vars: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        result: Dict[str, Any] = super().run(tmp, task_vars)
+        del tmp
+        u_skel.clear_artifacts()
+
+        module_args: Dict[str, Any] = dict(self._task.args)
+        if boolean(module_args.get(u_skel.JsonTKN.AUTO_SHARD.value, False), strict=False):
+            shard_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = auto_shard(module_args, task_vars or {})
+            shard_ok, module_args, diagnostics = shard_result
+            if not shard_ok:
+                result.update(u_skel.ansible_fail(diagnostics=diagnostics))
+                result["failed"] = True
+                return result
+
+        if not boolean(module_args.get(u_skel.JsonTKN.RUN_ON_CONTROLLER.value, False), strict=False):
+            result.update(self._execute_module(
+                module_name=self._task.action,
+                module_args=module_args,
+                task_vars=task_vars
+                ))
+            return result
+
+        validator = ArgumentSpecValidator(u_args.argument_spec_neo4j() | self.argument_spec())
+        validation = validator.validate(module_args)
+        if validation.error_messages:
+            result.update(u_skel.ansible_fail(
+                diagnostics={u_skel.JsonTKN.ERROR_MSG.value: validation.error_messages}
+                ))
+            result["failed"] = True
+            return result
+        module_params: Dict[str, Any] = validation.validated_parameters
+        for entity_file_key in self.entity_file_keys:
+            module_params[entity_file_key] = self._loader.path_dwim(module_params[entity_file_key])
+
+        trace_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_trace.start(module_params, self.payload_key)
+        trace_ok, _, diagnostics = trace_result
+        if not trace_ok:
+            u_trace.finish(False)
+            result.update(u_skel.ansible_fail(diagnostics=diagnostics))
+            result["failed"] = True
+            return result
+        bulk_result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = (False, {}, {})
+        try:
+            bulk_result = self.bulk(
+                module_params,
+                bool(self._task.check_mode)
+                )
+        finally:
+            u_trace.finish(bulk_result[0])
+        bulk_ok, payload, diagnostics = bulk_result
+        if not bulk_ok:
+            result.update(u_skel.ansible_fail(diagnostics=diagnostics))
+            result["failed"] = True
+            return result
+        result.update(u_skel.ansible_exit(
+            changed=self.changed(payload),
+            payload_key=self.payload_key,
+            payload=payload
+            ))
+        return result
@@ -21,6 +21,24 @@ OBJECT="plugins/modules/edge_bulk.py"
 echo "linting ${OBJECT}"; pylint ${OBJECT}
 OBJECT="plugins/modules/vertex_bulk.py"
 echo "linting ${OBJECT}"; pylint ${OBJECT}
+OBJECT="plugins/modules/graph_load.py"
+echo "linting ${OBJECT}"; pylint ${OBJECT}
+
+echo "--- action ---"
+OBJECT="plugins/action/edge_bulk.py"
+echo "linting ${OBJECT}"; pylint ${OBJECT}
+OBJECT="plugins/action/graph_load.py"
+echo "linting ${OBJECT}"; pylint ${OBJECT}
+OBJECT="plugins/action/vertex_bulk.py"
+echo "linting ${OBJECT}"; pylint ${OBJECT}
+
+echo "--- plugin_utils ---"
+OBJECT="plugins/plugin_utils/bulk_action.py"
+echo "linting ${OBJECT}"; pylint ${OBJECT}
+
+echo "--- callback ---"
+OBJECT="plugins/callback/neo4j_stats.py"
+echo "linting ${OBJECT}"; pylint ${OBJECT}
 
 PYTHONPATH=./plugins/module_utils
 cd ${PYTHONPATH}
@@ -28,21 +46,51 @@ cd ${PYTHONPATH}
 echo "--- module_utils ---"
 OBJECT="argument_spec.py"
 echo "linting ${OBJECT}"; pylint ${OBJECT}
+OBJECT="broker.py"
+echo "linting ${OBJECT}"; pylint ${OBJECT}
+OBJECT="bulk.py"
+echo "linting ${OBJECT}"; pylint ${OBJECT}
+OBJECT="columnar.py"
+echo "linting ${OBJECT}"; pylint ${OBJECT}
 OBJECT="cypher_query.py"
 echo "linting ${OBJECT}"; pylint ${OBJECT}
 OBJECT="cypher.py"
 echo "linting ${OBJECT}"; pylint ${OBJECT}
 OBJECT="driver"
 echo "linting ${OBJECT}"; pylint ${OBJECT}
+OBJECT="fanout.py"
+echo "linting ${OBJECT}"; pylint ${OBJECT}
+OBJECT="graph.py"
+echo "linting ${OBJECT}"; pylint ${OBJECT}
+OBJECT="histogram.py"
+echo "linting ${OBJECT}"; pylint ${OBJECT}
+OBJECT="initial_load.py"
+echo "linting ${OBJECT}"; pylint ${OBJECT}
 OBJECT="input.py"
 echo "linting ${OBJECT}"; pylint ${OBJECT}
+OBJECT="ledger.py"
+echo "linting ${OBJECT}"; pylint ${OBJECT}
+OBJECT="loader.py"
+echo "linting ${OBJECT}"; pylint ${OBJECT}
+OBJECT="memory.py"
+echo "linting ${OBJECT}"; pylint ${OBJECT}
+OBJECT="metrics.py"
+echo "linting ${OBJECT}"; pylint ${OBJECT}
+OBJECT="profiler.py"
+echo "linting ${OBJECT}"; pylint ${OBJECT}
 OBJECT="schema.py"
 echo "linting ${OBJECT}"; pylint ${OBJECT}
 OBJECT="shared.py"
 echo "linting ${OBJECT}"; pylint ${OBJECT}
 OBJECT="skeleton.py"
 echo "linting ${OBJECT}"; pylint ${OBJECT}
+OBJECT="slowlog.py"
+echo "linting ${OBJECT}"; pylint ${OBJECT}
 OBJECT="stats.py"
 echo "linting ${OBJECT}"; pylint ${OBJECT}
+OBJECT="throttle.py"
+echo "linting ${OBJECT}"; pylint ${OBJECT}
+OBJECT="trace.py"
+echo "linting ${OBJECT}"; pylint ${OBJECT}
 
 
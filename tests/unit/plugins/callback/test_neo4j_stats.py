@@ -0,0 +1,62 @@
+"""
+    Filename: ./tests/unit/plugins/callback/test_neo4j_stats.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        neo4j_stats groups task results by the rendered module arguments
+"""
+from typing import Dict, Any, Optional
+from types import SimpleNamespace
+
+# pylint: disable=import-error
+from ansible_collections.platform42.neo4j.plugins.callback.neo4j_stats import CallbackModule
+
+TEMPLATE_ARGS: Dict[str, Any] = {"label": "{{ item.label }}", "entity_name": "{{ item.name }}"}
+
+
+def task_result(
+    args: Dict[str, Any],
+    result: Dict[str, Any]
+) -> SimpleNamespace:
+    return SimpleNamespace(
+        _task=SimpleNamespace(resolved_action="platform42.neo4j.vertex", action="vertex", args=args, _uuid="t1"),
+        _host=SimpleNamespace(get_name=lambda: "h1"),
+        _result=result
+        )
+
+
+def item_result(
+    label: str,
+    nodes_created: int,
+    failed: Optional[bool] = None
+) -> Dict[str, Any]:
+    result: Dict[str, Any] = {
+        "invocation": {"module_args": {"label": label, "entity_name": "x"}},
+        "vertex": {"stats": {"nodes_created": nodes_created}}
+    }
+    if failed is not None:
+        result["failed"] = failed
+    return result
+
+
+def test_loop_grouped_per_rendered_label() -> None:
+    callback: CallbackModule = CallbackModule()
+    callback.play = "p"
+    callback.record(task_result(TEMPLATE_ARGS, {"results": [
+        item_result("Station", 1),
+        item_result("Track", 1, failed=True),
+        item_result("Station", 1),
+        {"skipped": True, "item": {"label": "Depot"}}
+        ]}), True)
+    assert sorted(callback.rows) == [("p", "h1", "vertex", "Station"), ("p", "h1", "vertex", "Track")]
+    station = callback.rows[("p", "h1", "vertex", "Station")]
+    track = callback.rows[("p", "h1", "vertex", "Track")]
+    assert (station.tasks, station.failed, station.counters["nodes_created"]) == (1, 0, 2)
+    assert (track.tasks, track.failed, track.counters["nodes_created"]) == (1, 1, 1)
+
+
+def test_without_invocation_uses_task_args() -> None:
+    callback: CallbackModule = CallbackModule()
+    callback.record(task_result({"label": "Station"}, {"vertex": {"stats": {"nodes_created": 1}}}), False)
+    assert [key[3] for key in callback.rows] == ["Station"]
@@ -0,0 +1,54 @@
+"""
+    Filename: ./tests/unit/plugins/module_utils/test_broker_error.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        NEO4J errors raised through the broker keep the code and message of the server
+"""
+from typing import Dict, Any
+import json
+import pytest
+
+# pylint: disable=import-error
+import ansible_collections.platform42.neo4j.plugins.module_utils.broker as u_broker
+import ansible_collections.platform42.neo4j.plugins.module_utils.skeleton as u_skel
+import ansible_collections.platform42.neo4j.plugins.module_utils.throttle as u_throttle
+from neo4j.exceptions import Neo4jError, TransientError
+
+DEADLOCK: str = "Neo.TransientError.Transaction.DeadlockDetected"
+SYNTAX: str = "Neo.ClientError.Statement.SyntaxError"
+
+
+@pytest.mark.parametrize("code", [DEADLOCK, "Neo.TransientError.Transaction.LockClientStopped"])
+def test_remote_transient_error(
+    code: str
+) -> None:
+    e: u_broker.RemoteNeo4jError = u_broker.remote_error(code, "lock wait")
+    assert isinstance(e, TransientError)
+    assert e.code == code
+    assert e.message == "lock wait"
+    assert u_throttle.transient_error(e)
+
+
+def test_remote_client_error() -> None:
+    e: u_broker.RemoteNeo4jError = u_broker.remote_error(SYNTAX, "invalid input")
+    assert isinstance(e, Neo4jError)
+    assert not isinstance(e, TransientError)
+    assert e.code == SYNTAX
+    assert not u_throttle.transient_error(e)
+    assert u_skel.ansible_diagnostics(e)[u_skel.JsonTKN.ERROR_MSG.value] == f"{SYNTAX}: invalid input"
+
+
+def test_error_payload_round_trip() -> None:
+    payload: Dict[str, Any] = json.loads(json.dumps(
+        u_broker.error_payload(u_broker.remote_error(DEADLOCK, "lock wait"))
+        ))
+    error: Dict[str, Any] = payload[u_broker.BrokerTKN.ERROR.value]
+    e: u_broker.RemoteNeo4jError = u_broker.remote_error(
+        error[u_broker.BrokerTKN.CODE.value],
+        error[u_skel.JsonTKN.ERROR_MSG.value]
+        )
+    assert e.code == DEADLOCK
+    assert e.message == "lock wait"
+    assert u_throttle.transient_error(e)
@@ -0,0 +1,102 @@
+"""
+    Filename: ./tests/unit/plugins/module_utils/test_broker_summary.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        BrokerSummary carries what cypher_stats reads from a NEO4J ResultSummary
+"""
+from typing import Dict, Any, List, Optional
+from types import SimpleNamespace
+import json
+import warnings
+import pytest
+
+# pylint: disable=import-error
+import ansible_collections.platform42.neo4j.plugins.module_utils.broker as u_broker
+import ansible_collections.platform42.neo4j.plugins.module_utils.stats as u_stats
+from neo4j import ResultSummary, Address
+
+NOTIFICATIONS: List[Dict[str, Any]] = [
+    {
+        "code": "Neo.ClientNotification.Statement.CartesianProduct",
+        "title": "cartesian product",
+        "description": "d",
+        "severity": "INFORMATION",
+        "category": "PERFORMANCE",
+        "position": {"offset": 9, "line": 1, "column": 10}
+    },
+    {
+        "code": "Neo.ClientNotification.Statement.FeatureDeprecationWarning",
+        "title": "deprecated",
+        "description": "d",
+        "severity": "WARNING",
+        "category": "DEPRECATION"
+    }
+]
+
+
+def broker_summary(
+    summary: Optional[Dict[str, Any]] = None
+) -> Any:
+    response: Dict[str, Any] = {"keys": [], "records": [], "summary": summary}
+    return u_broker.BrokerResult(json.loads(json.dumps(response))).consume()
+
+
+def test_summary_round_trip() -> None:
+    result_summary: SimpleNamespace = SimpleNamespace(
+        counters=u_broker.BrokerCounters(nodes_created=2),
+        query_type="w",
+        result_available_after=3,
+        result_consumed_after=4,
+        server=SimpleNamespace(address=SimpleNamespace(host="db", port=7687)),
+        database="neo4j",
+        notifications=NOTIFICATIONS
+        )
+    stats: Dict[str, Any] = u_stats.cypher_stats(broker_summary(u_broker.summary_payload(result_summary)), 12.5)
+    assert stats["nodes_created"] == 2
+    assert stats["result_available_after"] == 3
+    assert stats["result_consumed_after"] == 4
+    assert stats["server_address"] == "db:7687"
+    assert stats["database"] == "neo4j"
+    assert [notification["code"] for notification in stats["performance_notifications"]] == [NOTIFICATIONS[0]["code"]]
+    assert stats["performance_notifications"][0]["position"] == {"line": 1, "column": 10, "offset": 9}
+
+
+def test_summary_of_older_broker() -> None:
+    stats: Dict[str, Any] = u_stats.cypher_stats(broker_summary({"counters": {}, "query_type": "r"}))
+    assert stats["result_available_after"] is None
+    assert stats["server_address"] is None
+    assert stats["database"] is None
+    assert stats["performance_notifications"] == []
+
+
+def driver_summary(
+    metadata: Dict[str, Any]
+) -> ResultSummary:
+    address: Address = Address(("db", 7687))
+    server: SimpleNamespace = SimpleNamespace(address=address, protocol_version=(5, 0))
+    return ResultSummary(address, True, True, {"server": server, "db": "neo4j", **metadata})
+
+
+@pytest.mark.parametrize("metadata", [
+    {"notifications": NOTIFICATIONS},
+    {"statuses": [{
+        "gql_status": "03N90",
+        "status_description": "info: cartesian product",
+        "neo4j_code": NOTIFICATIONS[0]["code"],
+        "title": NOTIFICATIONS[0]["title"],
+        "diagnostic_record": {"_classification": "PERFORMANCE", "_severity": "INFORMATION", "_position": NOTIFICATIONS[0]["position"]}
+    }]}
+])
+def test_driver_summary_notifications(
+    metadata: Dict[str, Any]
+) -> None:
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        stats: Dict[str, Any] = u_stats.cypher_stats(driver_summary(metadata))
+        payload: Dict[str, Any] = u_broker.summary_payload(driver_summary(metadata))
+    assert stats["server_address"] == "db:7687"
+    assert [notification["category"] for notification in stats["performance_notifications"]] == ["PERFORMANCE"]
+    assert stats["performance_notifications"][0]["position"] == {"line": 1, "column": 10, "offset": 9}
+    assert u_stats.cypher_stats(broker_summary(payload))["performance_notifications"] == stats["performance_notifications"]
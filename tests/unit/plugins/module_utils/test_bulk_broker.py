@@ -0,0 +1,80 @@
+"""
+    Filename: ./tests/unit/plugins/module_utils/test_bulk_broker.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        bulk batches executed through the broker report server timing
+"""
+from typing import Dict, Any, Tuple
+from types import SimpleNamespace
+import json
+import pytest
+import yaml
+
+# pylint: disable=import-error
+import ansible_collections.platform42.neo4j.plugins.module_utils.broker as u_broker
+import ansible_collections.platform42.neo4j.plugins.module_utils.bulk as u_bulk
+
+
+class BrokerSession:
+
+    def __enter__(self) -> "BrokerSession":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+    def run(
+        self,
+        cypher_query: str,
+        cypher_params: Any = None
+    ) -> u_broker.BrokerResult:
+        del cypher_query
+        rows: int = len((cypher_params or {}).get("batch", []))
+        result_summary: SimpleNamespace = SimpleNamespace(
+            counters=u_broker.BrokerCounters(nodes_created=rows, properties_set=rows),
+            query_type="w",
+            result_available_after=3,
+            result_consumed_after=2,
+            server=SimpleNamespace(address=SimpleNamespace(host="db", port=7687)),
+            database="neo4j",
+            notifications=None
+            )
+        return u_broker.BrokerResult(json.loads(json.dumps({
+            "keys": [],
+            "records": [],
+            "summary": u_broker.summary_payload(result_summary)
+            })))
+
+
+class BrokerDriver:
+
+    def session(self, database: Any = None) -> BrokerSession:
+        del database
+        return BrokerSession()
+
+    def close(self) -> None:
+        pass
+
+
+def test_vertex_bulk_server_msec(
+    tmp_path: Any,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(u_bulk.u_driver, "get_driver", lambda module_params: BrokerDriver())
+    vertex_file = tmp_path / "vertices.yml"
+    vertex_file.write_text(yaml.safe_dump({"v": [
+        {"label": "station", "entity_name": f"s{idx}", "properties": {"zone": {"value": "1", "type": "int"}}}
+        for idx in range(3)
+        ]}))
+    result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_bulk.vertex_bulk({
+        "database": "neo4j",
+        "vertex_file": str(vertex_file),
+        "vertex_anchor": "v"
+        }, False)
+    ok, payload, diagnostics = result
+    assert ok, diagnostics
+    assert payload["processed"] == 3
+    assert payload["nodes_created"] == 3
+    assert payload["server_msec"] == 5
@@ -0,0 +1,182 @@
+"""
+    Filename: ./tests/unit/plugins/module_utils/test_bulk_fingerprint.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        fingerprint bulk batches with deletes and check_mode - every batch must be valid Cypher
+"""
+from typing import Dict, Any, List, Tuple
+from types import SimpleNamespace
+import pytest
+import yaml
+
+# pylint: disable=import-error
+import ansible_collections.platform42.neo4j.plugins.module_utils.bulk as u_bulk
+import ansible_collections.platform42.neo4j.plugins.module_utils.cypher_query as u_cyph_q
+
+COUNTERS: Dict[str, int] = {
+    "nodes_created": 0,
+    "nodes_deleted": 0,
+    "relationships_created": 0,
+    "relationships_deleted": 0,
+    "properties_set": 0,
+    "labels_added": 0,
+    "labels_removed": 0
+}
+
+
+class FakeResult:
+
+    def __init__(
+        self,
+        cypher_query: str
+    ) -> None:
+        self.cypher_query: str = cypher_query
+
+    def __iter__(self) -> Any:
+        return iter([])
+
+    def consume(self) -> SimpleNamespace:
+        return SimpleNamespace(
+            result_available_after=1,
+            result_consumed_after=1,
+            counters=SimpleNamespace(**COUNTERS)
+            )
+
+
+class FakeSession:
+
+    def __init__(
+        self,
+        queries: List[str]
+    ) -> None:
+        self.queries: List[str] = queries
+
+    def __enter__(self) -> "FakeSession":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+    def run(
+        self,
+        cypher_query: str,
+        cypher_params: Any = None
+    ) -> FakeResult:
+        del cypher_params
+        self.queries.append(cypher_query)
+        return FakeResult(cypher_query)
+
+
+class FakeDriver:
+
+    def __init__(self) -> None:
+        self.queries: List[str] = []
+
+    def session(self, database: Any = None) -> FakeSession:
+        del database
+        return FakeSession(self.queries)
+
+    def close(self) -> None:
+        pass
+
+
+def vertex(
+    entity_name: str,
+    state: str
+) -> Dict[str, Any]:
+    return {
+        "label": "station",
+        "entity_name": entity_name,
+        "state": state,
+        "properties": {"zone": {"value": "1", "type": "int"}}
+    }
+
+
+def edge(
+    entity_name_from: str,
+    entity_name_to: str,
+    state: str,
+    bi_directional: bool
+) -> Dict[str, Any]:
+    return {
+        "type": "track",
+        "state": state,
+        "bi_directional": bi_directional,
+        "from": {"label": "station", "entity_name": entity_name_from},
+        "to": {"label": "station", "entity_name": entity_name_to},
+        "properties": {"km": {"value": "1", "type": "int"}}
+    }
+
+
+def assert_valid_batches(
+    queries: List[str]
+) -> None:
+    assert queries
+    for cypher_query in queries:
+        primitive_query: str = cypher_query.rsplit("}", 1)[0].strip()
+        assert ("sum(_)" in cypher_query) == primitive_query.endswith(" AS _"), cypher_query
+
+
+@pytest.fixture(name="driver")
+def fixture_driver(
+    monkeypatch: pytest.MonkeyPatch
+) -> FakeDriver:
+    driver: FakeDriver = FakeDriver()
+    monkeypatch.setattr(u_bulk.u_driver, "get_driver", lambda module_params: driver)
+    return driver
+
+
+@pytest.mark.parametrize("check_mode", [False, True])
+def test_vertex_bulk_mixed_states(
+    tmp_path: Any,
+    driver: FakeDriver,
+    check_mode: bool
+) -> None:
+    vertex_file = tmp_path / "vertices.yml"
+    vertex_file.write_text(yaml.safe_dump({"v": [
+        vertex("a", "present"), vertex("b", "absent"), vertex("c", "present")
+        ]}))
+    result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_bulk.vertex_bulk({
+        "database": "neo4j",
+        "vertex_file": str(vertex_file),
+        "vertex_anchor": "v",
+        "fingerprint": True
+        }, check_mode)
+    assert result[0], result[2]
+    assert_valid_batches(driver.queries)
+    assert sum("sum(_)" in cypher_query for cypher_query in driver.queries) == (0 if check_mode else 2)
+
+
+@pytest.mark.parametrize("check_mode", [False, True])
+def test_edge_bulk_mixed_states(
+    tmp_path: Any,
+    driver: FakeDriver,
+    check_mode: bool
+) -> None:
+    edge_file = tmp_path / "edges.yml"
+    edge_file.write_text(yaml.safe_dump({"e": [
+        edge("a", "b", "present", False),
+        edge("b", "c", "absent", False),
+        edge("c", "d", "absent", True),
+        edge("d", "e", "present", True)
+        ]}))
+    result: Tuple[bool, Dict[str, Any], Dict[str, Any]] = u_bulk.edge_bulk({
+        "database": "neo4j",
+        "edge_file": str(edge_file),
+        "edge_anchor": "e",
+        "fingerprint": True
+        }, check_mode)
+    assert result[0], result[2]
+    assert_valid_batches(driver.queries)
+    assert sum("sum(_)" in cypher_query for cypher_query in driver.queries) == (0 if check_mode else 2)
+
+
+def test_row_template() -> None:
+    fingerprint: str = u_cyph_q.CypherQuery.BULK_TEMPLATE_FINGERPRINT.value
+    plain: str = u_cyph_q.CypherQuery.BULK_TEMPLATE.value
+    assert u_bulk.u_cypher.row_template(u_cyph_q.CypherQuery.VERTEX_DEL.value, fingerprint) == plain
+    assert u_bulk.u_cypher.row_template(u_cyph_q.CypherQuery.SIMULATION.value, fingerprint) == plain
+    assert u_bulk.u_cypher.row_template(u_cyph_q.CypherQuery.VERTEX_BULK_ADD.value, fingerprint) == fingerprint
+    assert u_bulk.u_cypher.row_template(u_cyph_q.CypherQuery.VERTEX_DEL.value, plain) == plain
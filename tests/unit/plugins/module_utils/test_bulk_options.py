@@ -0,0 +1,42 @@
+"""
+    Filename: ./tests/unit/plugins/module_utils/test_bulk_options.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        option checks of the bulk modules
+"""
+from typing import Dict, Any, Optional
+import pytest
+
+# pylint: disable=import-error
+import ansible_collections.platform42.neo4j.plugins.module_utils.bulk as u_bulk
+
+
+@pytest.mark.parametrize("shard_index, shard_count, valid", [
+    (None, None, True),
+    (0, 1, True),
+    (0, 2, False),
+    (1, 3, False)
+])
+def test_ensure_endpoints_sharding(
+    shard_index: Optional[int],
+    shard_count: Optional[int],
+    valid: bool
+) -> None:
+    module_params: Dict[str, Any] = {
+        "database": "neo4j",
+        "ensure_endpoints": True,
+        "shard_index": shard_index,
+        "shard_count": shard_count
+    }
+    result, _, diagnostics = u_bulk.validate_bulk_options(module_params)
+    assert result == valid
+    if not valid:
+        assert "ensure_endpoints" in diagnostics["error_msg"]
+
+
+def test_sharding_without_ensure_endpoints() -> None:
+    result, payload, _ = u_bulk.validate_bulk_options({"database": "neo4j", "shard_index": 1, "shard_count": 2})
+    assert result
+    assert payload[0] == (1, 2)
@@ -0,0 +1,85 @@
+"""
+    Filename: ./tests/unit/plugins/module_utils/test_cypher.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        bi-directional edges - single storage merges one relationship in canonical direction,
+        double storage keeps the input order
+"""
+from typing import Dict, Any, Optional, Tuple
+import pytest
+
+# pylint: disable=import-error
+import ansible_collections.platform42.neo4j.plugins.module_utils.bulk as u_bulk
+import ansible_collections.platform42.neo4j.plugins.module_utils.cypher as u_cypher
+
+PROPERTIES: Dict[str, Any] = {"KM": 12}
+
+
+def edge_params(
+    storage: Optional[str],
+    vertex_from: Tuple[str, str],
+    vertex_to: Tuple[str, str]
+) -> Dict[str, Any]:
+    module_params: Dict[str, Any] = {
+        "type": "track",
+        "bi_directional": True,
+        "unique_key": None,
+        "state": "PRESENT",
+        "from": {"label": vertex_from[0], "entity_name": vertex_from[1]},
+        "to": {"label": vertex_to[0], "entity_name": vertex_to[1]}
+    }
+    if storage is not None:
+        module_params["bi_directional_storage"] = storage
+    return module_params
+
+
+def both_orders(
+    storage: Optional[str],
+    is_bulk: bool
+) -> Tuple[Tuple[str, Dict[str, Any], str], Tuple[str, Dict[str, Any], str]]:
+    station: Tuple[str, str] = ("station", "Utrecht")
+    depot: Tuple[str, str] = ("Depot", "Amersfoort")
+    if is_bulk:
+        return (
+            u_bulk.edge_primitive(False, edge_params(storage, station, depot), PROPERTIES),
+            u_bulk.edge_primitive(False, edge_params(storage, depot, station), PROPERTIES)
+            )
+    return (
+        u_cypher.edge_add(False, False, edge_params(storage, station, depot), PROPERTIES),
+        u_cypher.edge_add(False, False, edge_params(storage, depot, station), PROPERTIES)
+        )
+
+
+@pytest.mark.parametrize("is_bulk", [False, True])
+def test_single_storage_is_order_independent(
+    is_bulk: bool
+) -> None:
+    forward, backward = both_orders("single", is_bulk)
+    assert forward[0] == backward[0]
+    assert forward[1] == backward[1]
+    assert forward[1]["entity_name_from"] == "Amersfoort"
+    assert forward[1]["entity_name_to"] == "Utrecht"
+    assert "]->" in forward[0] and "]-(" not in forward[0]
+
+
+@pytest.mark.parametrize("storage", [None, "double"])
+@pytest.mark.parametrize("is_bulk", [False, True])
+def test_double_storage_keeps_input_order(
+    storage: Optional[str],
+    is_bulk: bool
+) -> None:
+    forward, backward = both_orders(storage, is_bulk)
+    assert forward[0] != backward[0]
+    assert (forward[1]["entity_name_from"], forward[1]["entity_name_to"]) == ("Utrecht", "Amersfoort")
+    assert (backward[1]["entity_name_from"], backward[1]["entity_name_to"]) == ("Amersfoort", "Utrecht")
+    double_params: Dict[str, Any] = edge_params("double", ("station", "Utrecht"), ("Depot", "Amersfoort"))
+    assert forward[0] == u_cypher.edge_add(False, is_bulk, double_params, PROPERTIES)[0]
+
+
+def test_single_storage_needs_bi_directional() -> None:
+    module_params: Dict[str, Any] = edge_params("single", ("station", "Utrecht"), ("Depot", "Amersfoort"))
+    module_params["bi_directional"] = False
+    assert not u_cypher.single_storage(module_params)
+    assert u_cypher.edge_endpoints(module_params) == (module_params["from"], module_params["to"])
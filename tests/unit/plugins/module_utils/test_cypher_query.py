@@ -0,0 +1,23 @@
+"""
+    Filename: ./tests/unit/plugins/module_utils/test_cypher_query.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        Cypher query construction
+"""
+# pylint: disable=import-error
+import ansible_collections.platform42.neo4j.plugins.module_utils.cypher_query as u_cyph_q
+
+
+def index_name(
+    cypher_query: str
+) -> str:
+    return cypher_query.split()[2]
+
+
+def test_index_names_per_kind() -> None:
+    relationship_index: str = index_name(u_cyph_q.cypher_relationship_index_add("TRANSACTION", "id"))
+    node_index: str = index_name(u_cyph_q.cypher_node_index_add("Transaction", "id"))
+    assert relationship_index == "index_rel_transaction_id"
+    assert node_index == "index_node_transaction_id"
@@ -0,0 +1,33 @@
+"""
+    Filename: ./tests/unit/plugins/module_utils/test_driver.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        driver config passed to GraphDatabase.driver()
+"""
+from typing import Dict, Any
+import warnings
+
+# pylint: disable=import-error
+import ansible_collections.platform42.neo4j.plugins.module_utils.driver as u_driver
+
+MODULE_PARAMS: Dict[str, Any] = {
+    "neo4j_uri": "neo4j://127.0.0.1:7687",
+    "username": "neo4j",
+    "password": "secret",
+    "notifications_disabled_categories": ["HINT", "SCHEMA"]
+}
+
+
+def test_notifications_disabled_key() -> None:
+    assert u_driver.notifications_disabled_key("5.28.6") == "notifications_disabled_categories"
+    assert u_driver.notifications_disabled_key("6.0.0") == "notifications_disabled_classifications"
+
+
+def test_disabled_categories_without_deprecation() -> None:
+    config: Dict[str, Any] = u_driver.driver_config(MODULE_PARAMS)
+    assert config == {u_driver.notifications_disabled_key(): ["HINT", "SCHEMA"]}
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        u_driver.get_driver(MODULE_PARAMS).close()
@@ -0,0 +1,69 @@
+"""
+    Filename: ./tests/unit/plugins/module_utils/test_import_time.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        start-up benchmark - importing a module does not load heavy dependencies
+        importtime.sh remains the profiler for the import time itself
+"""
+from typing import Dict, List
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+MODULES: List[str] = [
+    "graph_reset",
+    "query",
+    "vertex",
+    "edge",
+    "label",
+    "constraint",
+    "edge_bulk",
+    "vertex_bulk",
+    "graph_load"
+]
+
+# loaded on first use (module option or data shape), never by the import of a module
+HEAVY: List[str] = [
+    "yaml",
+    "regex",
+    "numpy",
+    "pyarrow",
+    "cProfile",
+    "tracemalloc",
+    "ansible_collections.platform42.neo4j.plugins.module_utils.broker"
+]
+
+
+def loaded_modules(
+    statement: str
+) -> List[str]:
+    script: str = f"import json, sys\n{statement}\nprint(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))"
+    env: Dict[str, str] = {**os.environ, "PYTHONPATH": os.pathsep.join(path for path in sys.path if path)}
+    completed: subprocess.CompletedProcess = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True
+        )
+    loaded: List[str] = json.loads(completed.stdout)
+    return loaded
+
+
+@pytest.fixture(name="driver_modules", scope="module")
+def fixture_driver_modules() -> List[str]:
+    # the NEO4J driver imports numpy itself when it is installed
+    return loaded_modules("import neo4j")
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_import_is_light(
+    module: str,
+    driver_modules: List[str]
+) -> None:
+    loaded: List[str] = loaded_modules(f"import ansible_collections.platform42.neo4j.plugins.modules.{module}")
+    assert [m for m in loaded if m not in driver_modules] == []
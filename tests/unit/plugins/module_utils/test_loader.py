@@ -0,0 +1,240 @@
+"""
+    Filename: ./tests/unit/plugins/module_utils/test_loader.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        graph_load ordering - edge batches wait for the ranks of their endpoint labels
+"""
+from typing import Dict, Any, List, Tuple, Callable
+from types import SimpleNamespace
+from threading import Event, Lock, Thread
+import time
+import pytest
+import yaml
+
+# pylint: disable=import-error
+import ansible_collections.platform42.neo4j.plugins.module_utils.loader as u_loader
+from neo4j.exceptions import Neo4jError
+
+COUNTERS: Dict[str, int] = {
+    "nodes_created": 0,
+    "nodes_deleted": 0,
+    "relationships_created": 0,
+    "relationships_deleted": 0,
+    "properties_set": 0,
+    "labels_added": 0,
+    "labels_removed": 0
+}
+
+
+class FakeResult:
+
+    def __iter__(self) -> Any:
+        return iter([])
+
+    def consume(self) -> SimpleNamespace:
+        return SimpleNamespace(result_available_after=1, result_consumed_after=1, counters=SimpleNamespace(**COUNTERS))
+
+
+class FakeDriver:
+
+    def __init__(
+        self,
+        on_run: Callable[[str], None]
+    ) -> None:
+        self.queries: List[str] = []
+        self._on_run: Callable[[str], None] = on_run
+        self._lock: Lock = Lock()
+
+    def session(self, database: Any = None) -> "FakeDriver":
+        del database
+        return self
+
+    def __enter__(self) -> "FakeDriver":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+    def run(
+        self,
+        cypher_query: str,
+        cypher_params: Any = None
+    ) -> FakeResult:
+        del cypher_params
+        self._on_run(cypher_query)
+        with self._lock:
+            self.queries.append(cypher_query)
+        return FakeResult()
+
+    def close(self) -> None:
+        pass
+
+
+def vertex(
+    label: str,
+    entity_name: str
+) -> Dict[str, Any]:
+    return {"label": label, "entity_name": entity_name, "properties": {"zone": {"value": "1", "type": "int"}}}
+
+
+def edge(
+    relation_type: str,
+    label_from: str,
+    label_to: str
+) -> Dict[str, Any]:
+    return {
+        "type": relation_type,
+        "bi_directional": False,
+        "from": {"label": label_from, "entity_name": "a"},
+        "to": {"label": label_to, "entity_name": "b"},
+        "properties": {"km": {"value": "1", "type": "int"}}
+    }
+
+
+def is_edge(
+    cypher_query: str
+) -> bool:
+    return "]->" in cypher_query or "]-(" in cypher_query
+
+
+def last_vertex_batch(
+    queries: List[str],
+    label: str
+) -> int:
+    return max(idx for idx, cypher_query in enumerate(queries) if not is_edge(cypher_query) and f"`{label}`" in cypher_query)
+
+
+def first_edge_batch(
+    queries: List[str],
+    relation_type: str
+) -> int:
+    return min(idx for idx, cypher_query in enumerate(queries) if is_edge(cypher_query) and f"`{relation_type}`" in cypher_query)
+
+
+def run_graph_load(
+    tmp_path: Any,
+    monkeypatch: pytest.MonkeyPatch,
+    driver: FakeDriver,
+    vertices: List[Dict[str, Any]],
+    edges: List[Dict[str, Any]]
+) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
+    monkeypatch.setattr(u_loader.u_driver, "get_driver", lambda module_params: driver)
+    vertex_file = tmp_path / "vertices.yml"
+    vertex_file.write_text(yaml.safe_dump({"v": vertices}))
+    edge_file = tmp_path / "edges.yml"
+    edge_file.write_text(yaml.safe_dump({"e": edges}))
+    return u_loader.graph_load({
+        "database": "neo4j",
+        "vertex_file": str(vertex_file),
+        "vertex_anchor": "v",
+        "edge_file": str(edge_file),
+        "edge_anchor": "e"
+        }, False)
+
+
+def test_gate_wait_until_committed() -> None:
+    gate: u_loader.GraphGate = u_loader.GraphGate()
+    passed: Event = Event()
+    waiter: Thread = Thread(target=lambda: passed.set() if gate.wait(1) else None, daemon=True)
+    waiter.start()
+    gate.commit(0)
+    assert not passed.wait(0.1)
+    gate.commit(1)
+    assert passed.wait(2)
+    assert gate.wait(-1)
+
+
+def test_gate_abort_keeps_root_cause() -> None:
+    gate: u_loader.GraphGate = u_loader.GraphGate()
+    gate.abort({"error_msg": "root cause"})
+    gate.abort({"error_msg": "bulk execution aborted"})
+    assert not gate.wait(0)
+    assert gate.diagnostics == {"error_msg": "root cause"}
+
+
+def test_ranks() -> None:
+    ranks: Dict[str, int] = {}
+    assert [u_loader.vertex_rank(ranks, vertex(label, "x")) for label in ("station", "depot", "Station")] == [0, 1, 0]
+    assert u_loader.edge_rank(ranks, edge("TRACK", "station", "station")) == 0
+    assert u_loader.edge_rank(ranks, edge("SERVES", "station", "depot")) == 1
+    assert u_loader.edge_rank(ranks, edge("EXIT", "platform", "platform")) == -1
+    batches, batch_ranks = u_loader.ranked_batches(
+        [("q1", {"b": 1}, ""), ("q0", {"b": 0}, ""), ("q2", {"b": 2}, "")],
+        [1, 0, -1],
+        lambda entity_results, batch_size: [(query, params) for query, params, _ in entity_results]
+        )
+    assert batches == [("q2", {"b": 2}), ("q0", {"b": 0}), ("q1", {"b": 1})]
+    assert batch_ranks == [-1, 0, 1]
+
+
+def test_edges_wait_for_endpoint_ranks(
+    tmp_path: Any,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+
+    def slow_vertices(cypher_query: str) -> None:
+        if not is_edge(cypher_query):
+            time.sleep(0.05)
+
+    driver: FakeDriver = FakeDriver(slow_vertices)
+    result, payload, diagnostics = run_graph_load(
+        tmp_path,
+        monkeypatch,
+        driver,
+        [vertex("station", "a"), vertex("station", "b"), vertex("depot", "a"), vertex("depot", "b")],
+        [edge("SERVES", "depot", "station"), edge("TRACK", "station", "station")]
+        )
+    assert result, diagnostics
+    assert payload["edges"]["processed"] == 2
+    assert first_edge_batch(driver.queries, "TRACK") > last_vertex_batch(driver.queries, "Station")
+    assert first_edge_batch(driver.queries, "SERVES") > last_vertex_batch(driver.queries, "Depot")
+
+
+def test_unranked_edges_do_not_wait(
+    tmp_path: Any,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    edge_ran: Event = Event()
+    vertex_saw_edge: List[bool] = []
+
+    def vertices_wait_for_edges(cypher_query: str) -> None:
+        if is_edge(cypher_query):
+            edge_ran.set()
+        else:
+            vertex_saw_edge.append(edge_ran.wait(5))
+
+    driver: FakeDriver = FakeDriver(vertices_wait_for_edges)
+    result, _, diagnostics = run_graph_load(
+        tmp_path,
+        monkeypatch,
+        driver,
+        [vertex("station", "a")],
+        [edge("EXIT", "platform", "platform")]
+        )
+    assert result, diagnostics
+    assert vertex_saw_edge == [True]
+
+
+def test_vertex_failure_aborts_edges(
+    tmp_path: Any,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+
+    def failing_vertices(cypher_query: str) -> None:
+        if not is_edge(cypher_query):
+            raise Neo4jError("vertex write failed")
+
+    driver: FakeDriver = FakeDriver(failing_vertices)
+    result, _, diagnostics = run_graph_load(
+        tmp_path,
+        monkeypatch,
+        driver,
+        [vertex("station", "a")],
+        [edge("TRACK", "station", "station")]
+        )
+    assert not result
+    assert "vertex write failed" in diagnostics["diagnostics"]["error_msg"]
+    assert "`Station`" in diagnostics["cypher_query"]
+    assert not any(is_edge(cypher_query) for cypher_query in driver.queries)
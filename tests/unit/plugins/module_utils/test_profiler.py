@@ -0,0 +1,46 @@
+"""
+    Filename: ./tests/unit/plugins/module_utils/test_profiler.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        profile of a module run includes the threads it starts (graph_load vertex_writer)
+"""
+from typing import Any, List
+from threading import Thread
+import pstats
+
+# pylint: disable=import-error
+import ansible_collections.platform42.neo4j.plugins.module_utils.profiler as u_profiler
+import ansible_collections.platform42.neo4j.plugins.module_utils.skeleton as u_skel
+
+
+def writer_work() -> int:
+    return sum(idx * idx for idx in range(1000))
+
+
+def main_work() -> int:
+    return sum(idx for idx in range(1000))
+
+
+def profiled_functions(
+    profile_file: str
+) -> List[str]:
+    return list(pstats.Stats(profile_file).get_stats_profile().func_profiles)
+
+
+def test_profile_includes_threads(
+    tmp_path: Any
+) -> None:
+    u_skel.clear_artifacts()
+    result, _, diagnostics = u_profiler.start({"profile_dir": str(tmp_path)}, "graph_load")
+    assert result, diagnostics
+    writer: Thread = Thread(target=writer_work)
+    writer.start()
+    writer.join()
+    main_work()
+    u_profiler.finish()
+    functions: List[str] = profiled_functions(u_skel.ARTIFACTS[u_skel.JsonTKN.PROFILE_FILE.value])
+    u_skel.clear_artifacts()
+    assert "writer_work" in functions
+    assert "main_work" in functions
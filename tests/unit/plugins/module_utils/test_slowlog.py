@@ -0,0 +1,89 @@
+"""
+    Filename: ./tests/unit/plugins/module_utils/test_slowlog.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        slow log records - redaction of parameter samples and flattened query templates
+"""
+from typing import Dict, Any, List
+import json
+
+# pylint: disable=import-error
+import ansible_collections.platform42.neo4j.plugins.module_utils.slowlog as u_slowlog
+
+CYPHER_QUERY: str = """
+    UNWIND $batch AS row
+    MERGE (v:`Station` {entity_name: row.entity_name})
+"""
+
+
+def slow_log(
+    tmp_path: Any,
+    redact_keys: List[str]
+) -> u_slowlog.SlowLog:
+    return u_slowlog.SlowLog(
+        slow_log_file=str(tmp_path / "slow.jsonl"),
+        threshold_msec=10,
+        sample=2,
+        redact_keys=redact_keys,
+        database="neo4j"
+        )
+
+
+def records(
+    log: u_slowlog.SlowLog
+) -> List[Dict[str, Any]]:
+    with open(log.slow_log_file, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_redact_nested() -> None:
+    rows: List[Dict[str, Any]] = [{
+        "entity_name": "a",
+        "Password": "p",
+        "props": {"TOKEN": "t", "tags": [{"password": "q"}, "x"]}
+    }]
+    assert u_slowlog.redact(rows, ["password", "token"]) == [{
+        "entity_name": "a",
+        "Password": u_slowlog.REDACTED,
+        "props": {"TOKEN": u_slowlog.REDACTED, "tags": [{"password": u_slowlog.REDACTED}, "x"]}
+    }]
+
+
+def test_redact_truncates_long_strings() -> None:
+    long_value: str = "x" * (u_slowlog.SAMPLE_VALUE_LEN + 10)
+    redacted: Any = u_slowlog.redact({"note": long_value, "short": "y", "when": (1, 2.5, None)}, [])
+    assert redacted["note"] == "x" * u_slowlog.SAMPLE_VALUE_LEN + "..."
+    assert redacted["short"] == "y"
+    assert redacted["when"] == [1, 2.5, None]
+
+
+def test_capture_batch(
+    tmp_path: Any
+) -> None:
+    log: u_slowlog.SlowLog = slow_log(tmp_path, ["PassWord"])
+    rows: List[Dict[str, Any]] = [{"entity_name": str(idx), "password": "p"} for idx in range(3)]
+    log.capture_batch(CYPHER_QUERY, rows, 1, 100, (20.0, 5.0), {"nodes_created": 3})
+    record: Dict[str, Any] = records(log)[0]
+    assert record["cypher_query"] == "UNWIND $batch AS row MERGE (v:`Station` {entity_name: row.entity_name})"
+    assert record["rows"] == [100, 102]
+    assert record["cypher_params"] == [{"entity_name": str(idx), "password": u_slowlog.REDACTED} for idx in range(2)]
+
+
+def test_capture_query(
+    tmp_path: Any
+) -> None:
+    log: u_slowlog.SlowLog = slow_log(tmp_path, ["Token"])
+    payload: Dict[str, Any] = {
+        "cypher_query": CYPHER_QUERY,
+        "cypher_params": {"batch": [{"token": "t"}, {"token": "u"}, {"token": "v"}], "TOKEN": "t"},
+        "stats": {"round_trip_msec": 20.0, "result_available_after": 2, "result_consumed_after": 3}
+    }
+    log.capture_query({**payload, "stats": {"round_trip_msec": 5.0}})
+    log.capture_query(payload, "q1")
+    assert log.records == 1
+    record: Dict[str, Any] = records(log)[0]
+    assert record["cypher_query"] == "UNWIND $batch AS row MERGE (v:`Station` {entity_name: row.entity_name})"
+    assert record["server_msec"] == 5
+    assert record["cypher_params"] == {"batch": [{"token": u_slowlog.REDACTED}] * 2, "TOKEN": u_slowlog.REDACTED}
@@ -0,0 +1,132 @@
+"""
+    Filename: ./tests/unit/plugins/module_utils/test_throttle.py
+    Author: diederick de Buck (diederick.de.buck@platform-42.com)
+    Date: 2026-10-19
+    Version: 4.3.0
+    Description:
+        token buckets and the adaptive (AIMD) controller of the write throttle
+"""
+from typing import List
+import pytest
+
+# pylint: disable=import-error
+import ansible_collections.platform42.neo4j.plugins.module_utils.throttle as u_throttle
+from neo4j.exceptions import Neo4jError, TransientError
+
+
+class FakeClock:
+
+    def __init__(self) -> None:
+        self.now: float = 0.0
+        self.waits: List[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def wait(
+        self,
+        delay: float
+    ) -> None:
+        self.waits.append(delay)
+        self.now += delay
+
+
+def adaptive_throttle(
+    clock: FakeClock,
+    max_rows_per_sec: float = 0.0
+) -> u_throttle.Throttle:
+    return u_throttle.Throttle(
+        max_rows_per_sec=max_rows_per_sec or None,
+        adaptive=True,
+        latency_threshold_msec=1000,
+        wait=clock.wait,
+        clock=clock
+        )
+
+
+def test_token_bucket_debt() -> None:
+    clock: FakeClock = FakeClock()
+    bucket: u_throttle.TokenBucket = u_throttle.TokenBucket(10, clock)
+    assert bucket.acquire(10) == 0.0
+    assert bucket.acquire(5) == pytest.approx(0.5)
+    clock.now += 1.0
+    assert bucket.acquire(5) == 0.0
+
+
+def test_before_batch_waits() -> None:
+    clock: FakeClock = FakeClock()
+    throttle: u_throttle.Throttle = u_throttle.Throttle(
+        max_rows_per_sec=100,
+        max_tx_per_sec=2,
+        wait=clock.wait,
+        clock=clock
+        )
+    for _ in range(4):
+        throttle.before_batch(50)
+    assert clock.waits == [pytest.approx(0.5), pytest.approx(0.5)]
+    assert throttle.wait_time == pytest.approx(1.0)
+
+
+def test_breach_halves_and_recovers_to_ceiling() -> None:
+    clock: FakeClock = FakeClock()
+    throttle: u_throttle.Throttle = adaptive_throttle(clock, 1000)
+    throttle.after_batch(500, 1.0)
+    assert throttle.rows_per_sec == 1000
+    throttle.after_batch(500, 0.0, failed=True)
+    assert throttle.rows_per_sec == 250
+    rates: List[float] = []
+    while throttle.rows_per_sec != 1000:
+        throttle.after_batch(100, 0.1)
+        rates.append(throttle.rows_per_sec or 0.0)
+    assert rates == [pytest.approx(rate) for rate in (350, 450, 550, 650, 750, 850, 950, 1000)]
+    assert throttle.min_rows_per_sec == 250
+    assert throttle.adjustments == 9
+    throttle.after_batch(100, 0.1)
+    assert throttle.rows_per_sec == 1000
+    assert throttle.adjustments == 9
+
+
+def test_breach_stops_at_floor() -> None:
+    clock: FakeClock = FakeClock()
+    throttle: u_throttle.Throttle = adaptive_throttle(clock, 1000)
+    throttle.after_batch(100, 2.0)
+    assert throttle.rows_per_sec == 1000 * u_throttle.ADAPTIVE_FLOOR
+    throttle.after_batch(100, 0.0, failed=True)
+    assert throttle.rows_per_sec == 1000 * u_throttle.ADAPTIVE_FLOOR
+
+
+def test_unlimited_ceiling_is_observed_rate() -> None:
+    clock: FakeClock = FakeClock()
+    throttle: u_throttle.Throttle = adaptive_throttle(clock)
+    throttle.after_batch(1000, 0.5)
+    assert throttle.rows_per_sec is None
+    throttle.after_batch(1000, 2.0)
+    assert throttle.ceiling == 500
+    assert throttle.rows_per_sec == 250
+    rates: List[float] = []
+    while throttle.rows_per_sec is not None:
+        rates.append(throttle.rows_per_sec)
+        throttle.after_batch(100, 0.1)
+    assert rates == [pytest.approx(rate) for rate in (250, 300, 350, 400, 450)]
+    assert throttle.ceiling is None
+    assert throttle.min_rows_per_sec == 250
+
+
+def test_failure_without_observation() -> None:
+    clock: FakeClock = FakeClock()
+    throttle: u_throttle.Throttle = adaptive_throttle(clock)
+    throttle.after_batch(100, 0.0, failed=True)
+    assert throttle.rows_per_sec == u_throttle.ADAPTIVE_MIN_ROWS_PER_SEC
+
+
+def test_not_adaptive() -> None:
+    clock: FakeClock = FakeClock()
+    throttle: u_throttle.Throttle = u_throttle.Throttle(max_rows_per_sec=100, wait=clock.wait, clock=clock)
+    throttle.after_batch(100, 5.0, failed=True)
+    assert throttle.rows_per_sec == 100
+    assert throttle.adjustments == 0
+
+
+def test_transient_error() -> None:
+    assert u_throttle.transient_error(TransientError("deadlock"))
+    assert not u_throttle.transient_error(Neo4jError("syntax"))